@@ -0,0 +1,53 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Perfil de abertura rápida: pasta (onedir) em vez de um único .exe.
+# O onefile descompacta tudo numa pasta temporária a cada execução; aqui os
+# arquivos já ficam prontos em dist/SunsetPortaria/, sem UPX (que também
+# precisa descompactar) e com os .pyc já otimizados.
+#
+#   pyinstaller SunsetPortaria-onedir.spec
+#   -> dist/SunsetPortaria/SunsetPortaria.exe (distribuir a pasta inteira)
+
+
+a = Analysis(
+    ['login.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    # importado dentro de função pelo login (carregado enquanto a senha é digitada)
+    hiddenimports=['sunset_gui'],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=['unittest', 'doctest', 'pydoc'],
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='SunsetPortaria',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='SunsetPortaria',
+)
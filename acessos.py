@@ -0,0 +1,253 @@
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+
+from desempenho import cronometrado
+
+PASTA_ACESSOS = "acessos"
+
+# intervalo entre gravações em disco (eventos ficam em memória até lá)
+INTERVALO_GRAVACAO = 1.0
+
+# dias carregados no índice ao abrir; visitas mais antigas são lidas sob demanda
+DIAS_EM_MEMORIA = 31
+
+
+# ========= HISTÓRICO DE ACESSOS =========
+#
+# Um arquivo por dia (acessos/AAAA-MM-DD.log), só acrescentado, com uma linha
+# JSON compacta por tentativa de entrada:
+#   {"em": "2024-05-02T07:31:12", "id": 12, "nome": "...", "ok": true, "motivo": "", "por": "admin"}
+#
+# Os eventos entram na memória na hora (índices por aluno e por hora) e vão
+# para o disco em lote: uma thread grava e faz fsync a cada INTERVALO_GRAVACAO.
+
+
+class Acesso(NamedTuple):
+    em: datetime
+    aluno_id: int | None
+    nome: str
+    liberado: bool
+    motivo: str = ""
+    usuario: str = ""
+
+
+def _para_linha(a: Acesso) -> str:
+    return json.dumps(
+        {
+            "em": a.em.isoformat(timespec="seconds"),
+            "id": a.aluno_id,
+            "nome": a.nome,
+            "ok": a.liberado,
+            "motivo": a.motivo,
+            "por": a.usuario,
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ) + "\n"
+
+
+def _de_linha(linha: str) -> Acesso | None:
+    try:
+        d = json.loads(linha)
+        return Acesso(
+            datetime.fromisoformat(d["em"]),
+            d.get("id"),
+            d.get("nome", ""),
+            bool(d.get("ok")),
+            d.get("motivo", ""),
+            d.get("por", ""),
+        )
+    except (ValueError, KeyError, TypeError):
+        # linha cortada por queda do processo: ignora
+        return None
+
+
+class RegistroAcessos:
+    def __init__(
+        self,
+        pasta: str = PASTA_ACESSOS,
+        intervalo: float = INTERVALO_GRAVACAO,
+        dias_em_memoria: int = DIAS_EM_MEMORIA,
+    ):
+        self.pasta = pasta
+        self.intervalo = intervalo
+
+        # índices: dia -> eventos em ordem; dia -> 24 listas por hora; aluno -> eventos
+        self._dias: dict[date, list[Acesso]] = {}
+        self._horas: dict[date, list[list[Acesso]]] = {}
+        self._por_aluno: dict[int, list[Acesso]] = {}
+        self._carregado_desde = date.today() - timedelta(days=dias_em_memoria - 1)
+
+        self._lock = threading.Lock()
+        self._pendentes: list[Acesso] = []
+        self._acordar = threading.Event()
+        self._parar = False
+        self._gravador: threading.Thread | None = None
+        self._conferidos: set[date] = set()
+
+        os.makedirs(pasta, exist_ok=True)
+        for dia in self._dias_em_disco():
+            if dia >= self._carregado_desde:
+                for a in self._ler_dia(dia):
+                    self._indexar(a)
+
+    # ----- consultas -----
+
+    def do_dia(self, dia: date | None = None) -> list[Acesso]:
+        """Acessos do dia em ordem de horário."""
+        dia = dia or date.today()
+        with self._lock:
+            if dia in self._dias or dia >= self._carregado_desde:
+                return list(self._dias.get(dia, ()))
+        return self._ler_dia(dia)
+
+    def por_hora(self, dia: date | None = None) -> list[int]:
+        """Quantidade de acessos em cada hora (0-23) do dia."""
+        dia = dia or date.today()
+        with self._lock:
+            horas = self._horas.get(dia)
+            if horas is not None or dia >= self._carregado_desde:
+                return [len(h) for h in horas] if horas else [0] * 24
+        contagem = [0] * 24
+        for a in self._ler_dia(dia):
+            contagem[a.em.hour] += 1
+        return contagem
+
+    def do_aluno(self, aluno_id: int) -> list[Acesso]:
+        """Acessos do aluno que estão em memória (últimos DIAS_EM_MEMORIA dias)."""
+        with self._lock:
+            return list(self._por_aluno.get(aluno_id, ()))
+
+    def ultima_visita(self, aluno_id: int) -> Acesso | None:
+        """Última entrada liberada do aluno; procura nos arquivos antigos se preciso."""
+        with self._lock:
+            for a in reversed(self._por_aluno.get(aluno_id, ())):
+                if a.liberado:
+                    return a
+        for dia in reversed(self._dias_em_disco()):
+            if dia >= self._carregado_desde:
+                continue
+            for a in reversed(self._ler_dia(dia)):
+                if a.aluno_id == aluno_id and a.liberado:
+                    return a
+        return None
+
+    # ----- gravação -----
+
+    def registrar(
+        self,
+        aluno_id: int | None,
+        nome: str,
+        liberado: bool,
+        motivo: str = "",
+        usuario: str = "",
+        em: datetime | None = None,
+    ) -> Acesso:
+        """Registra uma tentativa de entrada. Vai para o disco no próximo lote."""
+        a = Acesso(em or datetime.now().replace(microsecond=0), aluno_id, nome, liberado, motivo, usuario)
+        with self._lock:
+            self._indexar(a)
+            self._pendentes.append(a)
+            if self._gravador is None:
+                self._iniciar_gravador()
+        return a
+
+    def registrar_lote(self, acessos: list[Acesso]) -> None:
+        """Registra vários acessos já montados de uma vez (usado pela catraca)."""
+        with self._lock:
+            for a in acessos:
+                self._indexar(a)
+            self._pendentes += acessos
+            if self._gravador is None:
+                self._iniciar_gravador()
+
+    @cronometrado("acessos.gravar")
+    def gravar_pendentes(self) -> int:
+        """Grava agora o que estiver em memória. Retorna quantos eventos gravou."""
+        with self._lock:
+            lote, self._pendentes = self._pendentes, []
+        if not lote:
+            return 0
+        por_dia: dict[date, list[str]] = {}
+        for a in lote:
+            por_dia.setdefault(a.em.date(), []).append(_para_linha(a))
+        for dia, linhas in por_dia.items():
+            if dia not in self._conferidos:
+                self._fechar_linha_cortada(dia)
+            with open(self._arquivo(dia), "a", encoding="utf-8") as f:
+                f.writelines(linhas)
+                f.flush()
+                os.fsync(f.fileno())
+        return len(lote)
+
+    def fechar(self) -> None:
+        """Para a thread de gravação e grava o que faltou."""
+        with self._lock:
+            self._parar = True
+            gravador = self._gravador
+        self._acordar.set()
+        if gravador is not None:
+            gravador.join()
+        self.gravar_pendentes()
+
+    # ----- internos -----
+
+    def _iniciar_gravador(self) -> None:
+        self._gravador = threading.Thread(
+            target=self._laco_gravacao, name="gravacao-acessos", daemon=True
+        )
+        self._gravador.start()
+
+    def _laco_gravacao(self) -> None:
+        while True:
+            self._acordar.wait(self.intervalo)
+            self.gravar_pendentes()
+            with self._lock:
+                if self._parar:
+                    return
+
+    def _indexar(self, a: Acesso) -> None:
+        dia = a.em.date()
+        self._dias.setdefault(dia, []).append(a)
+        horas = self._horas.get(dia)
+        if horas is None:
+            horas = self._horas[dia] = [[] for _ in range(24)]
+        horas[a.em.hour].append(a)
+        if a.aluno_id is not None:
+            self._por_aluno.setdefault(a.aluno_id, []).append(a)
+
+    def _fechar_linha_cortada(self, dia: date) -> None:
+        """Se o arquivo terminou no meio de uma linha, começa a próxima numa linha nova."""
+        caminho = self._arquivo(dia)
+        if os.path.exists(caminho) and os.path.getsize(caminho) > 0:
+            with open(caminho, "rb+") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+        self._conferidos.add(dia)
+
+    def _arquivo(self, dia: date) -> str:
+        return os.path.join(self.pasta, f"{dia.isoformat()}.log")
+
+    def _dias_em_disco(self) -> list[date]:
+        dias = []
+        for nome in os.listdir(self.pasta):
+            if nome.endswith(".log"):
+                try:
+                    dias.append(date.fromisoformat(nome[:-4]))
+                except ValueError:
+                    continue
+        return sorted(dias)
+
+    def _ler_dia(self, dia: date) -> list[Acesso]:
+        caminho = self._arquivo(dia)
+        if not os.path.exists(caminho):
+            return []
+        with open(caminho, "r", encoding="utf-8") as f:
+            acessos = [a for a in map(_de_linha, f) if a is not None]
+        # lotes de terminais diferentes podem chegar fora de ordem
+        acessos.sort(key=lambda a: a.em)
+        return acessos
@@ -0,0 +1,45 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable
+
+# mesmo sem virar o dia, a data é reconferida nesse intervalo: cobre relógio
+# ajustado e computador que ficou suspenso durante a meia-noite
+INTERVALO_MAXIMO = 3600.0
+
+
+# ========= VIRADA DO DIA =========
+
+def segundos_ate_virada(agora: datetime | None = None) -> float:
+    """Tempo até a próxima conferência de data (meia-noite + 1 s, no máximo 1 h)."""
+    agora = agora or datetime.now()
+    amanha = datetime.combine(agora.date() + timedelta(days=1), datetime.min.time())
+    return min((amanha - agora).total_seconds() + 1, INTERVALO_MAXIMO)
+
+
+class VigiaVirada:
+    """Thread que chama `ao_virar(hoje)` sempre que a data muda (para o terminal;
+    a interface gráfica usa segundos_ate_virada com root.after)."""
+
+    def __init__(self, ao_virar: Callable[[date], None]):
+        self.ao_virar = ao_virar
+        self.hoje = date.today()
+        self._parar = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def iniciar(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._laco, name="virada-do-dia", daemon=True)
+            self._thread.start()
+
+    def parar(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _laco(self) -> None:
+        while not self._parar.wait(segundos_ate_virada()):
+            hoje = date.today()
+            if hoje != self.hoje:
+                self.hoje = hoje
+                self.ao_virar(hoje)
@@ -0,0 +1,69 @@
+from datetime import date
+from functools import lru_cache
+
+
+# ========= REGISTRO DE ALUNO EM MEMÓRIA =========
+#
+# Na memória cada aluno é um objeto com __slots__ (sem o dict de cada
+# instância) e o vencimento fica como ordinal (int): a situação e a ordem
+# por vencimento saem de comparações de inteiros, sem reler texto. O formato
+# de dict/JSON ("prox" em ISO) continua sendo o do banco, do alunos.json e do
+# servidor: a conversão acontece só na entrada (de_dict) e na saída (para_dict).
+
+
+@lru_cache(maxsize=4096)
+def data_br(ordinal: int) -> str:
+    """dd/mm/aaaa de um ordinal; poucas datas distintas, então quase sempre vem do cache."""
+    return date.fromordinal(ordinal).strftime("%d/%m/%Y")
+
+
+class Aluno:
+    __slots__ = ("id", "nome", "dia_venc", "prox", "versao")
+
+    def __init__(self, id: int, nome: str, dia_venc: int, prox: int, versao: int = 0):
+        self.id = id
+        self.nome = nome
+        self.dia_venc = dia_venc
+        self.prox = prox  # date.toordinal() do próximo vencimento
+        self.versao = versao
+
+    @classmethod
+    def de_dict(cls, d: dict) -> "Aluno":
+        return cls(
+            d["id"], d["nome"], d["dia_venc"],
+            date.fromisoformat(d["prox"]).toordinal(), d.get("versao", 0),
+        )
+
+    def para_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "nome": self.nome,
+            "dia_venc": self.dia_venc,
+            "prox": date.fromordinal(self.prox).isoformat(),
+            "versao": self.versao,
+        }
+
+    @property
+    def data_prox(self) -> date:
+        return date.fromordinal(self.prox)
+
+    @data_prox.setter
+    def data_prox(self, valor: date) -> None:
+        self.prox = valor.toordinal()
+
+    @property
+    def prox_br(self) -> str:
+        return data_br(self.prox)
+
+    def mesmos_dados(self, outro: "Aluno") -> bool:
+        """Nome, dia e vencimento iguais (ignora a versão do banco)."""
+        return (self.nome, self.dia_venc, self.prox) == (outro.nome, outro.dia_venc, outro.prox)
+
+    def copiar_de(self, outro: "Aluno") -> None:
+        self.nome = outro.nome
+        self.dia_venc = outro.dia_venc
+        self.prox = outro.prox
+        self.versao = outro.versao
+
+    def __repr__(self) -> str:
+        return f"Aluno({self.id}, {self.nome!r}, dia {self.dia_venc}, {self.data_prox})"
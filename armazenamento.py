@@ -0,0 +1,99 @@
+import json
+import os
+from typing import Iterator
+
+from arquivo_json import existe_json, ler_json, ler_lista_json
+
+
+# ========= ALUNOS.JSON LEGADO (SNAPSHOT + DIÁRIO) =========
+#
+# Formato antigo, de antes do banco (repositorio.py), só lido uma vez na
+# importação:
+#   - alunos.json              -> snapshot completo (lista JSON)
+#   - alunos.json.diario(.old) -> uma linha JSON por alteração feita depois do
+#                                 snapshot ({"op": "upsert"/"delete", ...})
+# Nada mais grava nesses arquivos.
+
+
+class ArmazemAlunos:
+    """Leitura (somente) do alunos.json legado com os diários aplicados."""
+
+    def __init__(self, arquivo: str):
+        self.arquivo = arquivo
+        self.arquivo_diario = arquivo + ".diario"
+        self.arquivo_diario_antigo = arquivo + ".diario.old"
+
+    def existe(self) -> bool:
+        return existe_json(self.arquivo) or any(
+            os.path.exists(p) for p in (self.arquivo_diario, self.arquivo_diario_antigo)
+        )
+
+    def carregar(self) -> list[dict]:
+        """Reconstrói a lista de alunos a partir do snapshot + diário(s)."""
+        estado = self._estado_do_snapshot()
+        self._reaplicar(self.arquivo_diario_antigo, estado)
+        self._reaplicar(self.arquivo_diario, estado)
+        return list(estado.values())
+
+    def percorrer(self) -> Iterator[dict]:
+        """Mesmo resultado de carregar(), um aluno por vez (para arquivos enormes).
+
+        Só as operações dos diários ficam na memória; o snapshot é lido em
+        fluxo e cada aluno sai já com o diário aplicado. Pode levantar
+        ArquivoCorrompido no meio (ver ler_lista_json).
+        """
+        # id -> último registro do diário, na ordem em que carregar() os deixaria;
+        # removidos em algum momento saem da posição do snapshot
+        ultimas: dict[int, dict] = {}
+        removidos: set[int] = set()
+        for caminho in (self.arquivo_diario_antigo, self.arquivo_diario):
+            for op in self._operacoes(caminho):
+                if op.get("op") == "upsert":
+                    ultimas[op["aluno"]["id"]] = op["aluno"]
+                elif op.get("op") == "delete":
+                    ultimas.pop(op["id"], None)
+                    removidos.add(op["id"])
+
+        if existe_json(self.arquivo):
+            for idx, a in enumerate(ler_lista_json(self.arquivo)):
+                a.setdefault("id", idx + 1)
+                if a["id"] in removidos:
+                    continue
+                yield ultimas.pop(a["id"], a)
+        yield from ultimas.values()
+
+    def _estado_do_snapshot(self) -> dict[int, dict]:
+        if not existe_json(self.arquivo):
+            return {}
+        alunos = ler_json(self.arquivo)
+        estado: dict[int, dict] = {}
+        for idx, a in enumerate(alunos):
+            # arquivos antigos do portaria.py não tinham id
+            a.setdefault("id", idx + 1)
+            estado[a["id"]] = a
+        return estado
+
+    @staticmethod
+    def _operacoes(caminho: str) -> Iterator[dict]:
+        if not os.path.exists(caminho):
+            return
+        with open(caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    yield json.loads(linha)
+                except ValueError:
+                    # última linha cortada por queda do processo: ignora
+                    continue
+
+    @classmethod
+    def _reaplicar(cls, caminho: str, estado: dict[int, dict]) -> None:
+        """Aplica as operações do diário sobre o estado."""
+        for op in cls._operacoes(caminho):
+            if op.get("op") == "upsert":
+                a = op["aluno"]
+                estado[a["id"]] = a
+            elif op.get("op") == "delete":
+                estado.pop(op["id"], None)
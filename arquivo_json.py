@@ -0,0 +1,243 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, Iterator
+
+log = logging.getLogger("sunset.arquivos")
+
+SUFIXO_ANTERIOR = ".anterior"
+SUFIXO_SOMA = ".sha256"
+
+# leitura em fluxo: caracteres lidos do disco por vez
+TAMANHO_BLOCO = 1 << 16
+_CONTINUA_NUMERO = frozenset("0123456789.eE+-")
+_ESPACOS = re.compile(r"[ \t\n\r]*")
+
+
+# ========= JSON GRAVADO COM SEGURANÇA =========
+#
+# Cada arquivo tem, ao lado:
+#   arquivo.sha256            -> soma do conteúdo atual (formato do sha256sum)
+#   arquivo.anterior(.sha256) -> a última geração boa, com a sua soma
+#
+# Gravação: escreve num .tmp + fsync, guarda a geração atual como .anterior
+# (se ela confere com a soma), grava a soma nova e só então troca o arquivo
+# com os.replace. Se o processo cair em qualquer ponto, a leitura acha uma
+# geração que confere: a nova, ou a anterior. Nunca um arquivo pela metade.
+
+
+class ArquivoCorrompido(ValueError):
+    pass
+
+
+def _soma(conteudo: bytes) -> str:
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def _ler_bytes(caminho: str) -> bytes | None:
+    try:
+        with open(caminho, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _soma_registrada(caminho: str) -> str | None:
+    conteudo = _ler_bytes(caminho + SUFIXO_SOMA)
+    if not conteudo:
+        return None
+    return conteudo.split()[0].decode("ascii", "replace")
+
+
+def _confere(caminho: str, conteudo: bytes | None) -> bool:
+    return conteudo is not None and _soma(conteudo) == _soma_registrada(caminho)
+
+
+def _sincronizar_pasta(caminho: str) -> None:
+    # garante que os renames chegaram ao disco (não existe no Windows)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(caminho)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _escrever_tmp(caminho: str, conteudo: bytes) -> str:
+    tmp = caminho + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(conteudo)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp
+
+
+def _gravar_bytes(caminho: str, conteudo: bytes) -> None:
+    tmp = _escrever_tmp(caminho, conteudo)
+
+    anterior = caminho + SUFIXO_ANTERIOR
+    atual = _ler_bytes(caminho)
+    if atual is not None and _confere(caminho, atual):
+        # a geração atual é boa: vira a anterior (uma geração ruim nunca apaga a boa)
+        os.replace(caminho, anterior)
+        os.replace(caminho + SUFIXO_SOMA, anterior + SUFIXO_SOMA)
+
+    nome = os.path.basename(caminho)
+    soma_tmp = _escrever_tmp(caminho + SUFIXO_SOMA, f"{_soma(conteudo)}  {nome}\n".encode("ascii"))
+    os.replace(soma_tmp, caminho + SUFIXO_SOMA)
+    os.replace(tmp, caminho)
+    _sincronizar_pasta(caminho)
+
+
+def gravar_json(caminho: str, dados: Any, indent: int | None = 2) -> None:
+    """Grava `dados` em `caminho` de forma atômica, com soma e geração anterior."""
+    conteudo = json.dumps(dados, ensure_ascii=False, indent=indent).encode("utf-8")
+    _gravar_bytes(caminho, conteudo)
+
+
+def ler_anterior(caminho: str) -> Any | None:
+    """A geração anterior de `caminho`, ou None se não existe ou não é JSON válido."""
+    conteudo = _ler_bytes(caminho + SUFIXO_ANTERIOR)
+    if conteudo is None:
+        return None
+    try:
+        return json.loads(conteudo.decode("utf-8"))
+    except ValueError:
+        return None
+
+
+def existe_json(caminho: str) -> bool:
+    return os.path.exists(caminho) or os.path.exists(caminho + SUFIXO_ANTERIOR)
+
+
+def ler_json(caminho: str) -> Any:
+    """Lê a geração mais nova que estiver íntegra.
+
+    Ordem: atual conferida, anterior conferida, e por último qualquer uma que
+    seja JSON válido (arquivos antigos, sem .sha256). Se a anterior foi usada,
+    ela volta a ser a atual e o arquivo ruim fica como .corrompido.
+    Levanta FileNotFoundError se não houver nenhuma geração e
+    ArquivoCorrompido se nenhuma puder ser lida.
+    """
+    anterior = caminho + SUFIXO_ANTERIOR
+    atual_bytes = _ler_bytes(caminho)
+    anterior_bytes = _ler_bytes(anterior)
+    if atual_bytes is None and anterior_bytes is None:
+        raise FileNotFoundError(caminho)
+
+    tentativas = [
+        (caminho, atual_bytes, _confere(caminho, atual_bytes)),
+        (anterior, anterior_bytes, _confere(anterior, anterior_bytes)),
+    ]
+    tentativas.sort(key=lambda t: not t[2])  # conferidas primeiro, mantendo a ordem
+
+    for origem, conteudo, conferida in tentativas:
+        if conteudo is None:
+            continue
+        try:
+            dados = json.loads(conteudo.decode("utf-8"))
+        except ValueError:
+            continue
+        if origem == anterior:
+            log.warning("%s danificado; recuperado da geração anterior", caminho)
+            if atual_bytes is not None:
+                os.replace(caminho, caminho + ".corrompido")
+            _gravar_bytes(caminho, conteudo)
+        elif not conferida and _soma_registrada(caminho) is not None:
+            log.warning("%s não confere com %s (editado à mão?)", caminho, SUFIXO_SOMA)
+        return dados
+
+    raise ArquivoCorrompido(f"nenhuma geração legível de {caminho}")
+
+
+# ========= LEITURA EM FLUXO (LISTAS GRANDES) =========
+#
+# ler_json monta o texto inteiro e a lista inteira na memória. Para uma lista
+# com centenas de milhares de alunos, ler_lista_json devolve um item por vez:
+# só o bloco atual do arquivo e o item sendo lido ficam na memória.
+
+
+def _conferida_em_fluxo(caminho: str) -> bool:
+    soma = _soma_registrada(caminho)
+    if soma is None:
+        return False
+    h = hashlib.sha256()
+    try:
+        with open(caminho, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloco)
+    except FileNotFoundError:
+        return False
+    return h.hexdigest() == soma
+
+
+def ler_lista_json(caminho: str, tamanho_bloco: int = TAMANHO_BLOCO) -> Iterator[Any]:
+    """Itens de um arquivo que contém uma lista JSON, um de cada vez.
+
+    Escolhe a geração como ler_json (conferida com a soma primeiro), mas não
+    recupera nem move arquivos. Se o arquivo estiver cortado ou inválido no
+    meio, levanta ArquivoCorrompido depois de já ter entregue os itens
+    anteriores: quem consome deve descartá-los (ex.: desfazer a transação)
+    e cair para ler_json, que sabe recuperar a geração anterior.
+    """
+    candidatos = [p for p in (caminho, caminho + SUFIXO_ANTERIOR) if os.path.exists(p)]
+    if not candidatos:
+        raise FileNotFoundError(caminho)
+    escolhido = next((p for p in candidatos if _conferida_em_fluxo(p)), candidatos[0])
+    yield from _itens_da_lista(escolhido, tamanho_bloco)
+
+
+def _itens_da_lista(caminho: str, tamanho_bloco: int) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    with open(caminho, "r", encoding="utf-8") as f:
+        buf, pos, fim = "", 0, False
+
+        def completar() -> None:
+            # descarta o que já foi lido e acrescenta o próximo bloco
+            nonlocal buf, pos, fim
+            bloco = f.read(tamanho_bloco)
+            fim = not bloco
+            buf, pos = buf[pos:] + bloco, 0
+
+        def proximo_caractere() -> str:
+            nonlocal pos
+            while True:
+                pos = _ESPACOS.match(buf, pos).end()
+                if pos < len(buf):
+                    return buf[pos]
+                if fim:
+                    raise ArquivoCorrompido(f"{caminho} terminou no meio da lista")
+                completar()
+
+        if proximo_caractere() != "[":
+            raise ArquivoCorrompido(f"{caminho} não contém uma lista JSON")
+        pos += 1
+        if proximo_caractere() == "]":
+            return
+        while True:
+            proximo_caractere()
+            try:
+                item, final = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if fim:
+                    raise ArquivoCorrompido(f"item inválido em {caminho}") from None
+                completar()
+                continue
+            if not fim and (final >= len(buf) or buf[final] in _CONTINUA_NUMERO):
+                # número no fim do bloco ("-4." de "-4.5e10") pode continuar no próximo
+                completar()
+                continue
+            yield item
+            pos = final
+            c = proximo_caractere()
+            pos += 1
+            if c == "]":
+                return
+            if c != ",":
+                raise ArquivoCorrompido(f"esperava ',' ou ']' em {caminho}")
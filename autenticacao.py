@@ -0,0 +1,160 @@
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from arquivo_json import existe_json, gravar_json, ler_anterior, ler_json
+
+ARQUIVO_USUARIOS = "usuarios.json"
+VERSAO_USUARIOS = 2
+
+# custo do PBKDF2; pode subir com o tempo; hashes antigos são refeitos no próximo login
+ITERACOES_PBKDF2 = 200_000
+ALGORITMO = "pbkdf2_sha256"
+
+
+# ========= HASH DE SENHA =========
+
+def gerar_hash(senha: str, iteracoes: int | None = None) -> str:
+    """Retorna 'pbkdf2_sha256$iteracoes$salt$hash' (salt e hash em hex)."""
+    if iteracoes is None:
+        iteracoes = ITERACOES_PBKDF2
+    salt = secrets.token_bytes(16)
+    dk = hashlib.pbkdf2_hmac("sha256", senha.encode("utf-8"), salt, iteracoes)
+    return f"{ALGORITMO}${iteracoes}${salt.hex()}${dk.hex()}"
+
+
+def verificar_hash(senha: str, senha_hash: str) -> bool:
+    """False também para hash malformado (editado à mão, truncado...)."""
+    try:
+        algoritmo, iteracoes, salt, esperado = senha_hash.split("$")
+        if algoritmo != ALGORITMO:
+            return False
+        dk = hashlib.pbkdf2_hmac(
+            "sha256", senha.encode("utf-8"), bytes.fromhex(salt), int(iteracoes)
+        )
+        return hmac.compare_digest(dk.hex(), esperado)
+    except (AttributeError, TypeError, ValueError, OverflowError):
+        return False
+
+
+def _precisa_refazer_hash(senha_hash: str) -> bool:
+    partes = senha_hash.split("$")
+    return len(partes) != 4 or partes[0] != ALGORITMO or partes[1] != str(ITERACOES_PBKDF2)
+
+
+# ========= ARQUIVO usuarios.json =========
+
+def carregar_usuarios() -> list[dict]:
+    """Lê usuarios.json; só grava quando o arquivo ainda está no formato antigo.
+
+    Um arquivo danificado é recuperado da geração anterior (ver arquivo_json).
+    """
+    if not existe_json(ARQUIVO_USUARIOS):
+        usuarios = [
+            {"usuario": "admin", "senha_hash": gerar_hash("admin"), "perfil": "admin"}
+        ]
+        salvar_usuarios(usuarios)
+        return usuarios
+
+    dados = ler_json(ARQUIVO_USUARIOS)
+
+    if (
+        isinstance(dados, dict)
+        and dados.get("versao") == VERSAO_USUARIOS
+        and not _com_senha_em_texto(dados)
+    ):
+        return dados["usuarios"]
+
+    usuarios = _migrar_usuarios(dados)
+    salvar_usuarios(usuarios)
+    return usuarios
+
+
+def _migrar_usuarios(dados) -> list[dict]:
+    """Converte o formato antigo (lista simples, às vezes sem 'perfil', senha em
+    texto puro) para o atual: nenhuma senha fica gravada sem hash."""
+    usuarios = dados if isinstance(dados, list) else dados.get("usuarios", [])
+    for u in usuarios:
+        u.setdefault("perfil", "admin")
+        if "senha" in u:
+            u["senha_hash"] = gerar_hash(str(u.pop("senha")))
+    return usuarios
+
+
+def _com_senha_em_texto(dados) -> set[str]:
+    """Usuários que ainda têm 'senha' em texto puro em `dados` (qualquer formato)."""
+    if isinstance(dados, dict):
+        dados = dados.get("usuarios", [])
+    if not isinstance(dados, list):
+        return set()
+    return {u.get("usuario", "") for u in dados if isinstance(u, dict) and "senha" in u}
+
+
+def salvar_usuarios(usuarios: list[dict]) -> None:
+    dados = {"versao": VERSAO_USUARIOS, "usuarios": usuarios}
+    gravar_json(ARQUIVO_USUARIOS, dados)
+    if _com_senha_em_texto(ler_anterior(ARQUIVO_USUARIOS)) - _com_senha_em_texto(dados):
+        # a geração anterior (.anterior) ainda guarda a senha em texto puro de
+        # quem acabou de ganhar hash: grava de novo para ela sair do disco
+        gravar_json(ARQUIVO_USUARIOS, dados)
+
+
+# ========= SERVIÇO DE AUTENTICAÇÃO =========
+
+class ServicoAutenticacao:
+    """Mantém os usuários em memória (dict por nome) e valida senhas.
+
+    O arquivo só é relido quando o mtime muda. Senhas em texto puro ('senha')
+    viram 'senha_hash' já na leitura (carregar_usuarios).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._usuarios: dict[str, dict] = {}
+        self._mtime: int | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._hash_ficticio: str | None = None
+
+    def _recarregar_se_mudou(self) -> None:
+        try:
+            mtime = os.stat(ARQUIVO_USUARIOS).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime is not None and mtime == self._mtime:
+            return
+        usuarios = carregar_usuarios()
+        self._usuarios = {u["usuario"]: u for u in usuarios}
+        self._mtime = os.stat(ARQUIVO_USUARIOS).st_mtime_ns
+
+    def _salvar(self) -> None:
+        salvar_usuarios(list(self._usuarios.values()))
+        self._mtime = os.stat(ARQUIVO_USUARIOS).st_mtime_ns
+
+    def autenticar(self, usuario: str, senha: str) -> dict | None:
+        """Retorna o registro do usuário se a senha conferir (bloqueante)."""
+        with self._lock:
+            self._recarregar_se_mudou()
+            registro = self._usuarios.get(usuario)
+            if registro is None:
+                # gasta o mesmo tempo de um usuário existente
+                if self._hash_ficticio is None:
+                    self._hash_ficticio = gerar_hash("")
+                verificar_hash(senha, self._hash_ficticio)
+                return None
+
+            # senha em texto puro já virou hash na leitura do arquivo
+            if not verificar_hash(senha, registro.get("senha_hash", "")):
+                return None
+            if _precisa_refazer_hash(registro["senha_hash"]):
+                registro["senha_hash"] = gerar_hash(senha)
+                self._salvar()
+            return dict(registro)
+
+    def autenticar_em_segundo_plano(self, usuario: str, senha: str) -> Future:
+        """Roda `autenticar` fora da thread do Tk; o chamador consulta o Future."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="login")
+        return self._executor.submit(self.autenticar, usuario, senha)
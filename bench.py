@@ -0,0 +1,1080 @@
+"""Benchmarks simples da portaria.
+
+    python bench.py [nomes...]                    texto, para acompanhar uma mudança
+    python bench.py --json resultados.json [...]  suíte reprodutível em JSON
+"""
+import argparse
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import arquivo_json
+from acessos import RegistroAcessos
+from aluno import Aluno
+from armazenamento import ArmazemAlunos
+from busca import IndiceBusca
+from carga import CargaAlunos
+from catraca import MotorCheckin, decidir
+from colecao import ColecaoAlunos
+import desempenho
+from desempenho import percentil
+from gravacao import GravadorSegundoPlano
+from indice_status import IndiceStatus
+from instantaneo import ARQUIVO_INSTANTANEO, Instantaneo, gravar_instantaneo
+from repositorio import ARQUIVO_BANCO, RepositorioAlunos
+from servidor import CacheAlunos, ClienteSincronizacao, ServidorSincronizacao
+import sintetico
+from vencimentos import (
+    DIAS_AVISO,
+    calcular_proximo_vencimento,
+    np,
+    proximos_vencimentos_em_lote,
+    status_em_lote,
+    status_pagamento,
+)
+
+
+def gerar_alunos(n: int) -> list[dict]:
+    """Cadastro sintético (nomes com acento, dias 29-31, parte em atraso), sempre o mesmo."""
+    return sintetico.gerar_alunos(n, SEMENTE)
+
+
+def gerar_registros(n: int) -> list[Aluno]:
+    return [Aluno.de_dict(a) for a in gerar_alunos(n)]
+
+
+SEMENTE = sintetico.SEMENTE_PADRAO
+
+
+def cronometrar(func, repeticoes: int) -> float:
+    """Retorna o tempo médio (ms) de uma chamada."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        func()
+    return (time.perf_counter() - inicio) * 1000 / repeticoes
+
+
+# ========= ARMAZENAMENTO =========
+
+def bench_escrita(tamanhos=(1_000, 10_000, 100_000), repeticoes: int = 200) -> None:
+    """Gravar 1 aluno no banco (WAL) x reescrever o alunos.json inteiro."""
+    print("== escrita de 1 aluno: banco (WAL) x reescrita completa do JSON ==")
+    print(f"{'alunos':>10} {'banco (ms)':>12} {'completa (ms)':>14}")
+    for n in tamanhos:
+        with tempfile.TemporaryDirectory() as pasta:
+            alunos = gerar_alunos(n)
+            repo = RepositorioAlunos(os.path.join(pasta, "alunos.db"), os.path.join(pasta, "nada.json"))
+            repo.salvar_varios(alunos)
+
+            def um_aluno():
+                a = random.choice(alunos)
+                a["dia_venc"] = random.randint(1, 31)
+                repo.salvar(a)
+
+            t_banco = cronometrar(um_aluno, repeticoes)
+            caminho = os.path.join(pasta, "alunos.json")
+            t_completa = cronometrar(lambda: arquivo_json.gravar_json(caminho, alunos), max(1, repeticoes // 50))
+            repo.fechar()
+        print(f"{n:>10} {t_banco:>12.3f} {t_completa:>14.3f}")
+
+
+# ========= VENCIMENTOS EM LOTE =========
+
+def bench_vencimentos(tamanhos=(10_000, 100_000, 1_000_000)) -> None:
+    print("== situação + próximo vencimento do roster: por aluno x em lote ==")
+    colunas = f"{'alunos':>10} {'por aluno (ms)':>15} {'lote (ms)':>12}"
+    print(colunas + (f" {'numpy (ms)':>12}" if np is not None else ""))
+    hoje = date.today()
+    for n in tamanhos:
+        dias_venc = [random.randint(1, 31) for _ in range(n)]
+        prox = [hoje.toordinal() + random.randint(-40, 40) for _ in range(n)]
+
+        def por_aluno():
+            for d, p in zip(dias_venc, prox):
+                calcular_proximo_vencimento(d, hoje)
+                status_pagamento(d, date.fromordinal(p), hoje)
+
+        def em_lote():
+            proximos_vencimentos_em_lote(dias_venc, hoje)
+            status_em_lote(prox, hoje)
+
+        t_aluno = cronometrar(por_aluno, 1)
+        t_lote = cronometrar(em_lote, 3)
+        linha = f"{n:>10} {t_aluno:>15.1f} {t_lote:>12.1f}"
+        if np is not None:
+            dv, pv = np.array(dias_venc), np.array(prox)
+            t_np = cronometrar(lambda: (proximos_vencimentos_em_lote(dv, hoje), status_em_lote(pv, hoje)), 3)
+            linha += f" {t_np:>12.1f}"
+        print(linha)
+
+
+# ========= GRAVAÇÃO EM SEGUNDO PLANO =========
+
+def bench_gravacao(alunos: int = 10_000, alteracoes: int = 500) -> None:
+    print("== tempo do clique (thread da tela): gravar no banco x enfileirar ==")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "bench.db")
+        lista = gerar_alunos(alunos)
+        repo = RepositorioAlunos(caminho, os.path.join(pasta, "nao_existe.json"))
+        repo.substituir_todos(lista)
+
+        def direto():
+            a = random.choice(lista)
+            a["dia_venc"] = random.randint(1, 31)
+            repo.salvar(a)
+
+        t_direto = cronometrar(direto, alteracoes)
+        repo.fechar()
+
+        gravador = GravadorSegundoPlano(caminho)
+        registros = [Aluno.de_dict(a) for a in lista]
+
+        def enfileirar():
+            a = random.choice(registros)
+            a.dia_venc = random.randint(1, 31)
+            gravador.salvar_aluno(a)
+
+        t_fila = cronometrar(enfileirar, alteracoes)
+        inicio = time.perf_counter()
+        gravador.fechar()
+        t_fechar = (time.perf_counter() - inicio) * 1000
+    print(f"gravar direto: {t_direto * 1000:.0f} µs/clique")
+    print(f"enfileirar:    {t_fila * 1000:.0f} µs/clique (+{t_fechar:.1f} ms para esvaziar a fila no fechar)")
+
+
+# ========= VÁRIOS TERMINAIS =========
+
+def bench_terminais(alunos: int = 100_000, alteracoes: int = 20) -> None:
+    print("== outro terminal: custo de conferir e de trazer só o que mudou ==")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "bench.db")
+        legado = os.path.join(pasta, "nao_existe.json")
+        a, b = RepositorioAlunos(caminho, legado), RepositorioAlunos(caminho, legado)
+        a.substituir_todos(gerar_alunos(alunos))
+        vista = a.versao_atual()
+        a.mudou()
+
+        t_nada = cronometrar(a.mudou, 1000)
+        alterados = [b.obter(random.randint(1, alunos)) for _ in range(alteracoes)]
+        for x in alterados:
+            x["dia_venc"] = random.randint(1, 31)
+        b.aplicar_lote(alterados, [], {x["id"]: x["versao"] for x in alterados})
+        assert a.mudou()
+        t_mesclar = cronometrar(lambda: a.alteracoes_desde(vista), 20)
+        t_tudo = cronometrar(a.listar, 3)
+        a.fechar()
+        b.fechar()
+    print(f"conferir (nada mudou): {t_nada * 1000:.1f} µs")
+    print(f"trazer {alteracoes} alterados de {alunos}: {t_mesclar:.2f} ms  (reler tudo: {t_tudo:.0f} ms)")
+
+
+# ========= COLEÇÃO EM MEMÓRIA =========
+
+def bench_colecao(tamanhos=(10_000, 100_000, 1_000_000), repeticoes: int = 200) -> None:
+    print("== localizar / novo id / remover: mapa por id x varredura da lista ==")
+    print(f"{'alunos':>10} {'obter (µs)':>12} {'varrer (µs)':>12} "
+          f"{'novo id (µs)':>13} {'max() (µs)':>12} {'remover* (µs)':>13} {'filtrar (µs)':>13}")
+    for n in tamanhos:
+        alunos = gerar_registros(n)
+        colecao = ColecaoAlunos(alunos)
+        rep_lenta = max(1, repeticoes * 10_000 // n // 10)
+
+        def varrer():
+            alvo = random.randint(1, n)
+            return next((a for a in alunos if a.id == alvo), None)
+
+        t_obter = cronometrar(lambda: colecao.obter(random.randint(1, n)), repeticoes * 10)
+        t_varrer = cronometrar(varrer, rep_lenta)
+        t_novo = cronometrar(colecao.novo_id, repeticoes * 10)
+        t_max = cronometrar(lambda: max([a.id for a in alunos], default=0) + 1, rep_lenta)
+
+        def remover_e_devolver():
+            a = colecao.remover(random.randint(1, n))
+            if a is not None:
+                colecao.adicionar(a)
+
+        t_remover = cronometrar(remover_e_devolver, repeticoes)
+        t_filtrar = cronometrar(lambda: [a for a in alunos if a.id != n // 2], rep_lenta)
+        print(f"{n:>10} {t_obter * 1000:>12.2f} {t_varrer * 1000:>12.1f} {t_novo * 1000:>13.2f} "
+              f"{t_max * 1000:>12.1f} {t_remover * 1000:>13.2f} {t_filtrar * 1000:>13.1f}")
+    print("* remover e devolver o mesmo aluno (a lista de ordem é deslocada em C)")
+
+
+# ========= REGISTRO DE ALUNO: DICT x __slots__ =========
+
+def _memoria_por_aluno(criar, n: int) -> tuple[float, list]:
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    registros = criar(n)
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (depois - antes) / n, registros
+
+
+def _alunos_como_no_banco(n: int) -> list[dict]:
+    # nomes e datas variados, como viriam do banco (strings distintas por aluno)
+    hoje = date.today().toordinal()
+    return [
+        {
+            "id": i,
+            "nome": f"Aluno Número {i}",
+            "dia_venc": i % 31 + 1,
+            "prox": date.fromordinal(hoje + i % 90 - 30).isoformat(),
+            "versao": i,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def bench_registro(n: int = 100_000) -> None:
+    print(f"== {n} alunos em memória: dict com prox ISO x Aluno (__slots__, prox ordinal) ==")
+    # o que fica na memória depois de carregar (nomes e datas incluídos)
+    m_dict, dicts = _memoria_por_aluno(_alunos_como_no_banco, n)
+    m_slots, registros = _memoria_por_aluno(
+        lambda k: [Aluno.de_dict(a) for a in _alunos_como_no_banco(k)], n
+    )
+    assert [a.para_dict() for a in registros] == dicts
+
+    hoje = date.today()
+    indice = IndiceStatus(registros, hoje)
+    textos = {"ok": "Em dia", "aviso": "Vence em breve", "atrasado": "Atrasado"}
+
+    def pintar_dicts():
+        # como era: data relida do texto ISO e formatada a cada linha
+        for a in dicts:
+            prox = date.fromisoformat(a["prox"])
+            st = status_pagamento(a["dia_venc"], prox, hoje)
+            (a["id"], a["nome"], a["dia_venc"], prox.strftime("%d/%m/%Y"), textos[st]), st
+
+    def pintar_registros():
+        for a in registros:
+            st = indice.status(a.id)
+            (a.id, a.nome, a.dia_venc, a.prox_br, textos[st]), st
+
+    t_dict = cronometrar(pintar_dicts, 3)
+    t_slots = cronometrar(pintar_registros, 3)
+    t_carregar = cronometrar(lambda: [Aluno.de_dict(a) for a in dicts], 3)
+    t_exportar = cronometrar(lambda: [a.para_dict() for a in registros], 3)
+    print(f"{'':>10} {'bytes/aluno':>12} {'linhas de todos (ms)':>22}")
+    print(f"{'dict':>10} {m_dict:>12.0f} {t_dict:>22.1f}")
+    print(f"{'Aluno':>10} {m_slots:>12.0f} {t_slots:>22.1f}")
+    print(f"converter: de_dict {t_carregar:.1f} ms, para_dict {t_exportar:.1f} ms (todos)")
+
+
+# ========= CARGA DE ROSTER GRANDE =========
+
+def _pico_mb(func) -> tuple[float, object]:
+    tracemalloc.start()
+    resultado = func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico / 2 ** 20, resultado
+
+
+def _abrir_tudo(repo: RepositorioAlunos, limite: int = -1) -> ColecaoAlunos:
+    colecao = ColecaoAlunos(Aluno.de_dict(a) for a in repo.listar(limite))
+    colecao.observar(IndiceStatus(colecao))
+    colecao.observar(IndiceBusca(colecao))
+    return colecao
+
+
+def bench_carga(n: int = 200_000, primeira_pagina: int = 500) -> None:
+    print(f"== alunos.json com {n} alunos: leitura inteira x em fluxo ==")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "alunos.json")
+        arquivo_json.gravar_json(caminho, gerar_alunos(n))
+        armazem = ArmazemAlunos(caminho)
+
+        def inteira():
+            return ColecaoAlunos([Aluno.de_dict(a) for a in armazem.carregar()])
+
+        def em_fluxo():
+            return ColecaoAlunos(Aluno.de_dict(a) for a in armazem.percorrer())
+
+        print(f"{'':>10} {'pico (MB)':>10} {'tempo (ms)':>11}")
+        for nome, func in (("inteira", inteira), ("em fluxo", em_fluxo)):
+            pico, _ = _pico_mb(func)
+            print(f"{nome:>10} {pico:>10.0f} {cronometrar(func, 1):>11.0f}")
+
+        # importação do json legado para o banco (só acontece na criação do banco)
+        banco = os.path.join(pasta, "importado.db")
+        repo = RepositorioAlunos(banco, caminho)
+        pico, total = _pico_mb(repo.contar)  # a conexão (e a importação) só abre no 1º uso
+        assert total == n
+        repo.fechar()
+        os.remove(banco)
+        repo = RepositorioAlunos(banco, caminho)
+        t_importar = cronometrar(repo.contar, 1)
+        print(f"importar para o banco: pico {pico:.0f} MB, {t_importar:.0f} ms")
+
+        print(f"== abertura da tela com {n} alunos: tudo antes x primeira página ==")
+        t_tudo = cronometrar(lambda: _abrir_tudo(repo), 1)
+        t_pagina = cronometrar(lambda: _abrir_tudo(repo, primeira_pagina), 5)
+
+        # o resto, como a tela faz: thread lê/converte, quem abriu põe na coleção
+        colecao = _abrir_tudo(repo, primeira_pagina)
+        inicio = time.perf_counter()
+        carga = CargaAlunos(banco, depois_do_id=primeira_pagina)
+        carga.iniciar()
+        pausas: list[float] = []
+        while not carga.terminada:
+            t = time.perf_counter()
+            for a in carga.coletar(1):
+                colecao.adicionar(a)
+            pausas.append((time.perf_counter() - t) * 1000)
+            time.sleep(0.010)
+        t_resto = (time.perf_counter() - inicio) * 1000
+        assert len(colecao) == n
+        repo.fechar()
+    print(f"tudo antes da 1ª tela: {t_tudo:.0f} ms")
+    print(f"1ª página ({primeira_pagina}): {t_pagina:.1f} ms  (+{t_resto:.0f} ms em segundo plano)")
+    print(f"tela parada a cada lote: p50 {percentil(pausas, 50):.0f} ms, máx {max(pausas):.0f} ms")
+
+
+def bench_instantaneo(n: int = 200_000, consultas: int = 1_000) -> None:
+    print(f"== abertura com {n} alunos: alunos.json x banco x foto binária (mmap) ==")
+    alunos = gerar_alunos(n)
+    hoje = date.today()
+    for a in alunos:
+        a["prox"] = (hoje + timedelta(days=random.randint(-60, 60))).isoformat()
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_json = os.path.join(pasta, "alunos.json")
+        arquivo_json.gravar_json(caminho_json, alunos)
+        banco = os.path.join(pasta, "sunset.db")
+        repo = RepositorioAlunos(banco, os.path.join(pasta, "nao_existe.json"))
+        repo.substituir_todos(alunos)
+        repo.fechar()
+        caminho = os.path.join(pasta, "alunos.snap")
+        registros = [Aluno.de_dict(a) for a in alunos]
+        t_gravar = cronometrar(lambda: gravar_instantaneo(caminho, registros, 0), 1)
+        del registros
+        alvos = random.sample(range(1, n + 1), consultas)
+
+        # 1ª resposta: contagem por situação + busca de um aluno, partindo do disco
+        def pelo_json():
+            registros = [Aluno.de_dict(d) for d in arquivo_json.ler_json(caminho_json)]
+            status = IndiceStatus(registros)
+            por_id = {a.id: a for a in registros}
+            return status.contagem(), por_id[alvos[0]]
+
+        def pelo_banco():
+            r = RepositorioAlunos(banco)
+            hoje = date.today()
+            limite = (hoje + timedelta(days=DIAS_AVISO)).isoformat()
+            # contagem por situação em SQL, usando o índice de prox
+            atrasado = r.contar_atrasados(hoje)
+            (aviso,) = r.con.execute(
+                "SELECT COUNT(*) FROM alunos WHERE prox >= ? AND prox <= ?", (hoje.isoformat(), limite)
+            ).fetchone()
+            resposta = {"ok": r.contar() - atrasado - aviso, "aviso": aviso, "atrasado": atrasado}, r.obter(alvos[0])
+            r.fechar()
+            return resposta
+
+        def pela_foto():
+            inst = Instantaneo(caminho)
+            resposta = inst.contagem(), inst.obter(alvos[0])
+            inst.fechar()
+            return resposta
+
+        assert pelo_json()[0] == pelo_banco()[0] == pela_foto()[0]
+        print(f"{'':>8} {'1ª resposta (ms)':>17} {'busca (µs)':>11} {'tudo em Aluno (ms)':>19} {'disco (MB)':>11}")
+
+        def todos_do_banco():
+            r = RepositorioAlunos(banco)
+            total = sum(len([Aluno.de_dict(d) for d in lote]) for lote in r.listar_em_lotes())
+            r.fechar()
+            return total
+
+        r = RepositorioAlunos(banco)
+        inst = Instantaneo(caminho)
+        linhas = (
+            ("json", pelo_json, None, lambda: len(pelo_json()), caminho_json),
+            ("banco", pelo_banco, lambda: [r.obter(i) for i in alvos], todos_do_banco, banco),
+            ("foto", pela_foto, lambda: [inst.obter(i) for i in alvos], lambda: len(list(inst)), caminho),
+        )
+        for nome, primeira, buscas, tudo, arquivo in linhas:
+            t_primeira = cronometrar(primeira, 1 if nome == "json" else 20)
+            t_busca = cronometrar(buscas, 5) * 1000 / consultas if buscas else float("nan")
+            t_tudo = cronometrar(tudo, 1)
+            mb = os.path.getsize(arquivo) / 1e6
+            print(f"{nome:>8} {t_primeira:>17.1f} {t_busca:>11.1f} {t_tudo:>19.0f} {mb:>11.1f}")
+        inst.fechar()
+        r.fechar()
+    print(f"gravar a foto (ao fechar a tela): {t_gravar:.0f} ms")
+
+
+# ========= HISTÓRICO DE ACESSOS =========
+
+def bench_acessos(eventos: int = 2_000, alunos: int = 10_000) -> None:
+    print("== registrar acesso: lote com fsync periódico x fsync por evento ==")
+    with tempfile.TemporaryDirectory() as pasta:
+        registro = RegistroAcessos(pasta)
+        t_lote = cronometrar(
+            lambda: registro.registrar(random.randint(1, alunos), "Aluno", True), eventos
+        )
+        inicio = time.perf_counter()
+        registro.fechar()
+        t_fechar = (time.perf_counter() - inicio) * 1000
+
+        registro = RegistroAcessos(pasta)
+
+        def um_por_vez():
+            registro.registrar(random.randint(1, alunos), "Aluno", True)
+            registro.gravar_pendentes()
+
+        t_um = cronometrar(um_por_vez, max(1, eventos // 10))
+        registro.fechar()
+
+        inicio = time.perf_counter()
+        registro = RegistroAcessos(pasta)
+        t_abrir = (time.perf_counter() - inicio) * 1000
+        alvo = random.randint(1, alunos)
+        t_hoje = cronometrar(registro.do_dia, 100)
+        t_ultima = cronometrar(lambda: registro.ultima_visita(alvo), 1000)
+        registro.fechar()
+    print(f"registrar (lote): {t_lote * 1000:.1f} µs/evento (+{t_fechar:.1f} ms no fechar)")
+    print(f"registrar + fsync: {t_um * 1000:.1f} µs/evento")
+    print(f"abrir com {eventos + eventos // 10} eventos: {t_abrir:.1f} ms")
+    print(f"entradas de hoje: {t_hoje * 1000:.1f} µs  última visita: {t_ultima * 1000:.2f} µs")
+
+
+# ========= CATRACA =========
+
+def bench_catraca(leituras: int = 50_000, alunos: int = 10_000, taxas=(500, 5_000, 0)) -> None:
+    """Gerador de carga: leituras a uma taxa fixa (0 = o mais rápido possível)."""
+    print("== catraca: decisões por segundo e latência (fila -> decisão) ==")
+    print(f"{'taxa alvo/s':>12} {'decisões/s':>12} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    hoje = date.today()
+    lista = gerar_registros(alunos)
+    for a in lista:
+        a.prox = hoje.toordinal() + random.randint(-10, 30)
+    colecao = ColecaoAlunos(lista)
+    indice = IndiceStatus(colecao)
+
+    for taxa in taxas:
+        n = leituras if taxa == 0 else min(leituras, taxa * 2)
+        with tempfile.TemporaryDirectory() as pasta:
+            registro = RegistroAcessos(pasta)
+            motor = MotorCheckin(colecao, indice, registro)
+            latencias: list[float] = []
+
+            inicio = time.perf_counter()
+            for k in range(n):
+                # ~2% de códigos desconhecidos
+                motor.entrada(random.randint(1, alunos + alunos // 50))
+                if taxa:
+                    espera = inicio + (k + 1) / taxa - time.perf_counter()
+                    if espera > 0:
+                        time.sleep(espera)
+                if k % 256 == 0:
+                    latencias += [d.latencia_ms for d in motor.coletar()]
+            motor.parar()
+            duracao = time.perf_counter() - inicio
+            latencias += [d.latencia_ms for d in motor.coletar()]
+            registro.fechar()
+        alvo = "máx" if taxa == 0 else str(taxa)
+        print(f"{alvo:>12} {len(latencias) / duracao:>12.0f} "
+              f"{percentil(latencias, 50):>10.3f} {percentil(latencias, 99):>10.3f}")
+
+
+# ========= JSON COM SOMA E GERAÇÃO ANTERIOR =========
+
+def bench_arquivo_json(tamanhos=(1_000, 10_000, 100_000)) -> None:
+    print("== JSON atômico: gravar, ler e recuperar depois de arquivo cortado ==")
+    print(f"{'alunos':>10} {'gravar (ms)':>12} {'ler (ms)':>10} {'recuperar (ms)':>15}")
+    for n in tamanhos:
+        alunos = gerar_alunos(n)
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "alunos.json")
+            t_gravar = cronometrar(lambda: arquivo_json.gravar_json(caminho, alunos), 3)
+            t_ler = cronometrar(lambda: arquivo_json.ler_json(caminho), 3)
+            with open(caminho, "r+b") as f:
+                f.truncate(os.path.getsize(caminho) // 2)
+            t_recuperar = cronometrar(lambda: arquivo_json.ler_json(caminho), 1)
+        print(f"{n:>10} {t_gravar:>12.1f} {t_ler:>10.1f} {t_recuperar:>15.1f}")
+
+
+# ========= TABELAS (precisa de display) =========
+
+def bench_tabela(tamanhos=(1_000, 10_000, 50_000), repeticoes: int = 200) -> None:
+    import tkinter as tk
+    from tkinter import ttk
+
+    from tabela import TabelaVinculada
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("== tabela: sem display disponível, pulando ==")
+        return
+    root.withdraw()
+
+    print("== atualizar 1 linha: TabelaVinculada x apagar/inserir tudo ==")
+    print(f"{'alunos':>10} {'1 linha (ms)':>14} {'tudo (ms)':>14}")
+    for n in tamanhos:
+        tree = ttk.Treeview(root, columns=("id", "nome", "dia_venc"), show="headings")
+        alunos = gerar_registros(n)
+        tabela = TabelaVinculada(tree, lambda a: ((a.id, a.nome, a.dia_venc), "ok"))
+        tabela.sincronizar(alunos)
+
+        def uma_linha():
+            a = random.choice(alunos)
+            a.dia_venc = a.dia_venc % 31 + 1
+            tabela.aplicar([a])
+
+        def tudo():
+            tree.delete(*tree.get_children())
+            for a in alunos:
+                tree.insert("", "end", iid=str(a.id), values=(a.id, a.nome, a.dia_venc))
+
+        t_linha = cronometrar(uma_linha, repeticoes)
+        t_tudo = cronometrar(tudo, 3)
+        tree.destroy()
+        print(f"{n:>10} {t_linha:>14.3f} {t_tudo:>14.3f}")
+    root.destroy()
+
+
+def bench_tabela_virtual(tamanhos=(100, 10_000, 100_000)) -> None:
+    import tkinter as tk
+
+    from tabela import TabelaVirtual
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("== tabela virtual: sem display disponível, pulando ==")
+        return
+
+    print("== primeira pintura da tabela virtual ==")
+    print(f"{'alunos':>10} {'abrir (ms)':>14} {'rolar (ms)':>14}")
+    for n in tamanhos:
+        alunos = gerar_registros(n)
+        inicio = time.perf_counter()
+        tabela = TabelaVirtual(root, [("id", "ID", 40), ("nome", "Nome", 260)],
+                               lambda a: ((a.id, a.nome), "ok"))
+        tabela.pack(fill="both", expand=True)
+        tabela.definir_fonte(lambda: len(alunos), lambda i, j: alunos[i:j])
+        root.update()
+        t_abrir = (time.perf_counter() - inicio) * 1000
+        t_rolar = cronometrar(lambda: tabela._rolar(random.randint(-200, 200)), 200)
+        tabela.destroy()
+        print(f"{n:>10} {t_abrir:>14.3f} {t_rolar:>14.3f}")
+    root.destroy()
+
+
+# ========= SERVIDOR DE SINCRONIZAÇÃO =========
+
+def bench_servidor(alunos: int = 10_000, clientes=(1, 4, 16), leituras: int = 2_000) -> None:
+    """Vários terminais fazendo check-in ao mesmo tempo pela rede local (loopback)."""
+    print("== servidor: check-ins simultâneos (ida e volta HTTP) ==")
+    print(f"{'clientes':>10} {'decisões/s':>12} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "bench.db")
+        repo = RepositorioAlunos(caminho, os.path.join(pasta, "nao_existe.json"))
+        repo.substituir_todos(gerar_alunos(alunos))
+        repo.fechar()
+        servidor = ServidorSincronizacao(
+            ("127.0.0.1", 0), CacheAlunos(caminho, RegistroAcessos(os.path.join(pasta, "acessos")))
+        )
+        servidor.iniciar()
+
+        for k in clientes:
+            latencias: list[float] = []
+            trava = threading.Lock()
+
+            def terminal() -> None:
+                cliente = ClienteSincronizacao("127.0.0.1", servidor.porta)
+                minhas = []
+                for _ in range(leituras // k):
+                    codigo = random.randint(1, alunos + alunos // 50)
+                    t = time.perf_counter()
+                    cliente.checkin(codigo)
+                    minhas.append((time.perf_counter() - t) * 1000)
+                cliente.fechar()
+                with trava:
+                    latencias.extend(minhas)
+
+            threads = [threading.Thread(target=terminal) for _ in range(k)]
+            inicio = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            duracao = time.perf_counter() - inicio
+            print(f"{k:>10} {len(latencias) / duracao:>12.0f} "
+                  f"{percentil(latencias, 50):>10.3f} {percentil(latencias, 99):>10.3f}")
+
+        # tempo de uma alteração chegar a outro terminal pelo fluxo de eventos
+        escritor = ClienteSincronizacao("127.0.0.1", servidor.porta)
+        rev, _ = escritor.listar()
+        atrasos: list[float] = []
+        enviado: list[float] = []
+        pronto = threading.Event()
+
+        def ouvinte() -> None:
+            pronto.set()
+            for evento in ClienteSincronizacao("127.0.0.1", servidor.porta).eventos(rev):
+                atrasos.append((time.perf_counter() - enviado[len(atrasos)]) * 1000)
+                if len(atrasos) == 200:
+                    return
+
+        t = threading.Thread(target=ouvinte)
+        t.start()
+        pronto.wait()
+        time.sleep(0.1)
+        for _ in range(200):
+            aluno = escritor.obter(random.randint(1, alunos))
+            aluno["dia_venc"] = random.randint(1, 31)
+            enviado.append(time.perf_counter())
+            escritor.salvar(aluno)
+            time.sleep(0.002)
+        t.join()
+        escritor.fechar()
+        servidor.fechar()
+    print(f"evento até o outro terminal: p50 {percentil(atrasos, 50):.3f} ms, "
+          f"p99 {percentil(atrasos, 99):.3f} ms")
+
+
+# ========= MEDIDAS DE DESEMPENHO =========
+
+def bench_desempenho(chamadas: int = 200_000) -> None:
+    print("== custo das medidas por chamada (desligadas x ligadas) ==")
+
+    def funcao():
+        pass
+
+    medida = desempenho.cronometrado("bench.funcao")(funcao)
+
+    def bloco():
+        with desempenho.medir("bench.bloco"):
+            pass
+
+    print(f"{'':>14} {'desligado (µs)':>15} {'ligado (µs)':>12}")
+    t_nada = cronometrar(funcao, chamadas) * 1000
+    for nome, func in (("cronometrado", medida), ("medir", bloco)):
+        desempenho.ativar(False)
+        t_desligado = cronometrar(func, chamadas) * 1000 - t_nada
+        desempenho.ativar(True)
+        t_ligado = cronometrar(func, chamadas) * 1000 - t_nada
+        print(f"{nome:>14} {t_desligado:>15.3f} {t_ligado:>12.3f}")
+    desempenho.ativar(False)
+    inicio = time.perf_counter()
+    desempenho.resumo()
+    t_resumo = (time.perf_counter() - inicio) * 1000
+    desempenho.zerar()
+    print(f"(descontada a chamada vazia, {t_nada:.3f} µs; resumo com 2 medidas cheias: {t_resumo:.1f} ms)")
+
+
+# ========= ABERTURA DO PROGRAMA =========
+
+_PASTA_CODIGO = os.path.dirname(os.path.abspath(__file__))
+
+# cada medida num interpretador novo, como o usuário abrindo o programa
+_FILHO_JANELAS = """
+import sys, time
+import login
+login.root.update()
+print(time.time())
+login.preparo = login.iniciar_preparo()
+sunset_gui, abertura = login.preparo.result()
+login.root.destroy()
+app = sunset_gui.App("admin", "admin", abertura)
+app.update()
+print(time.time())
+app.destroy()
+"""
+
+
+def _processo(codigo: str, pasta: str, *opcoes: str) -> tuple[float, subprocess.CompletedProcess]:
+    """Roda `codigo` num python novo com a pasta de trabalho `pasta`; (ms, resultado)."""
+    env = dict(os.environ, PYTHONPATH=_PASTA_CODIGO)
+    inicio = time.perf_counter()
+    r = subprocess.run(
+        [sys.executable, *opcoes, "-c", codigo], cwd=pasta, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return (time.perf_counter() - inicio) * 1000, r
+
+
+def _tempos_de_importacao(codigo: str, pasta: str) -> dict[str, float]:
+    """Tempo acumulado (ms) de cada módulo importado por `codigo` (python -X importtime)."""
+    _, r = _processo(codigo, pasta, "-X", "importtime")
+    tempos = {}
+    for linha in r.stderr.splitlines():
+        if linha.startswith("import time:") and "|" in linha:
+            _, acumulado, nome = linha.split("|")
+            if acumulado.strip().isdigit():
+                tempos[nome.strip()] = int(acumulado) / 1000
+    return tempos
+
+
+def _tem_display() -> bool:
+    import tkinter as tk
+
+    try:
+        tk.Tk().destroy()
+    except tk.TclError:
+        return False
+    return True
+
+
+def bench_abertura(n: int = 200_000, repeticoes: int = 5) -> None:
+    """Abertura do programa: imports, 1ª página de alunos e tempo até cada janela."""
+    print("== abertura: o que roda antes da janela de login (processo novo, mediana) ==")
+    with tempfile.TemporaryDirectory() as pasta:
+        # alternados, para que a variação da máquina pese igual nos três
+        tempos: dict[str, list[float]] = {"vazio": [], "antes": [], "agora": []}
+        for _ in range(repeticoes * 3):
+            tempos["vazio"].append(_processo("pass", pasta)[0])
+            tempos["antes"].append(_processo("import tkinter, autenticacao, sunset_gui", pasta)[0])
+            tempos["agora"].append(_processo("import tkinter, autenticacao", pasta)[0])
+        t_vazio, t_antes, t_agora = (percentil(t, 50) for t in tempos.values())
+        print(f"interpretador vazio: {t_vazio:.0f} ms")
+        print(f"antes (login importava sunset_gui): {t_antes:.0f} ms")
+        print(f"agora (sunset_gui em segundo plano): {t_agora:.0f} ms")
+        # só o que o login deixou de importar antes da janela
+        do_login = _tempos_de_importacao("import logging, tkinter, autenticacao", pasta)
+        da_tela = _tempos_de_importacao("import logging, tkinter, autenticacao, sunset_gui", pasta)
+        adiados = sorted(((ms, nome) for nome, ms in da_tela.items() if nome not in do_login), reverse=True)
+        print("imports adiados para depois da janela (acumulado):")
+        for ms, nome in adiados[:6]:
+            print(f"  {ms:>8.1f} ms  {nome}")
+
+        print(f"== preparar_abertura com {n} alunos (o que o login adianta) ==")
+        repo = RepositorioAlunos(os.path.join(pasta, ARQUIVO_BANCO), os.path.join(pasta, "nao_existe.json"))
+        repo.substituir_todos(gerar_alunos(n))
+        versao = repo.versao_atual()
+        registros = [Aluno.de_dict(a) for a in repo.listar()]
+        repo.fechar()
+        medir = (
+            "import time, sunset_gui\n"
+            "t = time.perf_counter(); sunset_gui.preparar_abertura()\n"
+            "print((time.perf_counter() - t) * 1000)"
+        )
+
+        def preparar() -> float:
+            return percentil([float(_processo(medir, pasta)[1].stdout) for _ in range(repeticoes)], 50)
+
+        print(f"do banco: {preparar():.1f} ms")
+        gravar_instantaneo(os.path.join(pasta, ARQUIVO_INSTANTANEO), registros, versao)
+        del registros
+        print(f"da foto binária: {preparar():.1f} ms")
+
+        if not _tem_display():
+            print("== janelas: sem display disponível, pulando ==")
+            return
+        print("== tempo até cada janela (processo novo, mediana) ==")
+        login, principal = [], []
+        for _ in range(repeticoes):
+            inicio = time.time()
+            _, r = _processo(_FILHO_JANELAS, pasta)
+            t_login, t_principal = (float(x) for x in r.stdout.split())
+            login.append((t_login - inicio) * 1000)
+            principal.append((t_principal - t_login) * 1000)
+        print(f"janela de login: {percentil(login, 50):.0f} ms")
+        print(f"login -> tela principal (já preparada): {percentil(principal, 50):.0f} ms")
+
+
+# ========= SUÍTE REPRODUTÍVEL (JSON) =========
+#
+# Os caminhos que pesam na recepção (banco/arquivos, datas, busca, catraca e,
+# se houver display, a tabela) medidos sem tela sobre o cadastro sintético da
+# mesma semente, com p50/p95 de várias repetições. O resultado vai para um
+# JSON com a máquina e o commit, e --comparar mostra a diferença para uma
+# rodada anterior.
+
+FORMATO_RESULTADOS = 1
+_CONSULTAS = ("mar", "joão", "joao silva", "conceicao", "ana lúcia", "souza lima", "gon", "zoe")
+
+
+def _amostras(func, repeticoes: int) -> list[float]:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+
+def _resultado(caminho: str, n: int, tempos: list[float]) -> dict:
+    return {
+        "caminho": caminho,
+        "n": n,
+        "repeticoes": len(tempos),
+        "p50_ms": round(percentil(tempos, 50), 4),
+        "p95_ms": round(percentil(tempos, 95), 4),
+        "min_ms": round(min(tempos), 4),
+    }
+
+
+def _suite_armazenamento(n: int, alunos: list[dict], registros: list[Aluno], pasta: str) -> list[dict]:
+    repeticoes = 3 if n > 100_000 else 5
+    repo = RepositorioAlunos(os.path.join(pasta, "suite.db"), os.path.join(pasta, "nao_existe.json"))
+    repo.substituir_todos(alunos)
+
+    def salvar_um():
+        d = dict(random.choice(alunos))
+        d["dia_venc"] = d["dia_venc"] % 31 + 1
+        repo.salvar(d)
+
+    caminho_json = os.path.join(pasta, "alunos.json")
+    arquivo_json.gravar_json(caminho_json, alunos)
+    caminho_foto = os.path.join(pasta, "alunos.snap")
+    gravar_instantaneo(caminho_foto, registros, repo.versao_atual())
+
+    def abrir_foto():
+        inst = Instantaneo(caminho_foto)
+        inst.contagem()
+        inst.fechar()
+
+    resultados = [
+        _resultado("armazenamento.carregar_banco", n,
+                   _amostras(lambda: [Aluno.de_dict(d) for d in repo.listar()], repeticoes)),
+        _resultado("armazenamento.ler_json", n, _amostras(lambda: arquivo_json.ler_json(caminho_json), repeticoes)),
+        _resultado("armazenamento.abrir_foto", n, _amostras(abrir_foto, 20)),
+        _resultado("armazenamento.salvar_um", n, _amostras(salvar_um, 50)),
+    ]
+    repo.fechar()
+    return resultados
+
+
+def _suite_datas(n: int, registros: list[Aluno]) -> list[dict]:
+    hoje = date.today()
+    repeticoes = 3 if n > 100_000 else 5
+    ordinais = [a.prox for a in registros]
+    return [
+        _resultado("datas.status_pagamento", n, _amostras(
+            lambda: [status_pagamento(a.dia_venc, a.data_prox, hoje) for a in registros], repeticoes)),
+        _resultado("datas.status_em_lote", n, _amostras(lambda: status_em_lote(ordinais, hoje), repeticoes)),
+        _resultado("datas.proximo_vencimento", n, _amostras(
+            lambda: [calcular_proximo_vencimento(a.dia_venc, hoje) for a in registros], repeticoes)),
+    ]
+
+
+def _suite_busca(n: int, colecao: ColecaoAlunos) -> list[dict]:
+    inicio = time.perf_counter()
+    indice = IndiceBusca(colecao)
+    t_indexar = (time.perf_counter() - inicio) * 1000
+    consultas = [random.choice(_CONSULTAS) for _ in range(200)]
+    tempos = [t for q in consultas for t in _amostras(lambda: indice.buscar(q, limite=200), 1)]
+    return [_resultado("busca.indexar", n, [t_indexar]), _resultado("busca.consulta", n, tempos)]
+
+
+def _suite_checkin(n: int, alunos: list[dict], colecao: ColecaoAlunos, pasta: str, semente: int) -> list[dict]:
+    indice = IndiceStatus(colecao)
+    # 5% de códigos que não existem, como na leitora de verdade
+    codigos = [random.randint(1, n) if random.random() < 0.95 else n + random.randint(1, 1000)
+               for _ in range(5_000)]
+    tempos_decidir = [t for c in codigos for t in _amostras(lambda: decidir(colecao, indice, c, c), 1)]
+
+    acessos = RegistroAcessos(os.path.join(pasta, "acessos"))
+    motor = MotorCheckin(colecao, indice, acessos, "bench")
+    for c in codigos:
+        motor.entrada(c)
+    latencias: list[float] = []
+    while len(latencias) < len(codigos):
+        latencias += [d.latencia_ms for d in motor.coletar()]
+        time.sleep(0.001)
+    motor.parar()
+
+    # histórico de 7 dias de uma amostra do cadastro: última visita de quem veio
+    sintetico.gravar_historico(acessos, alunos[:20_000], dias=7, semente=semente)
+    ids = [random.randint(1, min(n, 20_000)) for _ in range(500)]
+    tempos_visita = [t for i in ids for t in _amostras(lambda: acessos.ultima_visita(i), 1)]
+    acessos.fechar()
+    return [
+        _resultado("checkin.decidir", n, tempos_decidir),
+        _resultado("checkin.motor_latencia", n, latencias),
+        _resultado("checkin.ultima_visita", n, tempos_visita),
+    ]
+
+
+@contextmanager
+def _display_virtual():
+    """True se há display para o Tk; sem display no Linux, tenta um Xvfb temporário."""
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        yield True
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        yield False
+        return
+    tela = f":{100 + os.getpid() % 800}"
+    processo = subprocess.Popen(
+        [xvfb, tela, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    os.environ["DISPLAY"] = tela
+    try:
+        yield True
+    finally:
+        del os.environ["DISPLAY"]
+        processo.terminate()
+        processo.wait()
+
+
+def _suite_tk(tamanhos: list[int], semente: int) -> list[dict]:
+    import tkinter as tk
+    from tkinter import ttk
+
+    from tabela import TabelaVinculada, TabelaVirtual
+
+    root = None
+    for _ in range(50):  # o Xvfb leva um instante para aceitar conexões
+        try:
+            root = tk.Tk()
+            break
+        except tk.TclError:
+            time.sleep(0.1)
+    if root is None:
+        return []
+    root.withdraw()
+
+    def linha(a):
+        return (a.id, a.nome, a.dia_venc, a.prox_br), "ok"
+
+    colunas = [("id", "ID", 40), ("nome", "Nome", 260), ("dia_venc", "Dia", 60), ("prox", "Próx.", 100)]
+    resultados = []
+    for n in tamanhos:
+        registros = [Aluno.de_dict(a) for a in sintetico.gerar_alunos(n, semente)]
+        colecao = ColecaoAlunos(registros)
+        tabela = TabelaVirtual(root, colunas, linha, altura=25)
+        tabela.pack()
+
+        def virtual():
+            tabela.definir_fonte(lambda: len(colecao), colecao.faixa)
+            root.update_idletasks()
+
+        resultados.append(_resultado("tk.tabela_virtual", n, _amostras(virtual, 20)))
+        tabela.destroy()
+        if n <= 10_000:
+            # preenchimento completo (como as telas faziam antes da tabela virtual)
+            tree = ttk.Treeview(root, columns=("id", "nome", "dia_venc", "prox"), show="headings")
+            vinculada = TabelaVinculada(tree, linha)
+
+            def completa():
+                vinculada.limpar()
+                vinculada.sincronizar(registros)
+                root.update_idletasks()
+
+            resultados.append(_resultado("tk.tabela_completa", n, _amostras(completa, 3)))
+            tree.destroy()
+    root.destroy()
+    return resultados
+
+
+def _commit_atual() -> str:
+    try:
+        r = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_PASTA_CODIGO,
+            capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return r.stdout.strip()
+
+
+def rodar_suite(tamanhos: list[int], semente: int = SEMENTE, com_tk: bool = False) -> dict:
+    """Roda a suíte e devolve os resultados (já no formato do JSON)."""
+    resultados: list[dict] = []
+    for n in tamanhos:
+        print(f"suíte: {n} alunos...", flush=True)
+        random.seed(semente)
+        alunos = sintetico.gerar_alunos(n, semente)
+        registros = [Aluno.de_dict(a) for a in alunos]
+        colecao = ColecaoAlunos(registros)
+        with tempfile.TemporaryDirectory() as pasta:
+            resultados += _suite_armazenamento(n, alunos, registros, pasta)
+            resultados += _suite_datas(n, registros)
+            resultados += _suite_busca(n, colecao)
+            resultados += _suite_checkin(n, alunos, colecao, pasta, semente)
+    if com_tk:
+        with _display_virtual() as tem_display:
+            tk_resultados = _suite_tk(tamanhos, semente) if tem_display else []
+        if not tk_resultados:
+            print("suíte: sem display (nem Xvfb) para o Tk, pulando a tabela")
+        resultados += tk_resultados
+    return {
+        "formato": FORMATO_RESULTADOS,
+        "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _commit_atual(),
+        "semente": semente,
+        "tamanhos": tamanhos,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "numpy": np is not None,
+        "resultados": resultados,
+    }
+
+
+def comparar_resultados(anteriores: dict, atuais: dict) -> None:
+    """Tabela p50 antes x agora por caminho/tamanho (só o que existe nas duas rodadas)."""
+    antes = {(r["caminho"], r["n"]): r for r in anteriores["resultados"]}
+    print(f"== comparação com {anteriores.get('commit') or '?'} ({anteriores.get('gerado_em', '?')}) ==")
+    if anteriores.get("semente") != atuais["semente"]:
+        print("(atenção: sementes diferentes, os cadastros não são os mesmos)")
+    print(f"{'caminho':<30} {'n':>9} {'p50 antes':>11} {'p50 agora':>11} {'variação':>9}")
+    for r in atuais["resultados"]:
+        a = antes.get((r["caminho"], r["n"]))
+        if a is None:
+            continue
+        variacao = (r["p50_ms"] / a["p50_ms"] - 1) * 100 if a["p50_ms"] else float("nan")
+        print(f"{r['caminho']:<30} {r['n']:>9} {a['p50_ms']:>11.3f} {r['p50_ms']:>11.3f} {variacao:>+8.0f}%")
+
+
+BENCHMARKS = {
+    "escrita": bench_escrita,
+    "vencimentos": bench_vencimentos,
+    "colecao": bench_colecao,
+    "registro": bench_registro,
+    "carga": bench_carga,
+    "instantaneo": bench_instantaneo,
+    "gravacao": bench_gravacao,
+    "arquivo_json": bench_arquivo_json,
+    "terminais": bench_terminais,
+    "acessos": bench_acessos,
+    "catraca": bench_catraca,
+    "servidor": bench_servidor,
+    "abertura": bench_abertura,
+    "desempenho": bench_desempenho,
+    "tabela": bench_tabela,
+    "tabela_virtual": bench_tabela_virtual,
+}
+
+
+def principal() -> None:
+    global SEMENTE
+    parser = argparse.ArgumentParser(description="Benchmarks da portaria.")
+    parser.add_argument("nomes", nargs="*", help="benchmarks em texto (padrão: todos): " + ", ".join(BENCHMARKS))
+    parser.add_argument("--semente", type=int, default=SEMENTE, help="semente do cadastro sintético")
+    parser.add_argument("--json", help="roda a suíte reprodutível e grava os resultados neste arquivo")
+    parser.add_argument("--tamanhos", default="1000,10000,100000", help="alunos por rodada da suíte")
+    parser.add_argument("--tk", action="store_true", help="suíte: inclui a tabela (display ou Xvfb)")
+    parser.add_argument("--comparar", help="suíte: resultados anteriores (JSON) para comparar")
+    args = parser.parse_args()
+
+    SEMENTE = args.semente
+    random.seed(args.semente)
+    if args.json:
+        tamanhos = [int(t) for t in args.tamanhos.split(",")]
+        resultados = rodar_suite(tamanhos, args.semente, args.tk)
+        arquivo_json.gravar_json(args.json, resultados)
+        print(f"{len(resultados['resultados'])} medidas gravadas em {args.json}")
+        if args.comparar:
+            comparar_resultados(arquivo_json.ler_json(args.comparar), resultados)
+        return
+    for nome in args.nomes or list(BENCHMARKS):
+        BENCHMARKS[nome]()
+
+
+if __name__ == "__main__":
+    principal()
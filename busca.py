@@ -0,0 +1,143 @@
+import heapq
+from itertools import islice
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Iterable
+
+from aluno import Aluno
+from repositorio import normalizar_nome
+
+# pontuação de cada palavra da busca contra uma palavra do nome
+PONTOS_EXATO = 1.0
+PONTOS_PREFIXO = 0.9
+PONTOS_APROXIMADO = 0.7   # multiplicado pela semelhança (0-1)
+
+# semelhança mínima (Dice sobre trigramas) para aceitar erro de digitação
+SEMELHANCA_MINIMA = 0.5
+TAMANHO_MINIMO_APROXIMADO = 3
+
+# buscas muito genéricas ("a s") casam com quase todos; ranqueia só uma amostra
+MAXIMO_PONTUADOS = 5000
+
+
+def _trigramas(termo: str) -> set[str]:
+    t = f"  {termo} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+class IndiceBusca:
+    """Índice de nomes para a pesquisa: sem acento, por prefixo e tolerante a erro.
+
+    - termos: lista ordenada de palavras (busca por prefixo com bisect)
+    - postagens: palavra -> ids dos alunos que têm essa palavra no nome
+    - trigramas: trigrama -> palavras, para achar "patrica" -> "patricia"
+    """
+
+    def __init__(self, alunos: Iterable[Aluno] = ()):
+        self._registros: dict[int, Aluno] = {}
+        self._termos_de: dict[int, tuple[str, ...]] = {}
+        self._postagens: dict[str, set[int]] = defaultdict(set)
+        self._termos: list[str] = []
+        self._trigramas: dict[str, set[str]] = defaultdict(set)
+        for a in alunos:
+            self.atualizar(a)
+
+    # ----- alterações -----
+
+    def atualizar(self, aluno: Aluno) -> None:
+        i = aluno.id
+        termos = tuple(dict.fromkeys(normalizar_nome(aluno.nome).split()))
+        self._registros[i] = aluno
+        if self._termos_de.get(i) == termos:
+            return
+        self._tirar(i)
+        self._termos_de[i] = termos
+        for t in termos:
+            ids = self._postagens[t]
+            if not ids:
+                insort(self._termos, t)
+                for g in _trigramas(t):
+                    self._trigramas[g].add(t)
+            ids.add(i)
+
+    def remover(self, aluno_id: int) -> None:
+        self._tirar(aluno_id)
+        self._registros.pop(aluno_id, None)
+
+    def _tirar(self, i: int) -> None:
+        for t in self._termos_de.pop(i, ()):
+            ids = self._postagens[t]
+            ids.discard(i)
+            if not ids:
+                del self._postagens[t]
+                del self._termos[bisect_left(self._termos, t)]
+                for g in _trigramas(t):
+                    self._trigramas[g].discard(t)
+
+    # ----- busca -----
+
+    def buscar(self, q: str, limite: int = 50) -> list[Aluno]:
+        """Os `limite` alunos mais parecidos com `q`, do melhor para o pior."""
+        palavras = normalizar_nome(q).split()
+        if not palavras:
+            return []
+
+        candidatos_por_palavra = [self._termos_parecidos(p) for p in palavras]
+        if any(not c for c in candidatos_por_palavra):
+            return []
+
+        if len(palavras) == 1:
+            return self._melhores_uma_palavra(candidatos_por_palavra[0], limite)
+
+        # interseção dos alunos de cada palavra (operações de set, em C),
+        # começando pela menor; só quem sobrou é pontuado
+        conjuntos = sorted(
+            (set().union(*(self._postagens[t] for t in cand)) for cand in candidatos_por_palavra),
+            key=len,
+        )
+        ids = conjuntos[0].intersection(*conjuntos[1:])
+
+        pontuados = []
+        for i in islice(ids, MAXIMO_PONTUADOS):
+            termos = self._termos_de[i]
+            total = sum(
+                max(cand.get(t, 0) for t in termos) for cand in candidatos_por_palavra
+            )
+            pontuados.append((total, i))
+
+        melhores = heapq.nlargest(limite, pontuados, key=lambda x: (x[0], -x[1]))
+        return [self._registros[i] for _, i in melhores]
+
+    def _melhores_uma_palavra(self, candidatos: dict[str, float], limite: int) -> list[Aluno]:
+        # termos do mais parecido para o menos; para quando já tem `limite` alunos
+        vistos: dict[int, None] = {}
+        for termo, _ in sorted(candidatos.items(), key=lambda x: (-x[1], x[0])):
+            for i in self._postagens[termo]:
+                vistos.setdefault(i)
+                if len(vistos) >= limite:
+                    return [self._registros[i] for i in vistos]
+        return [self._registros[i] for i in vistos]
+
+    def _termos_parecidos(self, palavra: str) -> dict[str, float]:
+        """Termos do índice que casam com a palavra, com a pontuação de cada um."""
+        encontrados: dict[str, float] = {}
+
+        pos = bisect_left(self._termos, palavra)
+        while pos < len(self._termos) and self._termos[pos].startswith(palavra):
+            t = self._termos[pos]
+            encontrados[t] = PONTOS_EXATO if t == palavra else PONTOS_PREFIXO
+            pos += 1
+
+        if len(palavra) >= TAMANHO_MINIMO_APROXIMADO and palavra not in encontrados:
+            grams = _trigramas(palavra)
+            comuns: dict[str, int] = defaultdict(int)
+            for g in grams:
+                for t in self._trigramas.get(g, ()):
+                    comuns[t] += 1
+            for t, n in comuns.items():
+                if t in encontrados:
+                    continue
+                semelhanca = 2 * n / (len(grams) + len(t) + 1)
+                if semelhanca >= SEMELHANCA_MINIMA:
+                    encontrados[t] = PONTOS_APROXIMADO * semelhanca
+        return encontrados
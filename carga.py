@@ -0,0 +1,95 @@
+import logging
+import queue
+import threading
+from typing import Iterator
+
+from aluno import Aluno
+from instantaneo import Instantaneo
+from repositorio import ARQUIVO_BANCO, RepositorioAlunos
+
+log = logging.getLogger("sunset.carga")
+
+# alunos lidos e convertidos por vez na thread de carga
+TAMANHO_LOTE = 1000
+
+
+# ========= CARGA EM SEGUNDO PLANO =========
+#
+# A tela abre só com a primeira página de alunos, lida na hora. O resto é
+# lido por esta thread, em lotes já convertidos para Aluno; a tela pega os
+# lotes com root.after e coloca na coleção (que avisa os índices) aos
+# poucos, sem travar o Tk. Com a foto binária aberta, os lotes saem dela
+# (sem SQL nem datas em texto) em vez do banco.
+
+
+class CargaAlunos:
+    def __init__(
+        self,
+        caminho_banco: str = ARQUIVO_BANCO,
+        depois_do_id: int = 0,
+        tamanho_lote: int = TAMANHO_LOTE,
+        instantaneo: Instantaneo | None = None,
+    ):
+        self.caminho_banco = caminho_banco
+        self.depois_do_id = depois_do_id
+        self.tamanho_lote = tamanho_lote
+        self.instantaneo = instantaneo
+        self.terminada = False
+        self.erro = ""
+
+        self._lotes: queue.SimpleQueue = queue.SimpleQueue()
+        self._parar = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def iniciar(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._laco, name="carga-alunos", daemon=True)
+            self._thread.start()
+
+    def coletar(self, maximo_lotes: int | None = None) -> list[Aluno]:
+        """Alunos já lidos (não bloqueia). Marca `terminada` ao pegar o último lote."""
+        alunos: list[Aluno] = []
+        n = 0
+        while not self.terminada and (maximo_lotes is None or n < maximo_lotes):
+            try:
+                lote = self._lotes.get_nowait()
+            except queue.Empty:
+                break
+            if lote is None:
+                self.terminada = True
+            elif isinstance(lote, Exception):
+                self.erro = str(lote)
+            else:
+                alunos += lote
+                n += 1
+        return alunos
+
+    def parar(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _laco(self) -> None:
+        try:
+            for lote in self._ler_lotes():
+                if self._parar.is_set():
+                    return
+                self._lotes.put(lote)
+        except Exception as e:
+            log.exception("falha ao carregar alunos")
+            self._lotes.put(e)
+        finally:
+            self._lotes.put(None)
+
+    def _ler_lotes(self) -> Iterator[list[Aluno]]:
+        if self.instantaneo is not None:
+            inicio = self.instantaneo.posicao(self.depois_do_id)
+            yield from self.instantaneo.lotes(self.tamanho_lote, inicio)
+            return
+        repo = RepositorioAlunos(self.caminho_banco)
+        try:
+            for lote in repo.listar_em_lotes(self.tamanho_lote, self.depois_do_id):
+                yield [Aluno.de_dict(d) for d in lote]
+        finally:
+            repo.fechar()
@@ -0,0 +1,176 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from acessos import Acesso, RegistroAcessos
+from aluno import Aluno
+from colecao import ColecaoAlunos
+from desempenho import ativo, cronometrado, registrar
+from indice_status import IndiceStatus
+
+log = logging.getLogger("sunset.catraca")
+
+# quantas leituras a thread decide de uma vez antes de gravar/publicar
+LOTE_MAXIMO = 256
+
+
+# ========= MOTOR DE CHECK-IN (CATRACA) =========
+#
+# No horário de pico a leitora manda códigos mais rápido do que um
+# messagebox por aluno permite. O motor recebe os códigos numa fila, decide
+# liberar/negar em memória (coleção + índice de situação, sem banco), grava
+# os acessos em lote no histórico e deixa as decisões numa fila de saída
+# que a tela lê com root.after, sem travar o Tk.
+
+
+class Decisao(NamedTuple):
+    codigo: int | str
+    aluno_id: int | None
+    nome: str
+    liberado: bool
+    motivo: str
+    latencia_ms: float
+
+
+def codigo_para_id(codigo: int | str) -> int | None:
+    """Leitora simulada: o código é a matrícula (id) do aluno."""
+    try:
+        return int(codigo)
+    except (TypeError, ValueError):
+        return None
+
+
+def decidir(
+    alunos: ColecaoAlunos,
+    indice_status: IndiceStatus,
+    aluno_id: int | None,
+    codigo: int | str,
+    reserva: Callable[[int], Aluno | None] | None = None,
+) -> tuple[int | None, str, bool, str]:
+    """(id, nome, liberado, motivo) de uma leitura; só consulta memória.
+
+    `reserva` responde pelos alunos que ainda não chegaram à coleção (a foto
+    binária durante a carga).
+
+    Roda na thread da catraca enquanto o Tk altera a coleção e os índices:
+    a situação sai do vencimento do próprio registro (classificar só lê a
+    data de hoje), sem depender de o índice já ter recebido o aluno.
+    """
+    if aluno_id is None:
+        return aluno_id, str(codigo), False, "não encontrado"
+    aluno = alunos.obter(aluno_id)
+    if aluno is None and reserva is not None:
+        aluno = reserva(aluno_id)
+    if aluno is None:
+        return aluno_id, str(codigo), False, "não encontrado"
+    status = indice_status.classificar(aluno.prox)
+    if status == "atrasado":
+        return aluno_id, aluno.nome, False, "em atraso"
+    if status == "aviso":
+        return aluno_id, aluno.nome, True, "vencimento próximo"
+    return aluno_id, aluno.nome, True, ""
+
+
+class MotorCheckin:
+    def __init__(
+        self,
+        alunos: ColecaoAlunos,
+        indice_status: IndiceStatus,
+        acessos: RegistroAcessos,
+        usuario: str = "",
+        resolver: Callable[[int | str], int | None] = codigo_para_id,
+        pronto: threading.Event | None = None,
+        reserva: Callable[[int], Aluno | None] | None = None,
+    ):
+        self.alunos = alunos
+        self.indice_status = indice_status
+        self.acessos = acessos
+        self.usuario = usuario
+        self.resolver = resolver
+        # enquanto os alunos ainda estão sendo carregados, as leituras esperam
+        # na fila (senão quem não chegou à memória seria "não encontrado")
+        self.pronto = pronto
+        # ou, se houver, a reserva responde por eles e ninguém espera
+        self.reserva = reserva
+
+        self._entrada: queue.SimpleQueue = queue.SimpleQueue()
+        self._saida: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+
+    def entrada(self, codigo: int | str) -> None:
+        """Enfileira uma leitura (pode ser chamado de qualquer thread)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._laco, name="catraca", daemon=True)
+            self._thread.start()
+        self._entrada.put((codigo, time.perf_counter()))
+
+    def coletar(self) -> list[Decisao]:
+        """Decisões prontas desde a última chamada (não bloqueia)."""
+        prontas = []
+        try:
+            while True:
+                prontas.append(self._saida.get_nowait())
+        except queue.Empty:
+            return prontas
+
+    def parar(self) -> None:
+        """Decide o que ainda está na fila e encerra a thread."""
+        if self._thread is not None:
+            self._entrada.put(None)
+            self._thread.join()
+            self._thread = None
+
+    # ----- internos -----
+
+    def _laco(self) -> None:
+        if self.pronto is not None and self.reserva is None:
+            self.pronto.wait()
+        while True:
+            lote = [self._entrada.get()]
+            try:
+                while len(lote) < LOTE_MAXIMO:
+                    lote.append(self._entrada.get_nowait())
+            except queue.Empty:
+                pass
+            fim = lote[-1] is None
+            leituras = [item for item in lote if item is not None]
+            try:
+                self._processar(leituras)
+            except Exception:
+                # a thread não pode morrer: as próximas leituras ficariam na fila para sempre
+                log.exception("falha ao decidir %d leitura(s) da catraca", len(leituras))
+                self._recusar(leituras)
+            if fim:
+                return
+
+    @cronometrado("catraca.lote")
+    def _processar(self, lote: list[tuple[int | str, float]]) -> None:
+        agora = datetime.now().replace(microsecond=0)
+        registros: list[Acesso] = []
+        decisoes = []
+        for codigo, enfileirado in lote:
+            aluno_id, nome, liberado, motivo = decidir(
+                self.alunos, self.indice_status, self.resolver(codigo), codigo, self.reserva
+            )
+            registros.append(Acesso(agora, aluno_id, nome, liberado, motivo, self.usuario))
+            decisoes.append((codigo, aluno_id, nome, liberado, motivo, enfileirado))
+        self.acessos.registrar_lote(registros)
+
+        pronto = time.perf_counter()
+        medindo = ativo()
+        for codigo, aluno_id, nome, liberado, motivo, enfileirado in decisoes:
+            latencia_ms = (pronto - enfileirado) * 1000
+            self._saida.put(Decisao(codigo, aluno_id, nome, liberado, motivo, latencia_ms))
+            if medindo:
+                registrar("catraca.decisao", latencia_ms)
+
+    def _recusar(self, lote: list[tuple[int | str, float]]) -> None:
+        """Devolve à tela leituras que não puderam ser decididas (passar de novo)."""
+        pronto = time.perf_counter()
+        for codigo, enfileirado in lote:
+            self._saida.put(Decisao(
+                codigo, None, str(codigo), False, "erro, passe de novo", (pronto - enfileirado) * 1000
+            ))
@@ -0,0 +1,90 @@
+from bisect import bisect_left
+from typing import Callable, Iterable, Iterator, Protocol
+
+from aluno import Aluno
+
+
+class Indice(Protocol):
+    def atualizar(self, aluno: Aluno) -> None: ...
+    def remover(self, aluno_id: int) -> None: ...
+
+
+class ColecaoAlunos:
+    """Alunos em memória, com mapa id -> registro e gerador de ids crescente.
+
+    A ordem de exibição é a dos ids (os ids só crescem, então a lista de
+    ordem continua ordenada e a remoção acha a posição por bisect). Índices
+    registrados com `observar` são avisados de cada inclusão/alteração/remoção.
+    """
+
+    def __init__(self, alunos: Iterable[Aluno] = (), reservar_id: Callable[[], int] | None = None):
+        # com vários terminais, `reservar_id` pede o id ao banco em vez do contador local
+        self._reservar_id = reservar_id
+        self._por_id: dict[int, Aluno] = {}
+        for a in alunos:
+            self._por_id[a.id] = a
+        self._ordem: list[int] = sorted(self._por_id)
+        self._proximo_id = (self._ordem[-1] + 1) if self._ordem else 1
+        self._indices: list[Indice] = []
+
+    def observar(self, indice: Indice) -> None:
+        self._indices.append(indice)
+
+    # ----- consultas -----
+
+    def __len__(self) -> int:
+        return len(self._ordem)
+
+    def __iter__(self) -> Iterator[Aluno]:
+        por_id = self._por_id
+        return (por_id[i] for i in self._ordem)
+
+    def __contains__(self, aluno_id: int) -> bool:
+        return aluno_id in self._por_id
+
+    def obter(self, aluno_id: int) -> Aluno | None:
+        return self._por_id.get(aluno_id)
+
+    def faixa(self, inicio: int, fim: int) -> list[Aluno]:
+        por_id = self._por_id
+        return [por_id[i] for i in self._ordem[inicio:fim]]
+
+    # ----- alterações -----
+
+    def novo_id(self) -> int:
+        """Reserva o próximo id (nunca reaproveita ids de alunos removidos)."""
+        if self._reservar_id is not None:
+            i = self._reservar_id()
+            self._proximo_id = max(self._proximo_id, i + 1)
+            return i
+        i = self._proximo_id
+        self._proximo_id += 1
+        return i
+
+    def adicionar(self, aluno: Aluno) -> None:
+        i = aluno.id
+        if i in self._por_id:
+            raise ValueError(f"aluno {i} já existe")
+        self._por_id[i] = aluno
+        if not self._ordem or i > self._ordem[-1]:
+            self._ordem.append(i)
+        else:
+            self._ordem.insert(bisect_left(self._ordem, i), i)
+        self._proximo_id = max(self._proximo_id, i + 1)
+        for indice in self._indices:
+            indice.atualizar(aluno)
+
+    def atualizar(self, aluno: Aluno) -> None:
+        """Avisa os índices de que o registro (já alterado no lugar) mudou."""
+        self._por_id[aluno.id] = aluno
+        for indice in self._indices:
+            indice.atualizar(aluno)
+
+    def remover(self, aluno_id: int) -> Aluno | None:
+        aluno = self._por_id.pop(aluno_id, None)
+        if aluno is None:
+            return None
+        del self._ordem[bisect_left(self._ordem, aluno_id)]
+        for indice in self._indices:
+            indice.remover(aluno_id)
+        return aluno
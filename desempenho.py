@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import wraps
+from typing import Callable
+
+from arquivo_json import gravar_json
+
+ARQUIVO_DESEMPENHO = "desempenho.json"
+
+# amostras mais recentes guardadas por medida (os percentis saem delas)
+AMOSTRAS_MANTIDAS = 4096
+
+
+# ========= MEDIDAS DE DESEMPENHO =========
+#
+# Tempos de abertura, gravação, telas e catraca, por nome ("tela.alunos.
+# atualizar", "catraca.lote"...), guardados em memória com contagem, média,
+# máximo e p50/p95/p99 das últimas AMOSTRAS_MANTIDAS chamadas. A tela
+# Desempenho (admin) mostra os números e grava tudo num JSON para análise.
+#
+# Desligado por padrão (ligar com SUNSET_DESEMPENHO=1 ou pela tela): aí
+# medir() devolve sempre o mesmo objeto vazio e cronometrado() só testa uma
+# variável antes de chamar a função: ~0,2 µs por chamada (bench.py desempenho).
+
+_ativo = os.environ.get("SUNSET_DESEMPENHO", "") not in ("", "0")
+_medidas: dict[str, "Medida"] = {}
+_trava = threading.Lock()
+
+
+def percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+class Medida:
+    __slots__ = ("nome", "chamadas", "soma_ms", "maximo_ms", "amostras")
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.chamadas = 0
+        self.soma_ms = 0.0
+        self.maximo_ms = 0.0
+        self.amostras: deque[float] = deque(maxlen=AMOSTRAS_MANTIDAS)
+
+    def registrar(self, ms: float) -> None:
+        self.chamadas += 1
+        self.soma_ms += ms
+        if ms > self.maximo_ms:
+            self.maximo_ms = ms
+        self.amostras.append(ms)
+
+
+def ativo() -> bool:
+    return _ativo
+
+
+def ativar(ligar: bool = True) -> None:
+    global _ativo
+    _ativo = ligar
+
+
+def registrar(nome: str, ms: float) -> None:
+    """Soma uma duração já medida (ex.: latência calculada em outro lugar)."""
+    if not _ativo:
+        return
+    with _trava:
+        medida = _medidas.get(nome)
+        if medida is None:
+            medida = _medidas[nome] = Medida(nome)
+        medida.registrar(ms)
+
+
+class _Cronometro:
+    __slots__ = ("nome", "inicio")
+
+    def __init__(self, nome: str):
+        self.nome = nome
+
+    def __enter__(self) -> "_Cronometro":
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        registrar(self.nome, (time.perf_counter() - self.inicio) * 1000)
+
+
+class _Desligado:
+    __slots__ = ()
+
+    def __enter__(self) -> "_Desligado":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_DESLIGADO = _Desligado()
+
+
+def medir(nome: str) -> _Cronometro | _Desligado:
+    """`with medir("nome"):` mede o bloco (se as medidas estiverem ligadas)."""
+    if not _ativo:
+        return _DESLIGADO
+    return _Cronometro(nome)
+
+
+def cronometrado(nome: str) -> Callable[[Callable], Callable]:
+    """Decorador: mede cada chamada da função com o nome dado."""
+    def decorar(func: Callable) -> Callable:
+        @wraps(func)
+        def medida(*args, **kwargs):
+            if not _ativo:
+                return func(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registrar(nome, (time.perf_counter() - inicio) * 1000)
+        return medida
+    return decorar
+
+
+# ========= CONSULTA / ARQUIVO =========
+
+def resumo() -> list[dict]:
+    """Uma linha por medida, em ordem de nome (tempos em ms)."""
+    with _trava:
+        copias = [
+            (m.nome, m.chamadas, m.soma_ms, m.maximo_ms, list(m.amostras))
+            for m in _medidas.values()
+        ]
+    linhas = []
+    for nome, chamadas, soma, maximo, amostras in sorted(copias):
+        linhas.append({
+            "nome": nome,
+            "chamadas": chamadas,
+            "media_ms": soma / chamadas,
+            "p50_ms": percentil(amostras, 50),
+            "p95_ms": percentil(amostras, 95),
+            "p99_ms": percentil(amostras, 99),
+            "max_ms": maximo,
+        })
+    return linhas
+
+
+def zerar() -> None:
+    with _trava:
+        _medidas.clear()
+
+
+def gravar(caminho: str = ARQUIVO_DESEMPENHO) -> str:
+    """Grava o resumo e as amostras recentes de cada medida em JSON."""
+    with _trava:
+        amostras = {m.nome: list(m.amostras) for m in _medidas.values()}
+    linhas = resumo()
+    for linha in linhas:
+        linha["amostras_ms"] = [round(ms, 3) for ms in amostras.get(linha["nome"], ())]
+    gravar_json(caminho, {"gerado_em": datetime.now().isoformat(timespec="seconds"), "medidas": linhas})
+    return os.path.abspath(caminho)
@@ -0,0 +1,222 @@
+import logging
+import queue
+import threading
+from collections import deque
+from typing import NamedTuple
+
+from aluno import Aluno
+from autenticacao import salvar_usuarios
+from desempenho import cronometrado
+from repositorio import ARQUIVO_BANCO, RepositorioAlunos
+
+log = logging.getLogger("sunset.gravacao")
+
+# alterações diferentes aguardando gravação; acima disso quem enfileira espera
+LIMITE_PENDENTES = 10_000
+
+# espera antes de tentar de novo quando o disco/banco falhou
+ESPERA_NOVA_TENTATIVA = 2.0
+
+# ids de alunos novos reservados no banco de uma vez (pedido de novo ao chegar a 1/4)
+IDS_POR_RESERVA = 32
+
+
+# ========= GRAVAÇÃO EM SEGUNDO PLANO =========
+#
+# Os botões da tela só enfileiram a alteração e voltam na hora; uma thread
+# grava no banco / usuarios.json. Alterações pendentes do mesmo registro se
+# juntam (só a última é gravada) e vários alunos vão numa transação só.
+# O resultado de cada lote fica numa fila que a tela lê com root.after.
+# Os ids de alunos novos também são reservados aqui, em blocos e antes de
+# serem pedidos: incluir um aluno não espera a trava do banco.
+
+
+class SemIdReservado(Exception):
+    """Nenhum id reservado no momento (banco ocupado): tentar de novo em instantes."""
+
+
+class ResultadoGravacao(NamedTuple):
+    ok: bool
+    descricao: str
+    erro: str = ""
+    # alunos não gravados porque outro terminal alterou/removeu antes
+    conflitos: tuple[int, ...] = ()
+
+
+class GravadorSegundoPlano:
+    def __init__(self, caminho_banco: str = ARQUIVO_BANCO, limite: int = LIMITE_PENDENTES):
+        self.caminho_banco = caminho_banco
+        self.limite = limite
+
+        # chave -> operação; a mais nova substitui a anterior da mesma chave
+        self._pendentes: dict[tuple, tuple] = {}
+        self._cond = threading.Condition()
+        self._gravando = False
+        self._em_gravacao: set[tuple] = set()
+        self._fechando = False
+        # versão que esta thread gravou por último em cada aluno (ver _versao_lida)
+        self._versoes: dict[int, int] = {}
+        self._thread: threading.Thread | None = None
+        self._resultados: queue.SimpleQueue = queue.SimpleQueue()
+        # ids já reservados no banco, entregues por novo_id sem tocar no disco
+        self._ids: deque[int] = deque()
+
+    # ----- enfileirar (thread da tela) -----
+
+    def salvar_aluno(self, aluno: Aluno) -> None:
+        # foto em dict: a tela continua alterando o objeto
+        self._agendar(("aluno", aluno.id), ("salvar", aluno.para_dict()))
+
+    def remover_aluno(self, aluno_id: int) -> None:
+        self._agendar(("aluno", aluno_id), ("remover", aluno_id))
+
+    def salvar_alunos(self, alunos: list[Aluno]) -> None:
+        """Substitui todos os alunos; descarta alterações individuais ainda pendentes."""
+        with self._cond:
+            for chave in [c for c in self._pendentes if c[0] == "aluno"]:
+                del self._pendentes[chave]
+        self._agendar(("alunos",), ("substituir", [a.para_dict() for a in alunos]))
+
+    def salvar_usuarios(self, usuarios: list[dict]) -> None:
+        self._agendar(("usuarios",), ("salvar", [dict(u) for u in usuarios]))
+
+    def reservar_ids(self) -> None:
+        """Pede à thread um bloco de ids para alunos novos (chamar na abertura)."""
+        self._agendar(("ids",), ("reservar", IDS_POR_RESERVA))
+
+    def novo_id(self) -> int:
+        """Um id já reservado no banco. Levanta SemIdReservado se acabaram."""
+        with self._cond:
+            if len(self._ids) <= IDS_POR_RESERVA // 4:
+                self.reservar_ids()
+            if not self._ids:
+                raise SemIdReservado()
+            return self._ids.popleft()
+
+    def pendente(self, aluno_id: int) -> bool:
+        """True se há alteração deste aluno ainda não gravada."""
+        chave = ("aluno", aluno_id)
+        with self._cond:
+            return chave in self._pendentes or chave in self._em_gravacao
+
+    def coletar(self) -> list[ResultadoGravacao]:
+        """Resultados dos lotes gravados desde a última chamada (não bloqueia)."""
+        prontos = []
+        try:
+            while True:
+                prontos.append(self._resultados.get_nowait())
+        except queue.Empty:
+            return prontos
+
+    def aguardar(self, timeout: float | None = None) -> bool:
+        """Espera tudo que foi enfileirado até agora ser gravado."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pendentes and not self._gravando, timeout
+            )
+
+    def fechar(self) -> None:
+        """Grava o que falta (uma última tentativa) e encerra a thread."""
+        with self._cond:
+            self._fechando = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _agendar(self, chave: tuple, operacao: tuple) -> None:
+        with self._cond:
+            if chave not in self._pendentes:
+                self._cond.wait_for(lambda: len(self._pendentes) < self.limite)
+            self._pendentes[chave] = operacao
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._laco, name="gravacao", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    # ----- thread de gravação -----
+
+    def _laco(self) -> None:
+        repo = RepositorioAlunos(self.caminho_banco)
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._pendentes or self._fechando)
+                    if not self._pendentes:
+                        return
+                    lote, self._pendentes = self._pendentes, {}
+                    self._em_gravacao = set(lote)
+                    self._gravando = True
+                    self._cond.notify_all()
+
+                falhas = self._gravar(repo, lote)
+
+                with self._cond:
+                    if falhas and not self._fechando:
+                        # devolve o que falhou, sem passar por cima de alteração mais nova
+                        for chave, operacao in falhas.items():
+                            self._pendentes.setdefault(chave, operacao)
+                    self._gravando = False
+                    self._em_gravacao = set()
+                    self._cond.notify_all()
+                    if falhas and not self._fechando:
+                        self._cond.wait_for(lambda: self._fechando, ESPERA_NOVA_TENTATIVA)
+        finally:
+            repo.fechar()
+
+    @cronometrado("gravacao.lote")
+    def _gravar(self, repo: RepositorioAlunos, lote: dict[tuple, tuple]) -> dict[tuple, tuple]:
+        """Grava um lote. Retorna as operações que falharam."""
+        falhas: dict[tuple, tuple] = {}
+
+        alunos = {c: op for c, op in lote.items() if c[0] in ("aluno", "alunos")}
+        if alunos:
+            try:
+                substituir = alunos.get(("alunos",))
+                if substituir is not None:
+                    repo.substituir_todos(substituir[1])
+                individuais = [op for c, op in alunos.items() if c[0] == "aluno"]
+                salvar = [dado for acao, dado in individuais if acao == "salvar"]
+                conflitos = repo.aplicar_lote(
+                    salvar,
+                    [dado for acao, dado in individuais if acao == "remover"],
+                    {a["id"]: self._versao_lida(a) for a in salvar},
+                )
+                for a in salvar:
+                    if a["id"] not in conflitos:
+                        self._versoes[a["id"]] = a["versao"]
+                self._resultados.put(ResultadoGravacao(
+                    True, f"{len(alunos) - len(conflitos)} aluno(s) gravado(s)", "", tuple(conflitos)
+                ))
+            except Exception as e:
+                log.exception("falha ao gravar alunos")
+                falhas.update(alunos)
+                self._resultados.put(ResultadoGravacao(False, "alunos", str(e)))
+
+        ids = lote.get(("ids",))
+        if ids is not None:
+            try:
+                reservados = repo.reservar_ids(ids[1])
+                with self._cond:
+                    self._ids.extend(reservados)
+            except Exception as e:
+                log.exception("falha ao reservar ids")
+                falhas[("ids",)] = ids
+                self._resultados.put(ResultadoGravacao(False, "a reserva de ids", str(e)))
+
+        usuarios = lote.get(("usuarios",))
+        if usuarios is not None:
+            try:
+                salvar_usuarios(usuarios[1])
+                self._resultados.put(ResultadoGravacao(True, "usuários gravados"))
+            except Exception as e:
+                log.exception("falha ao gravar usuários")
+                falhas[("usuarios",)] = usuarios
+                self._resultados.put(ResultadoGravacao(False, "usuários", str(e)))
+
+        return falhas
+
+    def _versao_lida(self, aluno: dict) -> int:
+        # a cópia pode ter a versão de antes da nossa última gravação (a tela só
+        # recebe a versão nova na próxima leitura do log); as versões só crescem
+        return max(aluno.get("versao", 0), self._versoes.get(aluno["id"], 0))
@@ -0,0 +1,144 @@
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Iterable, Iterator
+
+from aluno import Aluno
+from vencimentos import DIAS_AVISO, STATUS_POR_CODIGO, status_em_lote
+
+STATUS = ("ok", "aviso", "atrasado")
+
+
+class IndiceStatus:
+    """Situação de pagamento de todos os alunos, calculada uma vez e mantida em dia.
+
+    Trabalha com o ordinal do vencimento (Aluno.prox). Cada situação
+    (ok/aviso/atrasado) tem uma lista de (ordinal, id) ordenada pelo
+    vencimento, então as contagens são len() e a virada do dia só move os
+    alunos que estão no começo de cada lista.
+    """
+
+    def __init__(self, alunos: Iterable[Aluno] = (), hoje: date | None = None):
+        self.hoje = hoje or date.today()
+        self._registros: dict[int, Aluno] = {}
+        # vencimento com que cada aluno está nos grupos (o registro pode já ter mudado)
+        self._prox: dict[int, int] = {}
+        self._grupos: dict[str, list[tuple[int, int]]] = {s: [] for s in STATUS}
+
+        for a in alunos:
+            self._registros[a.id] = a
+            self._prox[a.id] = a.prox
+        self._reconstruir()
+
+    # ----- consultas -----
+
+    def contagem(self) -> dict[str, int]:
+        return {s: len(g) for s, g in self._grupos.items()}
+
+    def status(self, aluno_id: int) -> str:
+        return self.classificar(self._prox[aluno_id])
+
+    def prox(self, aluno_id: int) -> date:
+        return date.fromordinal(self._prox[aluno_id])
+
+    def __len__(self) -> int:
+        return len(self._prox)
+
+    def __contains__(self, aluno_id: int) -> bool:
+        return aluno_id in self._prox
+
+    def ids(self, *status: str) -> Iterator[int]:
+        """Ids das situações pedidas, cada grupo em ordem de vencimento."""
+        for s in status:
+            for _, i in self._grupos[s]:
+                yield i
+
+    def contar(self, *status: str) -> int:
+        return sum(len(self._grupos[s]) for s in status)
+
+    def faixa(self, inicio: int, fim: int, *status: str) -> list[Aluno]:
+        """Registros [inicio:fim] da concatenação dos grupos (para tabela virtual)."""
+        resultado = []
+        for s in status:
+            grupo = self._grupos[s]
+            if inicio < len(grupo):
+                resultado += [self._registros[i] for _, i in grupo[inicio:fim]]
+            inicio = max(0, inicio - len(grupo))
+            fim = max(0, fim - len(grupo))
+            if fim == 0:
+                break
+        return resultado
+
+    # ----- alterações -----
+
+    def atualizar(self, aluno: Aluno) -> None:
+        """Inclui ou reposiciona um aluno depois de pagamento/edição."""
+        i = aluno.id
+        if i in self._prox:
+            self._tirar(i)
+        self._registros[i] = aluno
+        self._prox[i] = aluno.prox
+        self._colocar(i)
+
+    def remover(self, aluno_id: int) -> None:
+        if aluno_id in self._prox:
+            self._tirar(aluno_id)
+            del self._prox[aluno_id]
+            del self._registros[aluno_id]
+
+    def virar_dia(self, hoje: date | None = None) -> list[int]:
+        """Avança a data de referência. Retorna os ids que mudaram de situação.
+
+        Os grupos estão em ordem de vencimento, então quem cruzou um limite
+        (aviso/atraso) está sempre no começo: só esses são olhados.
+        """
+        hoje = hoje or date.today()
+        if hoje == self.hoje:
+            return []
+        if hoje < self.hoje:
+            # relógio voltou: recalcula tudo
+            self.hoje = hoje
+            self._reconstruir()
+            return list(self._prox)
+
+        self.hoje = hoje
+        movidos: list[int] = []
+        # aviso -> atrasado e ok -> aviso/atrasado: só o começo de cada lista muda
+        for origem in ("aviso", "ok"):
+            grupo = self._grupos[origem]
+            n = 0
+            while n < len(grupo) and self.classificar(grupo[n][0]) != origem:
+                n += 1
+            for ordinal, i in grupo[:n]:
+                insort(self._grupos[self.classificar(ordinal)], (ordinal, i))
+                movidos.append(i)
+            del grupo[:n]
+        return movidos
+
+    # ----- internos -----
+
+    def classificar(self, ordinal: int) -> str:
+        hoje = self.hoje.toordinal()
+        if ordinal < hoje:
+            return "atrasado"
+        if ordinal - hoje <= DIAS_AVISO:
+            return "aviso"
+        return "ok"
+
+    def _reconstruir(self) -> None:
+        self._grupos = {s: [] for s in STATUS}
+        grupos = [self._grupos[s] for s in STATUS_POR_CODIGO]
+        codigos = status_em_lote(self._prox.values(), self.hoje)
+        for (i, ordinal), c in zip(self._prox.items(), codigos):
+            grupos[c].append((ordinal, i))
+        for g in self._grupos.values():
+            g.sort()
+
+    def _colocar(self, i: int) -> None:
+        ordinal = self._prox[i]
+        insort(self._grupos[self.classificar(ordinal)], (ordinal, i))
+
+    def _tirar(self, i: int) -> None:
+        chave = (self._prox[i], i)
+        grupo = self._grupos[self.classificar(chave[0])]
+        pos = bisect_left(grupo, chave)
+        del grupo[pos]
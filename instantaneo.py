@@ -0,0 +1,227 @@
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from operator import attrgetter
+from typing import Iterable, Iterator
+
+from aluno import Aluno
+from arquivo_json import gravar_json, ler_lista_json
+from desempenho import cronometrado
+from vencimentos import DIAS_AVISO
+
+log = logging.getLogger("sunset.instantaneo")
+
+ARQUIVO_INSTANTANEO = "sunset_academia.snap"
+
+_MAGICO = b"SUNSNAP\x00"
+_VERSAO_FORMATO = 1
+_ORDEM_BYTES = {"little": 1, "big": 2}[sys.byteorder]
+# mágico, versão do formato, ordem dos bytes, nº de alunos, versão do banco, bytes de nomes
+_CABECALHO = struct.Struct("<8sHHIqQ")
+
+# colunas de largura fixa, uma depois da outra (cada uma alinhada em 8 bytes)
+_COLUNAS = (
+    ("ids", "q"),            # em ordem crescente: obter() é busca binária
+    ("prox", "i"),           # ordinal do vencimento
+    ("dia_venc", "B"),
+    ("versao", "q"),
+    ("nome_fim", "I"),       # fim do nome de cada aluno nos bytes de nomes
+    ("prox_ordenado", "i"),  # todos os vencimentos em ordem: contagem por situação
+)
+
+
+# ========= FOTO BINÁRIA DOS ALUNOS =========
+#
+# Cópia do cadastro gravada ao fechar a portaria e aberta com mmap na
+# abertura seguinte: nada é convertido ao abrir, cada consulta lê só os bytes
+# de que precisa. É um cache: o banco continua sendo a fonte, e a foto guarda
+# a versão do banco que reflete, então a tela traz depois só o que mudou desde
+# ela (alteracoes_desde). Se faltar ou não conferir, é ignorada.
+#
+# Layout: cabeçalho, colunas de tamanho fixo (ids, vencimentos, dias,
+# versões, fim de cada nome, vencimentos ordenados) e os nomes em UTF-8
+# emendados. Inteiros na ordem de bytes da máquina (memoryview.cast).
+
+
+class InstantaneoInvalido(ValueError):
+    pass
+
+
+def _alinhar(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _disposicao(n: int) -> tuple[list[tuple[int, int]], int]:
+    """(início, fim) de cada coluna e o início dos nomes, para `n` alunos."""
+    colunas = []
+    pos = _CABECALHO.size
+    for _, tipo in _COLUNAS:
+        fim = pos + n * array(tipo).itemsize
+        colunas.append((pos, fim))
+        pos = _alinhar(fim)
+    return colunas, pos
+
+
+@cronometrado("instantaneo.gravar")
+def gravar_instantaneo(caminho: str, alunos: Iterable[Aluno], versao_banco: int) -> int:
+    """Grava a foto de `alunos` (troca atômica do arquivo). Retorna quantos alunos."""
+    colunas = {nome: array(tipo) for nome, tipo in _COLUNAS}
+    ids, prox, dias = colunas["ids"], colunas["prox"], colunas["dia_venc"]
+    versoes, nome_fim = colunas["versao"], colunas["nome_fim"]
+    nomes = bytearray()
+    for a in sorted(alunos, key=attrgetter("id")):
+        ids.append(a.id)
+        prox.append(a.prox)
+        dias.append(a.dia_venc)
+        versoes.append(a.versao)
+        nomes += a.nome.encode("utf-8")
+        nome_fim.append(len(nomes))
+    colunas["prox_ordenado"].extend(sorted(prox))
+
+    n = len(ids)
+    disposicao, inicio_nomes = _disposicao(n)
+    tmp = caminho + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_CABECALHO.pack(_MAGICO, _VERSAO_FORMATO, _ORDEM_BYTES, n, versao_banco, len(nomes)))
+        for (nome, _), (inicio, _) in zip(_COLUNAS, disposicao):
+            f.write(b"\x00" * (inicio - f.tell()))
+            colunas[nome].tofile(f)
+        f.write(b"\x00" * (inicio_nomes - f.tell()))
+        f.write(nomes)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, caminho)
+    return n
+
+
+class Instantaneo:
+    """Foto binária aberta com mmap; consultas sem montar a lista de alunos."""
+
+    def __init__(self, caminho: str = ARQUIVO_INSTANTANEO):
+        with open(caminho, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # arquivo vazio
+                raise InstantaneoInvalido(f"{caminho}: vazio") from e
+        try:
+            self._abrir_colunas(caminho)
+        except Exception:
+            self.fechar()
+            raise
+
+    @classmethod
+    def abrir(cls, caminho: str = ARQUIVO_INSTANTANEO) -> "Instantaneo | None":
+        """A foto de `caminho`, ou None se não existe ou não confere."""
+        try:
+            return cls(caminho)
+        except FileNotFoundError:
+            return None
+        except (OSError, InstantaneoInvalido) as e:
+            log.warning("foto dos alunos ignorada: %s", e)
+            return None
+
+    def _abrir_colunas(self, caminho: str) -> None:
+        self._views: list[memoryview] = []
+        if len(self._mm) < _CABECALHO.size:
+            raise InstantaneoInvalido(f"{caminho}: cabeçalho incompleto")
+        magico, formato, ordem, n, versao_banco, tamanho_nomes = _CABECALHO.unpack_from(self._mm)
+        if magico != _MAGICO or formato != _VERSAO_FORMATO:
+            raise InstantaneoInvalido(f"{caminho}: formato desconhecido")
+        if ordem != _ORDEM_BYTES:
+            raise InstantaneoInvalido(f"{caminho}: gravado em outra arquitetura")
+        disposicao, inicio_nomes = _disposicao(n)
+        if len(self._mm) != inicio_nomes + tamanho_nomes:
+            raise InstantaneoInvalido(f"{caminho}: tamanho não confere")
+
+        self.versao_banco = versao_banco
+        self._n = n
+        buf = memoryview(self._mm)
+        self._views.append(buf)
+        for (nome, tipo), (inicio, fim) in zip(_COLUNAS, disposicao):
+            coluna = buf[inicio:fim].cast(tipo)
+            self._views.append(coluna)
+            setattr(self, "_" + nome, coluna)
+        self._nomes = buf[inicio_nomes:]
+        self._views.append(self._nomes)
+
+    def fechar(self) -> None:
+        for v in getattr(self, "_views", ()):
+            v.release()
+        self._views = []
+        self._mm.close()
+
+    # ----- consultas -----
+
+    def __len__(self) -> int:
+        return self._n
+
+    def obter(self, aluno_id: int) -> Aluno | None:
+        pos = bisect_left(self._ids, aluno_id)
+        if pos < self._n and self._ids[pos] == aluno_id:
+            return self.faixa(pos, pos + 1)[0]
+        return None
+
+    def posicao(self, aluno_id: int) -> int:
+        """Posição do primeiro aluno com id maior que `aluno_id`."""
+        return bisect_right(self._ids, aluno_id)
+
+    def contagem(self, hoje: date | None = None) -> dict[str, int]:
+        """Alunos por situação, como IndiceStatus.contagem(): duas buscas binárias."""
+        hoje_ord = (hoje or date.today()).toordinal()
+        atrasado = bisect_left(self._prox_ordenado, hoje_ord)
+        ate_aviso = bisect_right(self._prox_ordenado, hoje_ord + DIAS_AVISO)
+        return {"ok": self._n - ate_aviso, "aviso": ate_aviso - atrasado, "atrasado": atrasado}
+
+    def faixa(self, inicio: int, fim: int) -> list[Aluno]:
+        """Alunos [inicio:fim] em ordem de id, convertidos só agora."""
+        fim = min(fim, self._n)
+        if inicio >= fim:
+            return []
+        nomes = self._nomes
+        de = self._nome_fim[inicio - 1] if inicio else 0
+        alunos = []
+        for i, p, d, v, ate in zip(
+            self._ids[inicio:fim].tolist(),
+            self._prox[inicio:fim].tolist(),
+            self._dia_venc[inicio:fim].tolist(),
+            self._versao[inicio:fim].tolist(),
+            self._nome_fim[inicio:fim].tolist(),
+        ):
+            alunos.append(Aluno(i, str(nomes[de:ate], "utf-8"), d, p, v))
+            de = ate
+        return alunos
+
+    def lotes(self, tamanho: int, inicio: int = 0) -> Iterator[list[Aluno]]:
+        for i in range(inicio, self._n, tamanho):
+            yield self.faixa(i, i + tamanho)
+
+    def __iter__(self) -> Iterator[Aluno]:
+        for lote in self.lotes(4096):
+            yield from lote
+
+
+# ========= IMPORTAR / EXPORTAR JSON =========
+
+def exportar_json(caminho_instantaneo: str, caminho_json: str) -> int:
+    """Grava a foto como lista JSON de alunos (mesmo formato do alunos.json)."""
+    inst = Instantaneo(caminho_instantaneo)
+    try:
+        alunos = [a.para_dict() for a in inst]
+    finally:
+        inst.fechar()
+    gravar_json(caminho_json, alunos)
+    return len(alunos)
+
+
+def importar_json(caminho_json: str, caminho_instantaneo: str, versao_banco: int = 0) -> int:
+    """Monta a foto a partir de uma lista JSON de alunos (lida em fluxo)."""
+    return gravar_instantaneo(
+        caminho_instantaneo,
+        (Aluno.de_dict(d) for d in ler_lista_json(caminho_json)),
+        versao_banco,
+    )
@@ -1,15 +1,48 @@
+import logging
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import messagebox
 from datetime import date
 
-# Importa a tela principal e o carregador de usuários
-from sunset_gui import App, carregar_usuarios
+# só o serviço de autenticação: a tela principal (sunset_gui e tudo o que ela
+# importa) é carregada numa thread enquanto o login já está na tela
+from autenticacao import ServicoAutenticacao
+
+log = logging.getLogger("sunset.login")
+
+# usuários ficam em memória; o arquivo só é relido se mudar
+servico_auth = ServicoAutenticacao()
+
+# (módulo sunset_gui, Abertura) preparados em segundo plano; None = na hora
+preparo: Future | None = None
+
+
+def _preparar_tela_principal():
+    import sunset_gui
+
+    return sunset_gui, sunset_gui.preparar_abertura()
+
+
+def iniciar_preparo() -> Future:
+    """Importa a tela principal e lê a 1ª página de alunos fora da thread do Tk."""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preparo")
+    futuro = executor.submit(_preparar_tela_principal)
+    executor.shutdown(wait=False)
+    return futuro
 
 
 def abrir_app(usuario: str, perfil: str) -> None:
     """Fecha a tela de login e abre o sistema principal."""
+    sunset_gui = abertura = None
+    if preparo is not None:
+        try:
+            sunset_gui, abertura = preparo.result()
+        except Exception:
+            log.exception("falha ao preparar a tela principal; tentando na hora")
+    if sunset_gui is None:
+        import sunset_gui
     root.destroy()
-    app = App(usuario, perfil)
+    app = sunset_gui.App(usuario, perfil, abertura)
     app.mainloop()
 
 
@@ -22,14 +55,36 @@ def validar_login(event=None) -> None:
         messagebox.showwarning("Atenção", "Informe usuário e senha.")
         return
 
-    usuarios = carregar_usuarios()
-    for u in usuarios:
-        if u["usuario"] == user and u["senha"] == pwd:
-            perfil = u.get("perfil", "recepcao")
-            abrir_app(user, perfil)
+    if str(btn_login["state"]) == "disabled":
+        return  # validação anterior ainda em andamento
+
+    # o hash da senha é caro: roda em outra thread e a janela continua respondendo
+    btn_login.config(state="disabled", text="VERIFICANDO...")
+    futuro = servico_auth.autenticar_em_segundo_plano(user, pwd)
+
+    def aguardar():
+        if not futuro.done():
+            root.after(30, aguardar)
+            return
+        try:
+            registro = futuro.result()
+        except Exception:
+            log.exception("falha ao validar o login")
+            btn_login.config(state="normal", text="ENTRAR")
+            messagebox.showerror("Erro", "Não foi possível validar o login. Tente de novo.")
+            return
+        if registro is None:
+            btn_login.config(state="normal", text="ENTRAR")
+            messagebox.showerror("Erro", "Usuário ou senha inválidos.")
+            return
+        if preparo is not None and not preparo.done():
+            # senha certa antes da tela principal ficar pronta: espera sem travar
+            btn_login.config(text="ABRINDO...")
+            root.after(30, aguardar)
             return
+        abrir_app(user, registro.get("perfil", "recepcao"))
 
-    messagebox.showerror("Erro", "Usuário ou senha inválidos.")
+    aguardar()
 
 
 # ========= INTERFACE DE LOGIN =========
@@ -108,4 +163,6 @@ root.bind("<Return>", validar_login)
 entry_user.focus()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    preparo = iniciar_preparo()
     root.mainloop()
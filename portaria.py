@@ -1,26 +1,15 @@
-import json
-import os
 import datetime
 import re
 
-ARQ = "alunos.json"
+from agenda import VigiaVirada
+from repositorio import RepositorioAlunos
+from vencimentos import calcular_proximo_vencimento
 
 # =====================================================
-# FUNÇÕES DE BANCO DE DADOS
+# BANCO DE DADOS (mesmo sunset_academia.db da interface gráfica)
 # =====================================================
 
-def carregar():
-    if not os.path.exists(ARQ):
-        return []
-    with open(ARQ, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except:
-            return []
-
-def salvar(lista):
-    with open(ARQ, "w", encoding="utf-8") as f:
-        json.dump(lista, f, indent=4, ensure_ascii=False)
+repo = RepositorioAlunos()
 
 # =====================================================
 # PROCESSAMENTO INTELIGENTE DO DIA DE VENCIMENTO
@@ -28,7 +17,8 @@ def salvar(lista):
 
 def limpar_dia(dia):
     """
-    Recebe qualquer entrada e tenta extrair um número entre 1 e 28.
+    Recebe qualquer entrada e tenta extrair um número entre 1 e 31.
+    (29-31 vencem no último dia dos meses mais curtos.)
     """
     dia = dia.strip().lower()
 
@@ -36,7 +26,7 @@ def limpar_dia(dia):
     numeros = re.findall(r"\d+", dia)
     if numeros:
         dia_num = int(numeros[-1])  # último número encontrado
-        if 1 <= dia_num <= 28:
+        if 1 <= dia_num <= 31:
             return dia_num
 
     # SE NADA SERVIR, RETORNAR ERRO
@@ -47,16 +37,8 @@ def limpar_dia(dia):
 # =====================================================
 
 def calc_prox_venc(dia):
-    hoje = datetime.date.today()
-    ano, mes = hoje.year, hoje.month
-
-    if hoje.day > dia:
-        mes += 1
-        if mes > 12:
-            mes = 1
-            ano += 1
-
-    return datetime.date(ano, mes, dia)
+    # mesma regra (e mesma tabela de calendário) da interface gráfica
+    return calcular_proximo_vencimento(dia)
 
 def status_pagamento(data_venc):
     hoje = datetime.date.today()
@@ -82,7 +64,7 @@ def cadastrar():
 
     # PROCESSAR DIA DE VENCIMENTO
     while True:
-        dia_raw = input("Dia do vencimento mensal (1–28): ").strip()
+        dia_raw = input("Dia do vencimento mensal (1–31): ").strip()
         dia = limpar_dia(dia_raw)
 
         if dia:
@@ -93,14 +75,13 @@ def cadastrar():
     venc = calc_prox_venc(dia)
 
     aluno = {
+        "id": repo.novo_id(),
         "nome": nome,
         "dia_venc": dia,
-        "proximo_venc": venc.isoformat()
+        "prox": venc.isoformat()
     }
 
-    dados = carregar()
-    dados.append(aluno)
-    salvar(dados)
+    repo.salvar(aluno)
 
     print(f"\nAluno {nome} cadastrado com sucesso.")
     print(f"Próximo vencimento: {venc}\n")
@@ -108,7 +89,7 @@ def cadastrar():
 def listar():
     print("\n=== LISTA DE ALUNOS ===")
 
-    dados = carregar()
+    dados = repo.listar()
     if not dados:
         print("Nenhum aluno cadastrado.\n")
         return
@@ -116,40 +97,46 @@ def listar():
     for a in dados:
         print(f"Aluno: {a['nome']}")
         print(f"Dia do vencimento: {a['dia_venc']}")
-        print(f"Próximo vencimento: {a['proximo_venc']}")
+        print(f"Próximo vencimento: {a['prox']}")
         print("-" * 50)
 
 def alertas():
     print("\n=== ALERTAS DE PAGAMENTO – ACADEMIA SUNSET ===")
     
-    dados = carregar()
+    hoje = datetime.date.today()
+
+    # só os atrasados (consulta pelo índice de prox) e os que vencem em breve
+    dados = repo.alertas(hoje)
     if not dados:
-        print("Nenhum aluno cadastrado.\n")
+        print(f"Nenhum alerta. Total de alunos: {repo.contar()}\n")
         return
 
-    hoje = datetime.date.today()
     print(f"Hoje: {hoje}\n")
 
-    mudou = False
-
     for a in dados:
-        venc = datetime.date.fromisoformat(a["proximo_venc"])
+        venc = datetime.date.fromisoformat(a["prox"])
         stat = status_pagamento(venc)
 
         print(f"Aluno: {a['nome']}")
         print(f"Status: {stat}")
 
-        # ATUALIZAÇÃO AUTOMÁTICA DO PRÓXIMO VENCIMENTO
+        # só informa: o vencimento gravado muda quando o pagamento é registrado
+        # (a GUI, o índice de situação e a catraca leem o mesmo prox)
         if hoje > venc:
-            novo = calc_prox_venc(a["dia_venc"])
-            a["proximo_venc"] = novo.isoformat()
-            mudou = True
-            print(f"➡ Novo vencimento reagendado para {novo}")
+            print(f"➡ Ao pagar, próximo vencimento: {calc_prox_venc(a['dia_venc'])}")
 
         print("-" * 50)
 
-    if mudou:
-        salvar(dados)
+def avisar_vencidos(hoje):
+    """Virada do dia: só avisa quantos alunos estão em atraso (nada é gravado)."""
+    # roda na thread da virada: conexão própria com o banco
+    repo_virada = RepositorioAlunos()
+    try:
+        atrasados = repo_virada.contar_atrasados(hoje)
+    finally:
+        repo_virada.fechar()
+    if atrasados:
+        print(f"\n[virada do dia] {atrasados} aluno(s) em atraso (opção 3 para ver).")
 
 def menu():
     while True:
@@ -177,4 +164,7 @@ def menu():
 
 if __name__ == "__main__":
     print("Sistema Sunset Fitness iniciado.\n")
+    vigia = VigiaVirada(avisar_vencidos)
+    vigia.iniciar()
     menu()
+    vigia.parar()
@@ -0,0 +1,435 @@
+import os
+import sqlite3
+import unicodedata
+from datetime import date, timedelta
+from typing import Iterable, Iterator
+
+from armazenamento import ArmazemAlunos
+from arquivo_json import ArquivoCorrompido
+from vencimentos import DIAS_AVISO, calcular_proximo_vencimento
+
+ARQUIVO_BANCO = "sunset_academia.db"
+ARQUIVO_JSON_LEGADO = "alunos.json"
+
+# PRAGMA user_version do banco:
+#   1 -> tabelas criadas e alunos.json legado importado
+#   2 -> registros saneados (dia_venc inteiro, prox ISO válido)
+#   3 -> versão por registro, log de alterações e sequência de ids (vários terminais)
+#   4 -> sem alunos_termos/idx_alunos_nome_norm (a busca é o IndiceBusca, em memória;
+#        nome_norm fica vazio: tirar a coluna exigiria recriar a tabela)
+VERSAO_SCHEMA = 4
+
+# entradas mantidas no log de alterações; terminal mais atrasado que isso relê tudo
+ALTERACOES_MANTIDAS = 100_000
+
+
+def normalizar_nome(nome: str) -> str:
+    """Minúsculas e sem acento: 'Patrícia Lima' -> 'patricia lima'."""
+    decomposto = unicodedata.normalize("NFKD", nome)
+    sem_acento = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acento.lower().split())
+
+
+# ========= REPOSITÓRIO DE ALUNOS (SQLITE) =========
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alunos (
+    id        INTEGER PRIMARY KEY,
+    nome      TEXT    NOT NULL,
+    nome_norm TEXT    NOT NULL,  -- sem uso desde a v4: gravado vazio
+    dia_venc  INTEGER NOT NULL,
+    prox      TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_alunos_prox ON alunos(prox);
+"""
+
+_SCHEMA_V3 = """
+ALTER TABLE alunos ADD COLUMN versao INTEGER NOT NULL DEFAULT 0;
+
+-- cada gravação/remoção ganha um número crescente, visto por todos os terminais
+CREATE TABLE IF NOT EXISTS alteracoes (
+    versao   INTEGER PRIMARY KEY AUTOINCREMENT,
+    aluno_id INTEGER NOT NULL,
+    removido INTEGER NOT NULL DEFAULT 0
+);
+
+-- ids de alunos novos, reservados numa transação (dois terminais nunca pegam o mesmo)
+CREATE TABLE IF NOT EXISTS sequencias (
+    nome  TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO sequencias (nome, valor)
+    SELECT 'alunos', COALESCE(MAX(id), 0) FROM alunos;
+"""
+
+_SCHEMA_V4 = """
+DROP TABLE IF EXISTS alunos_termos;
+DROP INDEX IF EXISTS idx_alunos_nome_norm;
+UPDATE alunos SET nome_norm = '';
+"""
+
+_COLUNAS = "id, nome, dia_venc, prox, versao"
+
+
+class ConflitoVersao(Exception):
+    """O registro foi alterado/removido por outro terminal depois de lido."""
+
+
+def _para_dict(linha: tuple) -> dict:
+    return {
+        "id": linha[0],
+        "nome": linha[1],
+        "dia_venc": linha[2],
+        "prox": linha[3],
+        "versao": linha[4],
+    }
+
+
+def sanear_aluno(a: dict, hoje: date) -> bool:
+    """Garante nome, dia_venc inteiro e prox ISO válido. Retorna True se mudou algo."""
+    original = dict(a)
+
+    if not a.get("nome"):
+        a["nome"] = f"Aluno {a['id']}"
+
+    try:
+        a["dia_venc"] = int(a.get("dia_venc", hoje.day))
+    except (TypeError, ValueError):
+        a["dia_venc"] = hoje.day
+
+    try:
+        prox = date.fromisoformat(a.get("prox") or "")
+    except (TypeError, ValueError):
+        prox = calcular_proximo_vencimento(a["dia_venc"], hoje)
+    a["prox"] = prox.isoformat()
+
+    return a != original
+
+
+class RepositorioAlunos:
+    """Acesso aos alunos no sunset_academia.db, usado pela GUI e pelo portaria.py.
+
+    A conexão só é aberta no primeiro uso. Na criação do banco, o alunos.json
+    antigo (snapshot + diário) é importado uma única vez.
+
+    Vários terminais podem usar o mesmo arquivo: toda gravação carimba o
+    registro com um número do log `alteracoes`, e cada terminal busca só o
+    que mudou desde o último número que viu (`alteracoes_desde`).
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_BANCO, arquivo_json: str = ARQUIVO_JSON_LEGADO):
+        self.caminho = caminho
+        self.arquivo_json = arquivo_json
+        self.banco_novo = False
+        self._con: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+
+    @property
+    def con(self) -> sqlite3.Connection:
+        if self._con is None:
+            self._abrir()
+        return self._con
+
+    def _abrir(self) -> None:
+        con = sqlite3.connect(self.caminho)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        self._con = con
+
+        (versao,) = con.execute("PRAGMA user_version").fetchone()
+        if versao < VERSAO_SCHEMA:
+            self._migrar(versao)
+        self._podar_alteracoes()
+
+    def _migrar(self, versao: int) -> None:
+        con = self.con
+        if versao < 1:
+            with con:
+                con.executescript(_SCHEMA)
+        if versao < 3:
+            # estrutura da v3 antes de tudo: as migrações abaixo gravam com versão
+            self._criar_estrutura_v3()
+        if versao < 1:
+            importados = self._importar_json()
+            self.banco_novo = importados == 0 and not os.path.exists(self.arquivo_json)
+            con.execute("PRAGMA user_version = 1")
+        if versao < 2:
+            self._migrar_v2()
+            con.execute("PRAGMA user_version = 2")
+        if versao < 3:
+            con.execute("PRAGMA user_version = 3")
+        if versao < 4:
+            with con:
+                con.executescript(_SCHEMA_V4)
+            con.execute("PRAGMA user_version = 4")
+
+    def _migrar_v2(self) -> None:
+        """Saneia registros antigos, regravando só os que realmente mudaram."""
+        hoje = date.today()
+        alterados = []
+        for lote in self.listar_em_lotes():
+            alterados += [a for a in lote if sanear_aluno(a, hoje)]
+        if alterados:
+            self.salvar_varios(alterados)
+
+    def _criar_estrutura_v3(self) -> None:
+        con = self.con
+        # outro terminal pode estar migrando ao mesmo tempo: confere de novo com o banco travado
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            colunas = {linha[1] for linha in con.execute("PRAGMA table_info(alunos)")}
+            if "versao" not in colunas:
+                for comando in _SCHEMA_V3.split(";"):
+                    if comando.strip():
+                        con.execute(comando)
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    def _podar_alteracoes(self) -> None:
+        with self.con:
+            self.con.execute(
+                "DELETE FROM alteracoes WHERE versao <= (SELECT MAX(versao) FROM alteracoes) - ?",
+                (ALTERACOES_MANTIDAS,),
+            )
+
+    def _importar_json(self) -> int:
+        """Importa o alunos.json legado (lido em fluxo, um aluno por vez)."""
+        armazem = ArmazemAlunos(self.arquivo_json)
+        if not armazem.existe():
+            return 0
+        try:
+            with self.con:
+                return self._importar_registros(armazem.percorrer())
+        except ArquivoCorrompido:
+            # snapshot danificado no meio: a transação foi desfeita e a
+            # leitura completa recupera a geração anterior
+            with self.con:
+                return self._importar_registros(armazem.carregar())
+
+    def _importar_registros(self, alunos: Iterable[dict]) -> int:
+        """Grava cada aluno do formato antigo já normalizado (prox/proximo_venc/prox_venc)."""
+        hoje = date.today()
+        n = 0
+        for a in alunos:
+            aluno = {
+                "id": a["id"],
+                "nome": a.get("nome", f"Aluno {a['id']}"),
+                "dia_venc": a.get("dia_venc", 0),
+                "prox": a.get("prox") or a.get("proximo_venc") or a.get("prox_venc") or "",
+            }
+            sanear_aluno(aluno, hoje)
+            self._gravar(aluno)
+            n += 1
+        return n
+
+    def fechar(self) -> None:
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+    # ----- leitura -----
+
+    def listar(self, limite: int = -1) -> list[dict]:
+        """Alunos em ordem de id (só os `limite` primeiros, se informado)."""
+        cur = self.con.execute(f"SELECT {_COLUNAS} FROM alunos ORDER BY id LIMIT ?", (limite,))
+        return [_para_dict(l) for l in cur]
+
+    def listar_em_lotes(self, tamanho: int = 5000, depois_do_id: int = 0) -> Iterator[list[dict]]:
+        """Alunos com id > `depois_do_id`, em ordem de id, `tamanho` por vez.
+
+        É uma consulta só: todos os lotes vêm da mesma foto do banco, mesmo
+        que outro terminal grave enquanto os lotes são lidos.
+        """
+        cur = self.con.execute(
+            f"SELECT {_COLUNAS} FROM alunos WHERE id > ? ORDER BY id", (depois_do_id,)
+        )
+        while lote := cur.fetchmany(tamanho):
+            yield [_para_dict(l) for l in lote]
+
+    def obter(self, aluno_id: int) -> dict | None:
+        linha = self.con.execute(
+            f"SELECT {_COLUNAS} FROM alunos WHERE id = ?", (aluno_id,)
+        ).fetchone()
+        return _para_dict(linha) if linha else None
+
+    def novo_id(self) -> int:
+        """Reserva um id novo (a reserva é gravada: outro terminal não recebe o mesmo)."""
+        return self.reservar_ids(1).start
+
+    def reservar_ids(self, quantidade: int) -> range:
+        """Reserva `quantidade` ids seguidos numa transação só."""
+        with self.con:
+            self.con.execute(
+                """
+                UPDATE sequencias
+                SET valor = MAX(valor, (SELECT COALESCE(MAX(id), 0) FROM alunos)) + ?
+                WHERE nome = 'alunos'
+                """,
+                (quantidade,),
+            )
+            (valor,) = self.con.execute(
+                "SELECT valor FROM sequencias WHERE nome = 'alunos'"
+            ).fetchone()
+        return range(valor - quantidade + 1, valor + 1)
+
+    # ----- outros terminais -----
+
+    def versao_atual(self) -> int:
+        (versao,) = self.con.execute("SELECT COALESCE(MAX(versao), 0) FROM alteracoes").fetchone()
+        return versao
+
+    def mudou(self) -> bool:
+        """True se alguma outra conexão gravou desde a última chamada (PRAGMA data_version)."""
+        (dv,) = self.con.execute("PRAGMA data_version").fetchone()
+        mudou = self._data_version is not None and dv != self._data_version
+        self._data_version = dv
+        return mudou
+
+    def alteracoes_desde(self, versao: int) -> tuple[int, list[dict], list[int]] | None:
+        """(versão atual, alunos alterados, ids removidos) depois de `versao`.
+
+        None quando o log já foi podado além de `versao`: é preciso reler tudo.
+        """
+        # MIN e MAX em consultas separadas: assim cada uma vai direto na ponta do índice
+        atual = self.versao_atual()
+        (menor,) = self.con.execute("SELECT MIN(versao) FROM alteracoes").fetchone()
+        if menor is not None and versao < menor - 1:
+            return None
+        ids = [
+            i for (i,) in self.con.execute(
+                "SELECT DISTINCT aluno_id FROM alteracoes WHERE versao > ? AND versao <= ?",
+                (versao, atual),
+            )
+        ]
+        alterados = []
+        for n in range(0, len(ids), 500):
+            parte = ids[n:n + 500]
+            marcas = ",".join("?" * len(parte))
+            alterados += [
+                _para_dict(l)
+                for l in self.con.execute(
+                    f"SELECT {_COLUNAS} FROM alunos WHERE id IN ({marcas})", parte
+                )
+            ]
+        existentes = {a["id"] for a in alterados}
+        return atual, alterados, [i for i in ids if i not in existentes]
+
+    def contar(self) -> int:
+        (total,) = self.con.execute("SELECT COUNT(*) FROM alunos").fetchone()
+        return total
+
+    def alertas(
+        self,
+        hoje: date | None = None,
+        inicio: int = 0,
+        quantidade: int = -1,
+    ) -> list[dict]:
+        """Alunos atrasados ou vencendo nos próximos dias, ordenados pelo vencimento.
+
+        `inicio`/`quantidade` permitem buscar só uma página (tabela virtual).
+        """
+        if hoje is None:
+            hoje = date.today()
+        limite = (hoje + timedelta(days=DIAS_AVISO)).isoformat()
+        cur = self.con.execute(
+            f"SELECT {_COLUNAS} FROM alunos WHERE prox <= ? ORDER BY prox, id LIMIT ? OFFSET ?",
+            (limite, quantidade, inicio),
+        )
+        return [_para_dict(l) for l in cur]
+
+    def contar_atrasados(self, hoje: date | None = None) -> int:
+        """Alunos com vencimento antes de `hoje` (usa o índice de prox)."""
+        if hoje is None:
+            hoje = date.today()
+        (total,) = self.con.execute(
+            "SELECT COUNT(*) FROM alunos WHERE prox < ?", (hoje.isoformat(),)
+        ).fetchone()
+        return total
+
+    # ----- gravação -----
+
+    def salvar(self, aluno: dict) -> None:
+        """Inclui ou atualiza um aluno."""
+        with self.con:
+            self._gravar(aluno)
+
+    def salvar_varios(self, alunos: list[dict]) -> None:
+        """Inclui/atualiza vários alunos numa única transação."""
+        with self.con:
+            for a in alunos:
+                self._gravar(a)
+
+    def substituir_todos(self, alunos: list[dict]) -> None:
+        """Troca o conteúdo inteiro da tabela pela lista informada."""
+        novos = {a["id"] for a in alunos}
+        with self.con:
+            for (i,) in self.con.execute("SELECT id FROM alunos").fetchall():
+                if i not in novos:
+                    self._apagar(i)
+            for a in alunos:
+                self._gravar(a)
+
+    def remover(self, aluno_id: int) -> None:
+        with self.con:
+            self._apagar(aluno_id)
+
+    def aplicar_lote(
+        self,
+        salvar: list[dict],
+        remover: list[int],
+        versoes: dict[int, int] | None = None,
+    ) -> list[int]:
+        """Inclusões/alterações e remoções numa única transação.
+
+        `versoes` (id -> versão lida) ativa a conferência: aluno alterado ou
+        removido por outro terminal desde então não é gravado. Retorna esses ids.
+        """
+        conflitos = []
+        with self.con:
+            for a in salvar:
+                if versoes is not None:
+                    try:
+                        self._conferir_versao(a["id"], versoes.get(a["id"], 0))
+                    except ConflitoVersao:
+                        conflitos.append(a["id"])
+                        continue
+                self._gravar(a)
+            for i in remover:
+                self._apagar(i)
+        return conflitos
+
+    def _conferir_versao(self, aluno_id: int, esperada: int) -> None:
+        linha = self.con.execute("SELECT versao FROM alunos WHERE id = ?", (aluno_id,)).fetchone()
+        if linha is None:
+            if esperada:
+                raise ConflitoVersao(aluno_id)  # removido por outro terminal
+        elif linha[0] != esperada:
+            raise ConflitoVersao(aluno_id)
+
+    def _registrar_alteracao(self, aluno_id: int, removido: bool) -> int:
+        cur = self.con.execute(
+            "INSERT INTO alteracoes (aluno_id, removido) VALUES (?, ?)", (aluno_id, int(removido))
+        )
+        return cur.lastrowid
+
+    def _apagar(self, aluno_id: int) -> None:
+        cur = self.con.execute("DELETE FROM alunos WHERE id = ?", (aluno_id,))
+        if cur.rowcount:
+            self._registrar_alteracao(aluno_id, True)
+
+    def _gravar(self, a: dict) -> None:
+        a["versao"] = self._registrar_alteracao(a["id"], False)
+        self.con.execute(
+            """
+            INSERT INTO alunos (id, nome, nome_norm, dia_venc, prox, versao)
+            VALUES (?, ?, '', ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                nome = excluded.nome,
+                dia_venc = excluded.dia_venc,
+                prox = excluded.prox,
+                versao = excluded.versao
+            """,
+            (a["id"], a["nome"], a["dia_venc"], a["prox"], a["versao"]),
+        )
@@ -0,0 +1,659 @@
+"""Servidor local de sincronização (rodar com: python servidor.py [--porta 8765]).
+
+Mantém o cadastro e o índice de situação em memória e atende vários
+terminais/leitoras com HTTP + JSON. Por padrão só nesta máquina; para a
+rede local: SUNSET_TOKEN=<segredo> python servidor.py --rede
+(os terminais mandam o mesmo segredo em cada pedido). Na tela, com
+SUNSET_SERVIDOR=host:porta a leitora da portaria consulta este servidor.
+"""
+import argparse
+import hmac
+import http.client
+import ipaddress
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import parse_qs, quote, urlsplit
+
+from acessos import RegistroAcessos
+from aluno import Aluno
+from busca import IndiceBusca
+from catraca import Decisao, codigo_para_id, decidir
+from colecao import ColecaoAlunos
+from desempenho import medir
+from gravacao import GravadorSegundoPlano
+from indice_status import IndiceStatus
+from repositorio import ARQUIVO_BANCO, ConflitoVersao, RepositorioAlunos
+from vencimentos import calcular_proximo_vencimento
+
+log = logging.getLogger("sunset.servidor")
+
+PORTA_PADRAO = 8765
+
+# segredo compartilhado exigido quando o servidor atende fora desta máquina
+VARIAVEL_TOKEN = "SUNSET_TOKEN"
+
+# "host:porta" do servidor; definido, a catraca da tela consulta o servidor
+VARIAVEL_SERVIDOR = "SUNSET_SERVIDOR"
+
+# eventos guardados para clientes que reconectam; mais atrasado que isso relê tudo
+EVENTOS_MANTIDOS = 10_000
+
+# de quanto em quanto tempo o servidor olha o banco (gravações do portaria.py etc.)
+INTERVALO_BANCO = 1.0
+
+# sem eventos, o fluxo manda uma linha vazia nesse intervalo (detecta cliente que caiu)
+INTERVALO_BATIMENTO = 15.0
+
+
+# ========= CADASTRO EM MEMÓRIA =========
+#
+# Toda alteração ganha um número de evento (`rev`), guardado por aluno e
+# devolvido junto com o registro. O cliente manda o `rev` que leu ao alterar;
+# se outro cliente alterou antes, a resposta é 409. O banco é gravado em segundo plano
+# (GravadorSegundoPlano) e continua valendo para quem usa o arquivo direto.
+# Se outro programa alterou o aluno no banco antes da gravação, o banco fica
+# com a versão dele: a memória volta para ela e os clientes recebem o evento.
+
+
+def _validar(dados: dict) -> None:
+    """Confere nome, dia_venc e prox vindos de um cliente (ValueError -> 400)."""
+    nome = dados.get("nome")
+    if not isinstance(nome, str) or not nome.strip():
+        raise ValueError("nome deve ser um texto não vazio")
+    dia = dados.get("dia_venc")
+    if isinstance(dia, bool) or not isinstance(dia, int) or not 1 <= dia <= 31:
+        raise ValueError("dia_venc deve ser um inteiro de 1 a 31")
+    prox = dados.get("prox")
+    if prox is not None:
+        if not isinstance(prox, str):
+            raise ValueError("prox deve ser uma data AAAA-MM-DD")
+        date.fromisoformat(prox)
+
+
+class CacheAlunos:
+    def __init__(self, caminho_banco: str = ARQUIVO_BANCO, acessos: RegistroAcessos | None = None):
+        self.caminho_banco = caminho_banco
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._eventos: list[tuple[int, dict]] = []
+        self._rev = 0
+        # rev da última alteração de cada aluno (0 = como veio do banco)
+        self._revs: dict[int, int] = {}
+
+        repo = self._repo()
+        self._versao_banco = repo.versao_atual()
+        repo.mudou()
+        self.alunos = ColecaoAlunos(
+            map(Aluno.de_dict, repo.listar()), reservar_id=lambda: self._repo().novo_id()
+        )
+        self.indice_status = IndiceStatus(self.alunos)
+        self.indice_busca = IndiceBusca(self.alunos)
+        self.alunos.observar(self.indice_status)
+        self.alunos.observar(self.indice_busca)
+
+        self.acessos = acessos or RegistroAcessos()
+        self.gravador = GravadorSegundoPlano(caminho_banco)
+        self._parar = threading.Event()
+        self._vigia = threading.Thread(target=self._vigiar_banco, name="servidor-banco", daemon=True)
+        self._vigia.start()
+
+    def _repo(self) -> RepositorioAlunos:
+        # conexões SQLite não podem ser usadas em outra thread: uma por thread
+        repo = getattr(self._local, "repo", None)
+        if repo is None:
+            repo = self._local.repo = RepositorioAlunos(self.caminho_banco)
+        return repo
+
+    # ----- consultas -----
+
+    def _para_dict(self, aluno: Aluno) -> dict:
+        # chamado com self._cond travado
+        d = aluno.para_dict()
+        d["rev"] = self._revs.get(aluno.id, 0)
+        return d
+
+    def listar(self) -> tuple[int, list[dict]]:
+        with self._cond:
+            return self._rev, [self._para_dict(a) for a in self.alunos]
+
+    def obter(self, aluno_id: int) -> dict | None:
+        with self._cond:
+            a = self.alunos.obter(aluno_id)
+            return self._para_dict(a) if a else None
+
+    def situacao(self) -> dict:
+        with self._cond:
+            self.indice_status.virar_dia(date.today())
+            return {"rev": self._rev, "total": len(self.alunos), **self.indice_status.contagem()}
+
+    def buscar(self, q: str, limite: int) -> list[dict]:
+        with self._cond:
+            return [self._para_dict(a) for a in self.indice_busca.buscar(q, limite)]
+
+    def checkin(self, codigo: int | str, usuario: str = "") -> dict:
+        with self._cond:
+            self.indice_status.virar_dia(date.today())
+            aluno_id, nome, liberado, motivo = decidir(
+                self.alunos, self.indice_status, codigo_para_id(codigo), codigo
+            )
+        self.acessos.registrar(aluno_id, nome, liberado, motivo, usuario)
+        return {"aluno_id": aluno_id, "nome": nome, "liberado": liberado, "motivo": motivo}
+
+    # ----- alterações -----
+
+    def incluir(self, nome: str, dia_venc: int, prox: str | None = None) -> dict:
+        _validar({"nome": nome, "dia_venc": dia_venc, "prox": prox})
+        vencimento = date.fromisoformat(prox) if prox else calcular_proximo_vencimento(dia_venc)
+        aluno = Aluno(self.alunos.novo_id(), nome, dia_venc, vencimento.toordinal())
+        with self._cond:
+            self.alunos.adicionar(aluno)
+            self._publicar(aluno)
+            self.gravador.salvar_aluno(aluno)
+            return self._para_dict(aluno)
+
+    def salvar(self, dados: dict) -> dict:
+        """Altera nome/dia_venc/prox. Levanta ConflitoVersao se `rev` estiver velho."""
+        with self._cond:
+            aluno = self.alunos.obter(dados["id"])
+            rev = self._revs.get(dados["id"], 0)
+            if aluno is None or dados.get("rev", rev) != rev:
+                raise ConflitoVersao(dados["id"])
+            novos = {**aluno.para_dict(), **dados}
+            _validar(novos)
+            alterado = Aluno.de_dict(novos)
+            alterado.versao = aluno.versao
+            aluno.copiar_de(alterado)
+            self.alunos.atualizar(aluno)
+            self._publicar(aluno)
+            self.gravador.salvar_aluno(aluno)
+            return self._para_dict(aluno)
+
+    def remover(self, aluno_id: int) -> bool:
+        with self._cond:
+            if self.alunos.remover(aluno_id) is None:
+                return False
+            self._publicar(None, aluno_id)
+            self.gravador.remover_aluno(aluno_id)
+            return True
+
+    # ----- eventos -----
+
+    def _publicar(self, aluno: Aluno | None, removido: int | None = None) -> None:
+        # chamado com self._cond travado
+        self._rev += 1
+        if aluno is not None:
+            self._revs[aluno.id] = self._rev
+            evento = {"rev": self._rev, "tipo": "aluno", "aluno": self._para_dict(aluno)}
+        else:
+            self._revs.pop(removido, None)
+            evento = {"rev": self._rev, "tipo": "removido", "id": removido}
+        self._eventos.append((self._rev, evento))
+        if len(self._eventos) > EVENTOS_MANTIDOS * 2:
+            del self._eventos[:-EVENTOS_MANTIDOS]
+        self._cond.notify_all()
+
+    def eventos_desde(self, rev: int, timeout: float) -> list[dict] | None:
+        """Eventos depois de `rev` (espera até `timeout` se não houver). None = relê tudo."""
+        with self._cond:
+            if rev > self._rev:
+                return None  # cliente de antes de o servidor reiniciar
+            self._cond.wait_for(lambda: self._rev > rev or self._parar.is_set(), timeout)
+            if self._eventos and rev < self._eventos[0][0] - 1:
+                return None
+            # rev dos eventos é contínuo: a posição sai direto do primeiro guardado
+            inicio = max(0, rev - self._eventos[0][0] + 1) if self._eventos else 0
+            return [e for _, e in self._eventos[inicio:]]
+
+    # ----- banco (outros programas gravando no mesmo arquivo) -----
+
+    def _vigiar_banco(self) -> None:
+        repo = self._repo()
+        # a primeira chamada de mudou() numa conexão nova só marca o ponto de
+        # partida: o que foi gravado desde a leitura inicial é trazido agora
+        repo.mudou()
+        self._trazer_do_banco(repo)
+        while not self._parar.wait(INTERVALO_BANCO):
+            if repo.mudou():
+                self._trazer_do_banco(repo)
+            self._conferir_gravacoes(repo)
+        repo.fechar()
+
+    def _conferir_gravacoes(self, repo: RepositorioAlunos) -> None:
+        """Falhas do gravador vão para o log; conflitos voltam ao que está no banco."""
+        for r in self.gravador.coletar():
+            if not r.ok:
+                log.error("falha ao gravar %s: %s (nova tentativa em seguida)", r.descricao, r.erro)
+            if r.conflitos:
+                log.warning(
+                    "alterados por outro programa antes da gravação (fica a do banco): %s",
+                    ", ".join(map(str, r.conflitos)),
+                )
+                self._corrigir(repo, r.conflitos)
+
+    def _corrigir(self, repo: RepositorioAlunos, ids: tuple[int, ...]) -> None:
+        # a gravação foi recusada e o vigia já tinha pulado esses alunos (estavam
+        # pendentes): relê do banco e publica, senão os clientes ficam com o descartado
+        alterados, removidos = [], []
+        for i in ids:
+            d = repo.obter(i)
+            if d is None:
+                removidos.append(i)
+            else:
+                alterados.append(d)
+        self._mesclar(alterados, removidos)
+
+    def _trazer_do_banco(self, repo: RepositorioAlunos) -> None:
+        alteracoes = repo.alteracoes_desde(self._versao_banco)
+        if alteracoes is None:
+            self._versao_banco = repo.versao_atual()
+            alterados = repo.listar()
+            vistos = {a["id"] for a in alterados}
+            with self._cond:
+                removidos = [a.id for a in self.alunos if a.id not in vistos]
+        else:
+            self._versao_banco, alterados, removidos = alteracoes
+        self._mesclar(alterados, removidos)
+
+    def _mesclar(self, alterados: list[dict], removidos: list[int]) -> None:
+        with self._cond:
+            for d in alterados:
+                if self.gravador.pendente(d["id"]):
+                    continue
+                novo = Aluno.de_dict(d)
+                atual = self.alunos.obter(novo.id)
+                if atual is None:
+                    self.alunos.adicionar(novo)
+                    self._publicar(novo)
+                elif atual.mesmos_dados(novo):
+                    atual.versao = novo.versao
+                else:
+                    atual.copiar_de(novo)
+                    self.alunos.atualizar(atual)
+                    self._publicar(atual)
+            for i in removidos:
+                if i in self.alunos and not self.gravador.pendente(i):
+                    self.alunos.remover(i)
+                    self._publicar(None, i)
+
+    def fechar(self) -> None:
+        self._parar.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._vigia.join()
+        self.gravador.fechar()
+        repo = self._repo()
+        self._conferir_gravacoes(repo)
+        repo.fechar()
+        self.acessos.fechar()
+
+
+# ========= HTTP =========
+#
+# Fora do loopback todo pedido precisa do cabeçalho
+# "Authorization: Bearer <token>" (senão 401): as rotas leem e alteram
+# pagamentos e dados de alunos.
+#
+#   GET    /alunos                 -> {"rev": n, "alunos": [...]}
+#   GET    /alunos/<id>            -> aluno
+#   GET    /busca?q=...&limite=50  -> [alunos]
+#   GET    /situacao               -> {"rev", "total", "ok", "aviso", "atrasado"}
+#   GET    /eventos?desde=<rev>    -> fluxo contínuo, um evento JSON por linha
+#   POST   /alunos                 -> inclui {"nome", "dia_venc"[, "prox"]}
+#   PUT    /alunos/<id>            -> altera (mande o "rev" lido; 409 se outro alterou)
+#   DELETE /alunos/<id>
+#   POST   /checkin                -> {"codigo"[, "usuario"]} -> decisão
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # cabeçalho e corpo saem em dois write(); sem isso cada resposta espera ~40 ms
+    disable_nagle_algorithm = True
+    server: "ServidorSincronizacao"
+
+    def log_message(self, formato, *args) -> None:
+        log.debug("%s " + formato, self.client_address[0], *args)
+
+    def _responder(self, status: int, dados) -> None:
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _corpo(self) -> dict:
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(tamanho) or b"{}")
+
+    def _rota(self) -> tuple[list[str], dict[str, str]]:
+        url = urlsplit(self.path)
+        partes = [p for p in url.path.split("/") if p]
+        return partes, {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+    def _autorizado(self) -> bool:
+        token = self.server.token
+        if token is None:
+            return True
+        recebido = self.headers.get("Authorization", "")
+        return hmac.compare_digest(recebido.encode("utf-8"), f"Bearer {token}".encode("utf-8"))
+
+    def _tratar(self, metodo: str) -> None:
+        if not self._autorizado():
+            self.close_connection = True  # o corpo do pedido não foi lido
+            self._responder(401, {"erro": "token ausente ou inválido"})
+            return
+        partes, params = self._rota()
+        if metodo == "GET" and partes == ["eventos"]:
+            # conexão longa: fica fora das medidas
+            try:
+                desde = int(params.get("desde", 0))
+            except ValueError as e:
+                self._responder(400, {"erro": f"pedido inválido: {e}"})
+                return
+            self._fluxo_de_eventos(desde)
+            return
+        with medir(f"servidor.{metodo} /{partes[0] if partes else ''}"):
+            self._atender(metodo, partes, params)
+
+    def _atender(self, metodo: str, partes: list[str], params: dict[str, str]) -> None:
+        cache = self.server.cache
+        try:
+            if metodo == "GET" and partes == ["alunos"]:
+                rev, alunos = cache.listar()
+                self._responder(200, {"rev": rev, "alunos": alunos})
+            elif metodo == "GET" and len(partes) == 2 and partes[0] == "alunos":
+                aluno = cache.obter(int(partes[1]))
+                self._responder(200 if aluno else 404, aluno or {"erro": "não encontrado"})
+            elif metodo == "GET" and partes == ["busca"]:
+                self._responder(200, cache.buscar(params.get("q", ""), int(params.get("limite", 50))))
+            elif metodo == "GET" and partes == ["situacao"]:
+                self._responder(200, cache.situacao())
+            elif metodo == "POST" and partes == ["alunos"]:
+                d = self._corpo()
+                self._responder(201, cache.incluir(d["nome"], d["dia_venc"], d.get("prox")))
+            elif metodo == "PUT" and len(partes) == 2 and partes[0] == "alunos":
+                d = self._corpo()
+                d["id"] = int(partes[1])
+                self._responder(200, cache.salvar(d))
+            elif metodo == "DELETE" and len(partes) == 2 and partes[0] == "alunos":
+                ok = cache.remover(int(partes[1]))
+                self._responder(200 if ok else 404, {"removido": ok})
+            elif metodo == "POST" and partes == ["checkin"]:
+                d = self._corpo()
+                self._responder(200, cache.checkin(d["codigo"], d.get("usuario", "")))
+            else:
+                self._responder(404, {"erro": "rota desconhecida"})
+        except ConflitoVersao as e:
+            self._responder(409, {"erro": "alterado por outro terminal", "id": e.args[0]})
+        except (KeyError, ValueError) as e:
+            self._responder(400, {"erro": f"pedido inválido: {e}"})
+
+    def _fluxo_de_eventos(self, desde: int) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        cache = self.server.cache
+        try:
+            while not cache._parar.is_set():
+                eventos = cache.eventos_desde(desde, INTERVALO_BATIMENTO)
+                if eventos is None:
+                    eventos = [{"rev": cache.listar()[0], "tipo": "recarregar"}]
+                linhas = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in eventos)
+                self.wfile.write(linhas.encode("utf-8") or b"\n")
+                self.wfile.flush()
+                if eventos:
+                    desde = eventos[-1]["rev"]
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self) -> None:
+        self._tratar("GET")
+
+    def do_POST(self) -> None:
+        self._tratar("POST")
+
+    def do_PUT(self) -> None:
+        self._tratar("PUT")
+
+    def do_DELETE(self) -> None:
+        self._tratar("DELETE")
+
+
+def _so_nesta_maquina(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ServidorSincronizacao(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, endereco: tuple[str, int], cache: CacheAlunos, token: str | None = None):
+        if not token and not _so_nesta_maquina(endereco[0]):
+            raise ValueError(f"atender em {endereco[0]} (rede) exige um token")
+        super().__init__(endereco, _Manipulador)
+        self.cache = cache
+        self.token = token or None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def porta(self) -> int:
+        return self.server_address[1]
+
+    def iniciar(self) -> None:
+        """Atende em segundo plano (para testes/benchmarks no mesmo processo)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="servidor-http", daemon=True)
+        self._thread.start()
+
+    def fechar(self) -> None:
+        self.cache.fechar()
+        self.shutdown()
+        self.server_close()
+
+
+# ========= CLIENTE =========
+
+class ClienteSincronizacao:
+    """Cliente do servidor. Mantém a conexão aberta; use um cliente por thread."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        porta: int = PORTA_PADRAO,
+        timeout: float = 5.0,
+        token: str | None = None,
+    ):
+        self.host = host
+        self.porta = porta
+        self.timeout = timeout
+        self.token = token
+        self._con: http.client.HTTPConnection | None = None
+
+    def _cabecalhos(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def _pedir(self, metodo: str, caminho: str, dados: dict | None = None):
+        corpo = json.dumps(dados).encode("utf-8") if dados is not None else None
+        cabecalhos = self._cabecalhos()
+        if corpo is not None:
+            cabecalhos["Content-Type"] = "application/json"
+        for tentativa in (1, 2):
+            if self._con is None:
+                self._con = http.client.HTTPConnection(self.host, self.porta, timeout=self.timeout)
+            try:
+                self._con.request(metodo, caminho, corpo, cabecalhos)
+                resposta = self._con.getresponse()
+                dados_resposta = json.loads(resposta.read())
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # conexão fechada pelo servidor: reabre uma vez
+                self.fechar()
+                if tentativa == 2:
+                    raise
+        if resposta.status == 401:
+            raise PermissionError(dados_resposta.get("erro", "não autorizado"))
+        if resposta.status == 409:
+            raise ConflitoVersao(dados_resposta.get("id"))
+        if resposta.status >= 400 and resposta.status != 404:
+            raise ValueError(dados_resposta.get("erro", resposta.status))
+        return resposta.status, dados_resposta
+
+    def listar(self) -> tuple[int, list[dict]]:
+        _, d = self._pedir("GET", "/alunos")
+        return d["rev"], d["alunos"]
+
+    def obter(self, aluno_id: int) -> dict | None:
+        status, d = self._pedir("GET", f"/alunos/{aluno_id}")
+        return d if status == 200 else None
+
+    def buscar(self, q: str, limite: int = 50) -> list[dict]:
+        return self._pedir("GET", f"/busca?q={quote(q)}&limite={limite}")[1]
+
+    def situacao(self) -> dict:
+        return self._pedir("GET", "/situacao")[1]
+
+    def incluir(self, nome: str, dia_venc: int, prox: str | None = None) -> dict:
+        dados = {"nome": nome, "dia_venc": dia_venc}
+        if prox:
+            dados["prox"] = prox
+        return self._pedir("POST", "/alunos", dados)[1]
+
+    def salvar(self, aluno: dict) -> dict:
+        return self._pedir("PUT", f"/alunos/{aluno['id']}", aluno)[1]
+
+    def remover(self, aluno_id: int) -> bool:
+        return self._pedir("DELETE", f"/alunos/{aluno_id}")[1]["removido"]
+
+    def checkin(self, codigo: int | str, usuario: str = "") -> dict:
+        return self._pedir("POST", "/checkin", {"codigo": codigo, "usuario": usuario})[1]
+
+    def eventos(self, desde: int = 0) -> Iterator[dict]:
+        """Eventos à medida que acontecem (conexão própria, fica aberta)."""
+        con = http.client.HTTPConnection(self.host, self.porta, timeout=INTERVALO_BATIMENTO * 2)
+        try:
+            con.request("GET", f"/eventos?desde={desde}", headers=self._cabecalhos())
+            resposta = con.getresponse()
+            if resposta.status == 401:
+                raise PermissionError("token ausente ou inválido")
+            for linha in resposta:
+                if linha.strip():
+                    yield json.loads(linha)
+        finally:
+            con.close()
+
+    def fechar(self) -> None:
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+
+def cliente_do_ambiente() -> ClienteSincronizacao | None:
+    """Cliente para o servidor em SUNSET_SERVIDOR ("host:porta"), ou None se não definido."""
+    endereco = os.environ.get(VARIAVEL_SERVIDOR)
+    if not endereco:
+        return None
+    host, _, porta = endereco.rpartition(":")
+    token = os.environ.get(VARIAVEL_TOKEN) or None
+    return ClienteSincronizacao(host or "127.0.0.1", int(porta or PORTA_PADRAO), token=token)
+
+
+# ========= CATRACA REMOTA =========
+#
+# Terminal de portaria ligado ao servidor: as leituras vão para o /checkin
+# numa thread própria e as decisões voltam numa fila, com a mesma interface
+# do MotorCheckin (entrada/coletar/parar). O acesso fica no histórico do
+# servidor, que é quem decide.
+
+
+class MotorCheckinRemoto:
+    def __init__(self, cliente: ClienteSincronizacao, usuario: str = ""):
+        self.cliente = cliente
+        self.usuario = usuario
+        self._entrada: queue.SimpleQueue = queue.SimpleQueue()
+        self._saida: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+
+    def entrada(self, codigo: int | str) -> None:
+        """Enfileira uma leitura (pode ser chamado de qualquer thread)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._laco, name="catraca-remota", daemon=True)
+            self._thread.start()
+        self._entrada.put((codigo, time.perf_counter()))
+
+    def coletar(self) -> list[Decisao]:
+        """Decisões prontas desde a última chamada (não bloqueia)."""
+        prontas = []
+        try:
+            while True:
+                prontas.append(self._saida.get_nowait())
+        except queue.Empty:
+            return prontas
+
+    def parar(self) -> None:
+        """Envia o que ainda está na fila e encerra a thread."""
+        if self._thread is not None:
+            self._entrada.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _laco(self) -> None:
+        try:
+            while True:
+                item = self._entrada.get()
+                if item is None:
+                    return
+                codigo, enfileirado = item
+                try:
+                    d = self.cliente.checkin(codigo, self.usuario)
+                    decisao = (d["aluno_id"], d["nome"], d["liberado"], d["motivo"])
+                except (OSError, ValueError, KeyError, http.client.HTTPException):
+                    # servidor fora do ar / token errado: a leitura não se perde em silêncio
+                    log.exception("falha ao consultar o servidor (leitura %r)", codigo)
+                    decisao = (None, str(codigo), False, "erro, passe de novo")
+                latencia_ms = (time.perf_counter() - enfileirado) * 1000
+                self._saida.put(Decisao(codigo, *decisao, latencia_ms))
+        finally:
+            self.cliente.fechar()
+
+
+def principal() -> None:
+    parser = argparse.ArgumentParser(description="Servidor local de sincronização da portaria")
+    parser.add_argument("--host", help="endereço (padrão: 127.0.0.1, ou 0.0.0.0 com --rede)")
+    parser.add_argument("--rede", action="store_true", help="atender outros computadores da rede local")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--banco", default=ARQUIVO_BANCO)
+    args = parser.parse_args()
+
+    host = args.host or ("0.0.0.0" if args.rede else "127.0.0.1")
+    token = os.environ.get(VARIAVEL_TOKEN) or None
+    if not _so_nesta_maquina(host):
+        if not args.rede:
+            parser.error(f"{host} atende a rede: confirme com --rede")
+        if not token:
+            parser.error(f"na rede é obrigatório um token: defina {VARIAVEL_TOKEN}=<segredo>")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    servidor = ServidorSincronizacao((host, args.porta), CacheAlunos(args.banco), token)
+    log.info("atendendo em %s:%d (%d alunos)", host, servidor.porta, len(servidor.cache.alunos))
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.fechar()
+
+
+if __name__ == "__main__":
+    principal()
@@ -0,0 +1,162 @@
+import argparse
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Iterator
+
+from acessos import Acesso, RegistroAcessos
+from vencimentos import DIAS_AVISO, calcular_proximo_vencimento, ultimo_dia_do_mes
+
+SEMENTE_PADRAO = 2024
+
+# ========= CADASTRO SINTÉTICO =========
+#
+# Alunos e histórico de entradas parecidos com os de uma academia de
+# verdade, para benchmarks e testes de carga: nomes brasileiros com acento
+# (e sobrenomes repetidos, como na vida real), vencimento concentrado nos
+# dias 5/10/15/20 mas com os dias 29-31 presentes, uma parte em atraso ou
+# vencendo nos próximos dias, e entradas concentradas de manhã cedo e à noite.
+# Com a mesma semente, sai sempre o mesmo cadastro.
+
+_PRIMEIROS = (
+    ("Maria", 30), ("José", 25), ("Ana", 22), ("João", 20), ("Antônio", 12),
+    ("Francisco", 10), ("Luíza", 8), ("Márcia", 7), ("Letícia", 7), ("Lúcia", 6),
+    ("Conceição", 5), ("Sebastião", 5), ("Vitória", 6), ("Júlia", 9), ("Beatriz", 8),
+    ("Mônica", 5), ("Fábio", 6), ("Flávio", 4), ("Sérgio", 5), ("Otávio", 3),
+    ("Cláudia", 6), ("Patrícia", 7), ("Débora", 4), ("Inês", 2), ("Ângela", 4),
+    ("Nathália", 3), ("Caio", 5), ("Thiago", 8), ("Lucas", 10), ("Gabriel", 9),
+    ("Rafael", 8), ("Matheus", 8), ("Gonçalo", 1), ("Zoë", 1), ("Estêvão", 2),
+)
+_SOBRENOMES = (
+    ("Silva", 40), ("Santos", 30), ("Oliveira", 25), ("Souza", 20), ("Lima", 15),
+    ("Pereira", 15), ("Ferreira", 12), ("Araújo", 10), ("Conceição", 6), ("Gonçalves", 8),
+    ("Magalhães", 4), ("Simões", 4), ("Brandão", 3), ("Assunção", 3), ("Patrício", 2),
+    ("Gusmão", 2), ("Falcão", 3), ("Romão", 2), ("Estêvez", 1), ("Ribeiro", 10),
+    ("Carvalho", 10), ("Gomes", 9), ("Martins", 9), ("Rocha", 7), ("Almeida", 8),
+)
+_PARTICULAS = ("", "", "", "", "da ", "de ", "dos ")
+
+# peso de cada dia de vencimento (os outros dias pesam 3)
+_DIAS_PREFERIDOS = {1: 8, 5: 25, 10: 25, 15: 18, 20: 15, 25: 6, 29: 4, 30: 5, 31: 4}
+_PESO_DIAS = [_DIAS_PREFERIDOS.get(d, 3) for d in range(1, 32)]
+
+# entradas por hora do dia (academia das 6h às 22h)
+_PESO_HORAS = [0] * 6 + [9, 12, 8, 5, 3, 3, 4, 3, 2, 2, 3, 6, 11, 12, 9, 5] + [0] * 2
+
+
+def _vencimento_meses_atras(dia_venc: int, hoje: date, meses: int) -> date:
+    proximo = calcular_proximo_vencimento(dia_venc, hoje)
+    mes = proximo.month - meses
+    ano = proximo.year + (mes - 1) // 12
+    mes = (mes - 1) % 12 + 1
+    return date(ano, mes, min(dia_venc, ultimo_dia_do_mes(ano, mes)))
+
+
+def gerar_nomes(n: int, rng: random.Random) -> list[str]:
+    primeiros, pesos_p = zip(*_PRIMEIROS)
+    sobrenomes, pesos_s = zip(*_SOBRENOMES)
+    p = rng.choices(primeiros, pesos_p, k=n)
+    meio = rng.choices(sobrenomes, pesos_s, k=n)
+    fim = rng.choices(sobrenomes, pesos_s, k=n)
+    particula = rng.choices(_PARTICULAS, k=n)
+    return [f"{a} {d}{b} {c}" if b != c else f"{a} {d}{b}" for a, b, c, d in zip(p, meio, fim, particula)]
+
+
+def gerar_alunos(n: int, semente: int = SEMENTE_PADRAO, hoje: date | None = None) -> list[dict]:
+    """`n` alunos (ids 1..n) no formato do banco/alunos.json."""
+    rng = random.Random(semente)
+    hoje = hoje or date.today()
+    nomes = gerar_nomes(n, rng)
+    dias = rng.choices(range(1, 32), _PESO_DIAS, k=n)
+    alunos = []
+    for i, (nome, dia) in enumerate(zip(nomes, dias), start=1):
+        sorte = rng.random()
+        if sorte < 0.75:
+            # em dia (quem vence nos próximos dias aparece como aviso)
+            prox = calcular_proximo_vencimento(dia, hoje)
+        elif sorte < 0.93:
+            prox = _vencimento_meses_atras(dia, hoje, 1)
+        else:
+            prox = _vencimento_meses_atras(dia, hoje, rng.randint(2, 6))
+        alunos.append({"id": i, "nome": nome, "dia_venc": dia, "prox": prox.isoformat()})
+    return alunos
+
+
+def gerar_acessos(
+    alunos: list[dict],
+    dias: int = 30,
+    frequencia: float = 0.2,
+    semente: int = SEMENTE_PADRAO,
+    hoje: date | None = None,
+) -> Iterator[list[Acesso]]:
+    """Entradas dos últimos `dias` dias (um lote por dia, em ordem de horário).
+
+    Cada aluno vem em ~`frequencia` dos dias; quem estava vencido naquele dia
+    é barrado, e ~1% das leituras são de códigos que não existem.
+    """
+    rng = random.Random(semente + 1)
+    hoje = hoje or date.today()
+    prox = [date.fromisoformat(a["prox"]) for a in alunos]
+    visitas = max(1, int(len(alunos) * frequencia))
+    for d in range(dias, 0, -1):
+        dia = hoje - timedelta(days=d)
+        horas = rng.choices(range(24), _PESO_HORAS, k=visitas)
+        lote = []
+        for posicao, hora in zip(rng.sample(range(len(alunos)), min(visitas, len(alunos))), horas):
+            em = datetime.combine(dia, time(hora, rng.randrange(60), rng.randrange(60)))
+            if rng.random() < 0.01:
+                codigo = len(alunos) + rng.randint(1, 10_000)
+                lote.append(Acesso(em, codigo, str(codigo), False, "não encontrado", "recepcao"))
+                continue
+            a = alunos[posicao]
+            if prox[posicao] < dia:
+                lote.append(Acesso(em, a["id"], a["nome"], False, "em atraso", "recepcao"))
+            elif (prox[posicao] - dia).days <= DIAS_AVISO:
+                lote.append(Acesso(em, a["id"], a["nome"], True, "vencimento próximo", "recepcao"))
+            else:
+                lote.append(Acesso(em, a["id"], a["nome"], True, "", "recepcao"))
+        lote.sort()
+        yield lote
+
+
+def gravar_historico(registro: RegistroAcessos, alunos: list[dict], **opcoes) -> int:
+    """Grava o histórico sintético em `registro`. Retorna quantas entradas."""
+    total = 0
+    for lote in gerar_acessos(alunos, **opcoes):
+        registro.registrar_lote(lote)
+        registro.gravar_pendentes()
+        total += len(lote)
+    return total
+
+
+# ========= LINHA DE COMANDO =========
+
+def principal() -> None:
+    from arquivo_json import gravar_json
+    from repositorio import RepositorioAlunos
+
+    parser = argparse.ArgumentParser(description="Gera um cadastro sintético de alunos.")
+    parser.add_argument("alunos", type=int, help="quantidade de alunos (ex.: 1000 a 1000000)")
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--banco", help="grava os alunos neste banco SQLite (substitui os existentes)")
+    parser.add_argument("--json", help="grava os alunos neste arquivo JSON")
+    parser.add_argument("--acessos", help="pasta onde gravar o histórico de entradas")
+    parser.add_argument("--dias", type=int, default=30, help="dias de histórico")
+    args = parser.parse_args()
+
+    alunos = gerar_alunos(args.alunos, args.semente)
+    if args.json:
+        gravar_json(args.json, alunos)
+    if args.banco:
+        repo = RepositorioAlunos(args.banco)
+        repo.substituir_todos(alunos)
+        repo.fechar()
+    if args.acessos:
+        registro = RegistroAcessos(args.acessos)
+        total = gravar_historico(registro, alunos, dias=args.dias, semente=args.semente)
+        registro.fechar()
+        print(f"{total} entradas em {args.acessos}")
+    print(f"{len(alunos)} alunos (semente {args.semente})")
+
+
+if __name__ == "__main__":
+    principal()
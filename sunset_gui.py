@@ -1,74 +1,55 @@
+import logging
+import threading
+import time
 import tkinter as tk
+from typing import Callable, NamedTuple
 from tkinter import ttk, messagebox
-from datetime import date, timedelta
-import json
-import os
-
-ARQUIVO_ALUNOS = "alunos.json"
-ARQUIVO_USUARIOS = "usuarios.json"
-
-
-# ========= FUNÇÕES DE DATA / PAGAMENTO =========
-
-def ultimo_dia_do_mes(ano: int, mes: int) -> int:
-    """Retorna o último dia do mês (28-31)."""
-    if mes == 12:
-        return 31
-    primeiro_mes_seguinte = date(ano, mes + 1, 1)
-    ultimo_dia = primeiro_mes_seguinte - timedelta(days=1)
-    return ultimo_dia.day
-
-
-def calcular_proximo_vencimento(dia_venc: int, hoje: date | None = None) -> date:
-    """Calcula o próximo vencimento a partir do dia escolhido."""
-    if hoje is None:
-        hoje = date.today()
-
-    ano = hoje.year
-    mes = hoje.month
-
-    # se já passou o dia de vencimento, joga para o próximo mês
-    if hoje.day > dia_venc:
-        mes += 1
-        if mes == 13:
-            mes = 1
-            ano += 1
-
-    dia = min(dia_venc, ultimo_dia_do_mes(ano, mes))
-    return date(ano, mes, dia)
-
-
-def adicionar_um_mes(data: date) -> date:
-    """Usado para somar 1 mês quando pagamento é feito antes do vencimento."""
-    ano = data.year
-    mes = data.month + 1
-    if mes == 13:
-        mes = 1
-        ano += 1
-    dia = min(data.day, ultimo_dia_do_mes(ano, mes))
-    return date(ano, mes, dia)
-
-
-def status_pagamento(dia_venc: int, prox: date, hoje: date | None = None) -> str:
-    """Retorna 'ok', 'aviso' (próx 3 dias) ou 'atrasado'."""
-    if hoje is None:
-        hoje = date.today()
-
-    if prox < hoje:
-        return "atrasado"
-
-    delta = (prox - hoje).days
-    if 0 <= delta <= 3:
-        return "aviso"
-
-    return "ok"
-
-
-# ========= ARQUIVOS JSON =========
-
-def carregar_alunos() -> list[dict]:
-    """Lê alunos.json, cria alguns exemplos se não existir."""
-    if not os.path.exists(ARQUIVO_ALUNOS):
+from datetime import date, datetime
+
+from acessos import Acesso, RegistroAcessos
+from agenda import segundos_ate_virada
+from aluno import Aluno
+from autenticacao import carregar_usuarios, gerar_hash
+from busca import IndiceBusca
+from carga import CargaAlunos
+from catraca import MotorCheckin
+from colecao import ColecaoAlunos
+import desempenho
+from desempenho import cronometrado, medir, registrar
+from gravacao import GravadorSegundoPlano, SemIdReservado
+from indice_status import IndiceStatus
+from instantaneo import ARQUIVO_INSTANTANEO, Instantaneo, gravar_instantaneo
+from repositorio import RepositorioAlunos
+from servidor import MotorCheckinRemoto, cliente_do_ambiente
+from tabela import TabelaVirtual
+from vencimentos import calcular_proximo_vencimento, adicionar_um_mes
+
+# banco compartilhado com o portaria.py (importa o alunos.json antigo na 1ª vez)
+repositorio = RepositorioAlunos()
+
+log = logging.getLogger("sunset.telas")
+
+# pesquisa: quantos resultados mostrar e a pausa na digitação antes de buscar
+LIMITE_BUSCA = 200
+ESPERA_DIGITACAO_MS = 150
+INTERVALO_CATRACA_MS = 50
+INTERVALO_GRAVACAO_MS = 200
+INTERVALO_OUTROS_TERMINAIS_MS = 1000
+INTERVALO_DESEMPENHO_MS = 1000
+
+# abertura: alunos lidos antes da 1ª tela; o resto vem em segundo plano, um
+# lote (~40 ms de índices) a cada INTERVALO_CARGA_MS para a tela continuar respondendo
+PRIMEIRA_PAGINA = 500
+INTERVALO_CARGA_MS = 10
+LOTES_POR_VEZ = 1
+
+
+# ========= BANCO / ARQUIVOS JSON =========
+
+def carregar_alunos(limite: int = -1, repo: RepositorioAlunos = repositorio) -> list[Aluno]:
+    """Lê os alunos do banco (os `limite` primeiros), cria exemplos se o banco for novo."""
+    alunos = repo.listar(limite)
+    if repo.banco_novo and not alunos:
         hoje = date.today()
         alunos = [
             {
@@ -96,77 +77,123 @@ def carregar_alunos() -> list[dict]:
                 "prox": calcular_proximo_vencimento(31, hoje).isoformat()
             },
         ]
-        salvar_alunos(alunos)
-        return alunos
-
-    with open(ARQUIVO_ALUNOS, "r", encoding="utf-8") as f:
-        alunos = json.load(f)
-
-    # saneamento: garantir campos e tipos
-    hoje = date.today()
-    for idx, a in enumerate(alunos):
-        a.setdefault("id", idx + 1)
-        a["nome"] = a.get("nome", f"Aluno {a['id']}")
-        # dia_venc sempre int
-        dv = a.get("dia_venc", hoje.day)
-        try:
-            a["dia_venc"] = int(dv)
-        except ValueError:
-            a["dia_venc"] = hoje.day
-
-        prox_str = a.get("prox")
-        if not prox_str:
-            prox = calcular_proximo_vencimento(a["dia_venc"], hoje)
-        else:
-            try:
-                prox = date.fromisoformat(prox_str)
-            except Exception:
-                prox = calcular_proximo_vencimento(a["dia_venc"], hoje)
-        a["prox"] = prox.isoformat()
-
-    salvar_alunos(alunos)
-    return alunos
-
-
-def salvar_alunos(alunos: list[dict]) -> None:
-    with open(ARQUIVO_ALUNOS, "w", encoding="utf-8") as f:
-        json.dump(alunos, f, ensure_ascii=False, indent=2)
-
-
-def carregar_usuarios() -> list[dict]:
-    """Lê usuarios.json e garante campo 'perfil'."""
-    if not os.path.exists(ARQUIVO_USUARIOS):
-        usuarios = [
-            {"usuario": "admin", "senha": "admin", "perfil": "admin"}
-        ]
-        salvar_usuarios(usuarios)
-        return usuarios
-
-    with open(ARQUIVO_USUARIOS, "r", encoding="utf-8") as f:
-        usuarios = json.load(f)
-
-    for u in usuarios:
-        if "perfil" not in u:
-            u["perfil"] = "admin"
-    salvar_usuarios(usuarios)
-    return usuarios
-
-
-def salvar_usuarios(usuarios: list[dict]) -> None:
-    with open(ARQUIVO_USUARIOS, "w", encoding="utf-8") as f:
-        json.dump(usuarios, f, ensure_ascii=False, indent=2)
+        salvar_alunos(alunos, repo)
+
+    # o saneamento de registros antigos é feito uma única vez pela migração
+    # do repositório, então a leitura não grava nada
+    return [Aluno.de_dict(a) for a in alunos]
+
+
+def salvar_alunos(alunos: list[dict], repo: RepositorioAlunos = repositorio) -> None:
+    """Substitui todos os alunos do banco pela lista informada."""
+    repo.substituir_todos(alunos)
+
+
+class Abertura(NamedTuple):
+    """O que a 1ª tela precisa ler antes de aparecer."""
+    versao_vista: int
+    primeiros: list[Aluno]
+    total: int
+    instantaneo: Instantaneo | None
+
+
+@cronometrado("abertura.preparar")
+def preparar_abertura() -> Abertura:
+    """Lê a 1ª página (da foto binária ou do banco) sem usar o Tk.
+
+    Pode rodar em outra thread (o login chama enquanto a senha é digitada),
+    por isso usa uma conexão própria, fechada no fim. É ela que cria/migra o
+    banco na 1ª vez.
+    """
+    repo = RepositorioAlunos(repositorio.caminho, repositorio.arquivo_json)
+    try:
+        # outros terminais: última alteração do banco já refletida na memória
+        versao_vista = repo.versao_atual()
+        instantaneo = _abrir_instantaneo(versao_vista)
+        if instantaneo is not None:
+            primeiros = instantaneo.faixa(0, PRIMEIRA_PAGINA)
+            return Abertura(instantaneo.versao_banco, primeiros, len(instantaneo), instantaneo)
+        primeiros = carregar_alunos(PRIMEIRA_PAGINA, repo)
+        total = repo.contar() if len(primeiros) == PRIMEIRA_PAGINA else len(primeiros)
+        return Abertura(versao_vista, primeiros, total, None)
+    finally:
+        repo.fechar()
+
+
+def _abrir_instantaneo(versao_banco: int) -> Instantaneo | None:
+    instantaneo = Instantaneo.abrir(ARQUIVO_INSTANTANEO)
+    if instantaneo is None:
+        return None
+    if len(instantaneo) == 0 or instantaneo.versao_banco > versao_banco:
+        # vazia, ou de outro banco (versão à frente da do banco atual)
+        instantaneo.fechar()
+        return None
+    return instantaneo
 
 
 # ========= APLICAÇÃO PRINCIPAL =========
 
 class App(tk.Tk):
-    def __init__(self, usuario_logado: str, perfil: str = "recepcao"):
+    def __init__(self, usuario_logado: str, perfil: str = "recepcao", abertura: Abertura | None = None):
         super().__init__()
         self.usuario_logado = usuario_logado
         self.perfil = perfil
 
-        self.alunos = carregar_alunos()
+        # 1ª página já lida pelo login enquanto a senha era digitada (ou lida agora)
+        if abertura is None:
+            abertura = preparar_abertura()
+        # o que mudou no banco desde a leitura vem no 1º _acompanhar_outros_terminais
+        self._versao_vista = abertura.versao_vista
+        repositorio.mudou()
+        # foto binária do último fechamento: 1ª página, carga e consultas sem o banco
+        self._instantaneo = abertura.instantaneo
+        primeiros = abertura.primeiros
+        # gravações no banco / usuarios.json saem da thread da tela (inclusive a
+        # reserva de ids de alunos novos, feita em blocos antes de precisar)
+        self.gravador = GravadorSegundoPlano()
+        self.gravador.reservar_ids()
+        self._falha_gravacao_avisada = False
+        # alunos por id; os índices são avisados de cada alteração na coleção
+        self.alunos = ColecaoAlunos(primeiros, reservar_id=self.gravador.novo_id)
         self.usuarios = carregar_usuarios()
+        # situação de pagamento de cada aluno, atualizada a cada alteração
+        self.indice_status = IndiceStatus(self.alunos)
+        self.indice_busca = IndiceBusca(self.alunos)
+        self.alunos.observar(self.indice_status)
+        self.alunos.observar(self.indice_busca)
+        # histórico de entradas (liberadas e negadas), gravado em lote
+        self.acessos = RegistroAcessos()
+        # resto dos alunos: lido numa thread e colocado na coleção aos poucos
+        self._carregados = threading.Event()
+        self._carga: CargaAlunos | None = None
+        self._carga_incompleta = False
+        self._total_alunos = abertura.total
+        # maior id já colocado na coleção (a carga vem em ordem de id)
+        self._carregado_ate = primeiros[-1].id if primeiros else 0
+        if len(primeiros) == PRIMEIRA_PAGINA:
+            self._carga = CargaAlunos(
+                repositorio.caminho, depois_do_id=self._carregado_ate, instantaneo=self._instantaneo
+            )
+            self._carga.iniciar()
+        else:
+            self._carregados.set()
+        # leitora/catraca: decide em outra thread, a tela só recebe os resultados;
+        # com a foto aberta, quem ainda não foi carregado é consultado nela.
+        # Com SUNSET_SERVIDOR definido, quem decide (e registra) é o servidor.
+        cliente = cliente_do_ambiente()
+        if cliente is not None:
+            self.catraca = MotorCheckinRemoto(cliente, usuario_logado)
+        else:
+            self.catraca = MotorCheckin(
+                self.alunos, self.indice_status, self.acessos, usuario_logado,
+                pronto=self._carregados,
+                reserva=self._consultar_instantaneo if self._instantaneo is not None else None,
+            )
+
+        # telas construídas uma vez: nome -> (frame, função de atualização)
+        self._telas: dict[str, tuple[tk.Frame, Callable[[], None]]] = {}
+        self._telas_sujas: set[str] = set()
+        self._tela_atual: str | None = None
 
         self.title("SUNSET_PORTARIA – Sistema de Portaria da Academia Sunset")
         self.geometry("1200x650")
@@ -175,6 +202,44 @@ class App(tk.Tk):
 
         self._criar_layout()
         self.mostrar_dashboard()
+        self._agendar_virada_do_dia()
+        self._acompanhar_gravacoes()
+        if self._carga is not None:
+            self._receber_carga()
+        else:
+            self._acompanhar_outros_terminais(forcar=True)
+
+    def destroy(self):
+        carga_completa = self._carga is None and not self._carga_incompleta
+        if self._carga is not None:
+            self._carga.parar()
+        self._carregados.set()
+        self.catraca.parar()
+        self.gravador.fechar()
+        gravou_tudo = True
+        for r in self.gravador.coletar():
+            if not r.ok:
+                gravou_tudo = False
+                log.error("ao fechar: falha ao gravar %s: %s", r.descricao, r.erro)
+        self.acessos.fechar()
+        if self._instantaneo is not None:
+            # antes de gravar: no Windows não se troca um arquivo mapeado
+            self._instantaneo.fechar()
+            self._instantaneo = None
+        # a foto só vale se a memória tem todos os alunos e está igual ao banco
+        if carga_completa and gravou_tudo:
+            try:
+                gravar_instantaneo(ARQUIVO_INSTANTANEO, self.alunos, self._versao_vista)
+            except OSError as e:
+                log.warning("não foi possível gravar a foto dos alunos: %s", e)
+        super().destroy()
+
+    def _consultar_instantaneo(self, aluno_id: int) -> Aluno | None:
+        """Reserva da catraca durante a carga (chamada da thread da catraca)."""
+        if self._carga is not None and aluno_id > self._carregado_ate:
+            return self._instantaneo.obter(aluno_id)
+        # já carregado: a coleção vale (inclusive se foi excluído)
+        return self.alunos.obter(aluno_id)
 
     # ----- layout geral -----
 
@@ -192,14 +257,14 @@ class App(tk.Tk):
         )
         lbl_titulo.pack(side="left", padx=20, pady=10)
 
-        lbl_user = tk.Label(
+        self.lbl_user = tk.Label(
             top,
-            text=f"Usuário: {self.usuario_logado} ({self.perfil})   |   Hoje: {date.today().strftime('%d/%m/%Y')}",
+            text=self._texto_usuario(),
             bg="#020617",
             fg="#9ca3af",
             font=("Segoe UI", 10)
         )
-        lbl_user.pack(side="right", padx=20)
+        self.lbl_user.pack(side="right", padx=20)
 
         # menu lateral
         self.menu = tk.Frame(self, bg="#020617", width=200)
@@ -237,6 +302,7 @@ class App(tk.Tk):
 
         if self.perfil == "admin":
             self._btn_menu("Admin / Usuários", self.mostrar_usuarios_sistema)
+            self._btn_menu("Admin / Desempenho", self.mostrar_desempenho)
 
         self._btn_menu("Sair", self.destroy, danger=True)
 
@@ -261,32 +327,200 @@ class App(tk.Tk):
         btn.pack(fill="x", padx=20, pady=4)
 
     def limpar_conteudo(self):
-        for w in self.content.winfo_children():
-            w.destroy()
+        """Esconde a tela atual (ela continua construída para a próxima vez)."""
+        if self._tela_atual is not None:
+            self._telas[self._tela_atual][0].pack_forget()
+            self._tela_atual = None
+
+    def _mostrar_tela(self, nome: str, construir) -> None:
+        """Mostra a tela `nome`, construindo na 1ª vez e atualizando se estiver suja.
+
+        `construir(frame)` monta os widgets e devolve a função que recarrega
+        só os dados da tela.
+        """
+        if self._tela_atual == nome:
+            return
+        self.limpar_conteudo()
+
+        inicio = time.perf_counter()
+        if nome not in self._telas:
+            frame = tk.Frame(self.content, bg="#0f172a")
+            atualizar = construir(frame)
+            self._telas[nome] = (frame, atualizar)
+            self._telas_sujas.discard(nome)
+            ms = (time.perf_counter() - inicio) * 1000
+            registrar(f"tela.{nome}.construir", ms)
+            log.info("tela %s construída em %.1f ms", nome, ms)
+        elif nome in self._telas_sujas:
+            self._telas[nome][1]()
+            self._telas_sujas.discard(nome)
+            ms = (time.perf_counter() - inicio) * 1000
+            registrar(f"tela.{nome}.atualizar", ms)
+            log.info("tela %s atualizada em %.1f ms", nome, ms)
+
+        self._telas[nome][0].pack(fill="both", expand=True, padx=20, pady=20)
+        self._tela_atual = nome
+
+    def _atualizar_tela_atual(self) -> None:
+        if self._tela_atual is not None:
+            with medir(f"tela.{self._tela_atual}.atualizar"):
+                self._telas[self._tela_atual][1]()
+
+    def _dados_alterados(self) -> None:
+        """Marca as outras telas para recarregar os dados quando forem abertas."""
+        self._telas_sujas.update(n for n in self._telas if n != self._tela_atual)
+
+    def _acompanhar_gravacoes(self) -> None:
+        """Mostra falhas de gravação da thread de segundo plano (uma vez até voltar a gravar)."""
+        for r in self.gravador.coletar():
+            if r.conflitos:
+                self._recusar_conflitos(r.conflitos)
+            if r.ok:
+                log.debug("gravação: %s", r.descricao)
+                self._falha_gravacao_avisada = False
+            elif not self._falha_gravacao_avisada:
+                self._falha_gravacao_avisada = True
+                messagebox.showerror(
+                    "Erro ao salvar",
+                    f"Não foi possível gravar {r.descricao}: {r.erro}\n"
+                    "Os dados continuam na tela e a gravação será tentada de novo.",
+                )
+        self.after(INTERVALO_GRAVACAO_MS, self._acompanhar_gravacoes)
+
+    @cronometrado("carga.lote")
+    def _receber_carga(self) -> None:
+        """Coloca na coleção os alunos que a thread de carga já leu."""
+        novos = self._carga.coletar(LOTES_POR_VEZ)
+        for a in novos:
+            # incluído (ou trazido de outro terminal) enquanto carregava: o da memória vale
+            if a.id not in self.alunos:
+                self.alunos.adicionar(a)
+        if novos:
+            # depois de colocar na coleção: a reserva da catraca passa a olhar lá
+            self._carregado_ate = novos[-1].id
+            self._dados_alterados()
+            self._atualizar_tela_atual()
+
+        if not self._carga.terminada:
+            self.lbl_user.config(text=self._texto_usuario())
+            self.after(INTERVALO_CARGA_MS, self._receber_carga)
+            return
+
+        erro = self._carga.erro
+        self._carga = None
+        self._carga_incompleta = bool(erro)
+        self._carregados.set()
+        self.lbl_user.config(text=self._texto_usuario())
+        log.info("carga terminada: %d alunos", len(self.alunos))
+        if erro:
+            messagebox.showerror("Erro ao carregar", f"Nem todos os alunos foram carregados: {erro}")
+        # só agora: as alterações de outros terminais desde a abertura valem sobre a carga
+        self._acompanhar_outros_terminais(forcar=True)
+
+    def _acompanhar_outros_terminais(self, forcar: bool = False) -> None:
+        """Traz para a memória (e para as telas) só os alunos que outro terminal mudou.
+
+        `forcar` na 1ª vez: o que foi gravado antes da abertura (ou depois da
+        foto binária) não aparece em mudou().
+        """
+        if repositorio.mudou() or forcar:
+            alteracoes = repositorio.alteracoes_desde(self._versao_vista)
+            if alteracoes is None:
+                # ficou tempo demais sem olhar e o log foi podado: relê tudo
+                self._versao_vista = repositorio.versao_atual()
+                alterados = repositorio.listar()
+                vistos = {a["id"] for a in alterados}
+                removidos = [a.id for a in self.alunos if a.id not in vistos]
+            else:
+                self._versao_vista, alterados, removidos = alteracoes
+            with medir("terminais.mesclar"):
+                self._mesclar(alterados, removidos)
+        self.after(INTERVALO_OUTROS_TERMINAIS_MS, self._acompanhar_outros_terminais)
+
+    def _mesclar(self, alterados: list[dict], removidos: list[int]) -> None:
+        mudou = False
+        for d in alterados:
+            # alteração local ainda na fila de gravação: a nossa vale
+            if self.gravador.pendente(d["id"]):
+                continue
+            novo = Aluno.de_dict(d)
+            atual = self.alunos.obter(novo.id)
+            if atual is None:
+                self.alunos.adicionar(novo)
+                mudou = True
+            elif not atual.mesmos_dados(novo):
+                atual.copiar_de(novo)
+                self.alunos.atualizar(atual)
+                mudou = True
+            else:
+                atual.versao = novo.versao
+        for i in removidos:
+            if i in self.alunos and not self.gravador.pendente(i):
+                self.alunos.remover(i)
+                mudou = True
+        if mudou:
+            log.info("alterações de outro terminal: %d aluno(s)", len(alterados) + len(removidos))
+            self._dados_alterados()
+            self._atualizar_tela_atual()
+
+    def _recusar_conflitos(self, ids: tuple[int, ...]) -> None:
+        """Alteração local perdeu para a de outro terminal: mostra o que ficou valendo."""
+        nomes = [self.alunos.obter(i).nome for i in ids if i in self.alunos]
+        alterados = [a for a in map(repositorio.obter, ids) if a is not None]
+        vistos = {a["id"] for a in alterados}
+        self._mesclar(alterados, [i for i in ids if i not in vistos])
+        messagebox.showwarning(
+            "Alterado em outro terminal",
+            "Estes alunos foram alterados em outro terminal antes da sua gravação:\n"
+            + "\n".join(nomes)
+            + "\n\nA sua alteração não foi gravada. Confira os dados e repita se preciso.",
+        )
+
+    def _contagem(self) -> dict[str, int]:
+        # carregando da foto: ela já sabe a situação de todos; depois, o índice
+        if self._carga is not None and self._instantaneo is not None:
+            return self._instantaneo.contagem(self.indice_status.hoje)
+        return self.indice_status.contagem()
+
+    def _texto_usuario(self) -> str:
+        texto = f"Usuário: {self.usuario_logado} ({self.perfil})   |   Hoje: {date.today().strftime('%d/%m/%Y')}"
+        if self._carga is not None:
+            texto += f"   |   carregando alunos: {len(self.alunos):,} de {self._total_alunos:,}".replace(",", ".")
+        return texto
+
+    def _agendar_virada_do_dia(self) -> None:
+        self.after(int(segundos_ate_virada() * 1000), self._virar_dia)
+
+    @cronometrado("virada_do_dia")
+    def _virar_dia(self) -> None:
+        """Meia-noite: reclassifica só quem cruzou um limite e atualiza as telas."""
+        hoje = date.today()
+        if hoje != self.indice_status.hoje:
+            movidos = self.indice_status.virar_dia(hoje)
+            log.info("virada do dia: %d alunos mudaram de situação", len(movidos))
+            self.lbl_user.config(text=self._texto_usuario())
+            # todas as telas dependem de "hoje" (entradas do dia, situação)
+            self._dados_alterados()
+            self._atualizar_tela_atual()
+        self._agendar_virada_do_dia()
 
     # ----- DASHBOARD -----
 
     def mostrar_dashboard(self):
-        self.limpar_conteudo()
-        frame = tk.Frame(self.content, bg="#0f172a")
-        frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self._mostrar_tela("dashboard", self._construir_dashboard)
 
-        hoje = date.today()
-        total = len(self.alunos)
-        atrasados = sum(
-            1
-            for a in self.alunos
-            if status_pagamento(a["dia_venc"], date.fromisoformat(a["prox"]), hoje) == "atrasado"
-        )
-        aviso = sum(
-            1
-            for a in self.alunos
-            if status_pagamento(a["dia_venc"], date.fromisoformat(a["prox"]), hoje) == "aviso"
-        )
+    def _construir_dashboard(self, frame):
+        lbl_total = self._card_dashboard(frame, "Total de alunos", 0, "#0ea5e9")
+        lbl_aviso = self._card_dashboard(frame, "Pagamentos a vencer (3 dias)", 0, "#facc15")
+        lbl_atrasados = self._card_dashboard(frame, "Inadimplentes", 0, "#ef4444")
 
-        self._card_dashboard(frame, "Total de alunos", total, "#0ea5e9")
-        self._card_dashboard(frame, "Pagamentos a vencer (3 dias)", aviso, "#facc15")
-        self._card_dashboard(frame, "Inadimplentes", atrasados, "#ef4444")
+        def atualizar():
+            contagem = self._contagem()
+            lbl_total.config(text=str(sum(contagem.values())))
+            lbl_aviso.config(text=str(contagem["aviso"]))
+            lbl_atrasados.config(text=str(contagem["atrasado"]))
+
+        atualizar()
 
         # legenda
         legenda = tk.Frame(frame, bg="#0f172a")
@@ -300,6 +534,8 @@ class App(tk.Tk):
         tk.Label(legenda, text="Vermelho = atrasado", bg="#0f172a", fg="#ef4444",
                  font=("Segoe UI", 10)).pack(side="left")
 
+        return atualizar
+
     def _card_dashboard(self, parent, titulo, valor, cor_faixa):
         card = tk.Frame(parent, bg="#020617", bd=0, relief="flat")
         card.pack(side="left", padx=10, pady=10, fill="y")
@@ -324,14 +560,14 @@ class App(tk.Tk):
             font=("Segoe UI", 20, "bold")
         )
         lbl_valor.pack(padx=20, pady=(0, 12))
+        return lbl_valor
 
     # ----- ALUNOS -----
 
     def mostrar_alunos(self):
-        self.limpar_conteudo()
-        frame = tk.Frame(self.content, bg="#0f172a")
-        frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self._mostrar_tela("alunos", self._construir_alunos)
 
+    def _construir_alunos(self, frame):
         titulo = tk.Label(
             frame,
             text="Alunos – Cadastro e Pagamentos",
@@ -385,52 +621,32 @@ class App(tk.Tk):
         )
         btn_pag.grid(row=0, column=6, padx=10)
 
-        # Tabela
-        cols = ("id", "nome", "dia_venc", "prox", "status")
-        tree = ttk.Treeview(
-            frame,
-            columns=cols,
-            show="headings",
-            height=18
-        )
-        tree.pack(fill="both", expand=True, pady=(10, 0))
-
-        for col, txt, w in [
-            ("id", "ID", 40),
-            ("nome", "Nome", 260),
-            ("dia_venc", "Dia venc.", 80),
-            ("prox", "Próx. venc.", 100),
-            ("status", "Status", 120),
-        ]:
-            tree.heading(col, text=txt)
-            tree.column(col, width=w, anchor="center")
-
-        # cores
         style = ttk.Style()
         style.configure("Treeview", font=("Segoe UI", 9))
-        tree.tag_configure("ok", foreground="#22c55e")
-        tree.tag_configure("aviso", foreground="#facc15")
-        tree.tag_configure("atrasado", foreground="#ef4444")
 
-        def preencher():
-            tree.delete(*tree.get_children())
-            hoje = date.today()
-            for a in self.alunos:
-                prox = date.fromisoformat(a["prox"])
-                st = status_pagamento(a["dia_venc"], prox, hoje)
-                tag = st
-                st_txt = {
-                    "ok": "Em dia",
-                    "aviso": "Vence em breve",
-                    "atrasado": "Atrasado",
-                }[st]
-                tree.insert(
-                    "",
-                    "end",
-                    iid=str(a["id"]),
-                    values=(a["id"], a["nome"], a["dia_venc"], prox.strftime("%d/%m/%Y"), st_txt),
-                    tags=(tag,)
-                )
+        def linha(a):
+            st = self.indice_status.status(a.id)
+            st_txt = {
+                "ok": "Em dia",
+                "aviso": "Vence em breve",
+                "atrasado": "Atrasado",
+            }[st]
+            return (a.id, a.nome, a.dia_venc, a.prox_br, st_txt), st
+
+        # Tabela (só as linhas visíveis são criadas no Treeview)
+        tabela = TabelaVirtual(
+            frame,
+            [
+                ("id", "ID", 40),
+                ("nome", "Nome", 260),
+                ("dia_venc", "Dia venc.", 80),
+                ("prox", "Próx. venc.", 100),
+                ("status", "Status", 120),
+            ],
+            linha,
+            altura=18,
+        )
+        tabela.pack(fill="both", expand=True, pady=(10, 0))
 
         def on_add():
             nome = entry_nome.get().strip()
@@ -446,79 +662,81 @@ class App(tk.Tk):
                 messagebox.showwarning("Atenção", "Dia de vencimento deve ser número entre 1 e 31.")
                 return
 
-            selecionado = tree.selection()
+            iid = tabela.selecionado()
             hoje = date.today()
 
-            if selecionado:
+            if iid is not None:
                 # update
-                iid = int(selecionado[0])
-                for a in self.alunos:
-                    if a["id"] == iid:
-                        a["nome"] = nome
-                        a["dia_venc"] = dia
-                        a["prox"] = calcular_proximo_vencimento(dia, hoje).isoformat()
-                        break
+                a = self.alunos.obter(iid)
+                if a is not None:
+                    a.nome = nome
+                    a.dia_venc = dia
+                    a.data_prox = calcular_proximo_vencimento(dia, hoje)
+                    self.gravador.salvar_aluno(a)
+                    self.alunos.atualizar(a)
             else:
-                novo_id = max([a["id"] for a in self.alunos], default=0) + 1
+                try:
+                    novo_id = self.alunos.novo_id()
+                except SemIdReservado:
+                    messagebox.showwarning(
+                        "Aguarde", "O banco está ocupado por outro terminal. Tente de novo em instantes."
+                    )
+                    return
                 prox = calcular_proximo_vencimento(dia, hoje)
-                self.alunos.append(
-                    {
-                        "id": novo_id,
-                        "nome": nome,
-                        "dia_venc": dia,
-                        "prox": prox.isoformat(),
-                    }
-                )
+                aluno = Aluno(novo_id, nome, dia, prox.toordinal())
+                self.alunos.adicionar(aluno)
+                self.gravador.salvar_aluno(aluno)
 
-            salvar_alunos(self.alunos)
-            preencher()
+            self._dados_alterados()
+            tabela.atualizar()
             entry_nome.delete(0, tk.END)
             entry_dia.delete(0, tk.END)
-            tree.selection_remove(tree.selection())
+            tabela.limpar_selecao()
 
         def on_del():
-            selecionado = tree.selection()
-            if not selecionado:
+            iid = tabela.selecionado()
+            if iid is None:
                 messagebox.showinfo("Info", "Selecione um aluno para remover.")
                 return
-            iid = int(selecionado[0])
-            self.alunos = [a for a in self.alunos if a["id"] != iid]
-            salvar_alunos(self.alunos)
-            preencher()
+            self.alunos.remover(iid)
+            self.gravador.remover_aluno(iid)
+            self._dados_alterados()
+            tabela.limpar_selecao()
+            tabela.atualizar()
 
         def on_pagamento_ok():
-            selecionado = tree.selection()
-            if not selecionado:
+            iid = tabela.selecionado()
+            if iid is None:
                 messagebox.showinfo("Info", "Selecione um aluno para registrar pagamento.")
                 return
-            iid = int(selecionado[0])
             hoje = date.today()
-            for a in self.alunos:
-                if a["id"] == iid:
-                    # se pagar antes, empurra 1 mês a partir do vencimento atual
-                    prox_atual = date.fromisoformat(a["prox"])
-                    if hoje <= prox_atual:
-                        proximo = adicionar_um_mes(prox_atual)
-                    else:
-                        proximo = calcular_proximo_vencimento(a["dia_venc"], hoje)
-                    a["prox"] = proximo.isoformat()
-                    break
-            salvar_alunos(self.alunos)
-            preencher()
+            a = self.alunos.obter(iid)
+            if a is not None:
+                # se pagar antes, empurra 1 mês a partir do vencimento atual
+                prox_atual = self.indice_status.prox(iid)
+                if hoje <= prox_atual:
+                    proximo = adicionar_um_mes(prox_atual)
+                else:
+                    proximo = calcular_proximo_vencimento(a.dia_venc, hoje)
+                a.data_prox = proximo
+                self.gravador.salvar_aluno(a)
+                self.alunos.atualizar(a)
+            self._dados_alterados()
+            tabela.atualizar()
 
         btn_add.config(command=on_add)
         btn_del.config(command=on_del)
         btn_pag.config(command=on_pagamento_ok)
 
-        preencher()
+        tabela.definir_fonte(lambda: len(self.alunos), self.alunos.faixa)
+        return tabela.atualizar
 
     # ----- CHECK-IN -----
 
     def mostrar_checkin(self):
-        self.limpar_conteudo()
-        frame = tk.Frame(self.content, bg="#0f172a")
-        frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self._mostrar_tela("checkin", self._construir_checkin)
 
+    def _construir_checkin(self, frame):
         tk.Label(
             frame,
             text="Check-in de alunos",
@@ -527,69 +745,74 @@ class App(tk.Tk):
             font=("Segoe UI", 14, "bold")
         ).pack(anchor="w", pady=(0, 10))
 
-        cols = ("id", "nome", "status")
-        tree = ttk.Treeview(frame, columns=cols, show="headings", height=18)
-        tree.pack(side="left", fill="both", expand=True)
-
-        for col, txt, w in [
-            ("id", "ID", 40),
-            ("nome", "Nome", 260),
-            ("status", "Situação", 140),
-        ]:
-            tree.heading(col, text=txt)
-            tree.column(col, width=w, anchor="center")
-
-        style = ttk.Style()
-        tree.tag_configure("ok", foreground="#22c55e")
-        tree.tag_configure("aviso", foreground="#facc15")
-        tree.tag_configure("atrasado", foreground="#ef4444")
-
-        hoje = date.today()
-
-        def preencher():
-            tree.delete(*tree.get_children())
-            for a in self.alunos:
-                prox = date.fromisoformat(a["prox"])
-                st = status_pagamento(a["dia_venc"], prox, hoje)
-                txt = {
-                    "ok": "Liberado",
-                    "aviso": "Liberado (vence em breve)",
-                    "atrasado": "Bloqueado (pagamento)",
-                }[st]
-                tree.insert(
-                    "",
-                    "end",
-                    iid=str(a["id"]),
-                    values=(a["id"], a["nome"], txt),
-                    tags=(st,)
-                )
+        def linha(a):
+            st = self.indice_status.status(a.id)
+            txt = {
+                "ok": "Liberado",
+                "aviso": "Liberado (vence em breve)",
+                "atrasado": "Bloqueado (pagamento)",
+            }[st]
+            return (a.id, a.nome, txt), st
 
-        preencher()
+        tabela = TabelaVirtual(
+            frame,
+            [
+                ("id", "ID", 40),
+                ("nome", "Nome", 260),
+                ("status", "Situação", 140),
+            ],
+            linha,
+            altura=18,
+        )
+        tabela.pack(side="left", fill="both", expand=True)
+        tabela.definir_fonte(lambda: len(self.alunos), self.alunos.faixa)
 
         painel = tk.Frame(frame, bg="#0f172a")
         painel.pack(side="right", fill="y", padx=(10, 0))
 
-        tk.Label(painel, text="Entradas de hoje (visual)", bg="#0f172a", fg="#e5e7eb",
+        tk.Label(painel, text="Entradas de hoje", bg="#0f172a", fg="#e5e7eb",
                  font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(0, 6))
 
         lista_entradas = tk.Listbox(painel, width=40, height=18)
         lista_entradas.pack()
 
+        def texto_acesso(a: Acesso) -> str:
+            situacao = "liberado" if a.liberado else f"NEGADO ({a.motivo})"
+            return f"{a.em.strftime('%H:%M')}  {a.nome} – {situacao}"
+
+        def mostrar_acessos(acessos) -> None:
+            if not acessos:
+                return
+            primeiro = lista_entradas.size()
+            lista_entradas.insert(tk.END, *map(texto_acesso, acessos))
+            for n, a in enumerate(acessos, start=primeiro):
+                if not a.liberado:
+                    lista_entradas.itemconfig(n, fg="#ef4444")
+            lista_entradas.see(tk.END)
+
         def registrar_entrada():
-            sel = tree.selection()
-            if not sel:
+            iid = tabela.selecionado()
+            if iid is None:
                 messagebox.showinfo("Info", "Selecione um aluno para registrar entrada.")
                 return
-            iid = int(sel[0])
-            aluno = next((a for a in self.alunos if a["id"] == iid), None)
+            aluno = self.alunos.obter(iid)
             if not aluno:
                 return
-            prox = date.fromisoformat(aluno["prox"])
-            st = status_pagamento(aluno["dia_venc"], prox, hoje)
-            if st == "atrasado":
+            if self.indice_status.status(iid) == "atrasado":
+                a = self.acessos.registrar(iid, aluno.nome, False, "em atraso", self.usuario_logado)
+                mostrar_acessos([a])
                 messagebox.showwarning("Atenção", "Aluno com pagamento atrasado. Liberar somente após regularização.")
                 return
-            lista_entradas.insert(tk.END, f"{aluno['nome']} – {date.today().strftime('%d/%m/%Y')}")
+            a = self.acessos.registrar(iid, aluno.nome, True, usuario=self.usuario_logado)
+            mostrar_acessos([a])
+
+        def carregar_entradas():
+            lista_entradas.delete(0, tk.END)
+            mostrar_acessos(self.acessos.do_dia())
+
+        def atualizar():
+            carregar_entradas()
+            tabela.atualizar()
 
         btn_checkin = tk.Button(
             painel,
@@ -603,13 +826,39 @@ class App(tk.Tk):
         )
         btn_checkin.pack(pady=(8, 0))
 
+        # modo catraca: a leitora "digita" a matrícula + Enter, sem janelas de aviso
+        tk.Label(painel, text="Leitora / matrícula", bg="#0f172a", fg="#9ca3af",
+                 font=("Segoe UI", 9)).pack(anchor="w", pady=(14, 2))
+        entry_leitora = tk.Entry(painel, width=20)
+        entry_leitora.pack(anchor="w")
+
+        def ler_codigo(event=None):
+            codigo = entry_leitora.get().strip()
+            entry_leitora.delete(0, tk.END)
+            if codigo:
+                self.catraca.entrada(codigo)
+
+        def receber_decisoes():
+            decisoes = self.catraca.coletar()
+            if decisoes:
+                hora = datetime.now().replace(microsecond=0)
+                mostrar_acessos([
+                    Acesso(hora, d.aluno_id, d.nome, d.liberado, d.motivo) for d in decisoes
+                ])
+            self.after(INTERVALO_CATRACA_MS, receber_decisoes)
+
+        entry_leitora.bind("<Return>", ler_codigo)
+        receber_decisoes()
+
+        carregar_entradas()
+        return atualizar
+
     # ----- ALERTAS -----
 
     def mostrar_alertas(self):
-        self.limpar_conteudo()
-        frame = tk.Frame(self.content, bg="#0f172a")
-        frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self._mostrar_tela("alertas", self._construir_alertas)
 
+    def _construir_alertas(self, frame):
         tk.Label(
             frame,
             text="Alertas de pagamento",
@@ -618,44 +867,37 @@ class App(tk.Tk):
             font=("Segoe UI", 14, "bold")
         ).pack(anchor="w", pady=(0, 10))
 
-        cols = ("id", "nome", "dia_venc", "prox", "status")
-        tree = ttk.Treeview(frame, columns=cols, show="headings", height=20)
-        tree.pack(fill="both", expand=True)
-
-        for col, txt, w in [
-            ("id", "ID", 40),
-            ("nome", "Nome", 260),
-            ("dia_venc", "Dia venc.", 80),
-            ("prox", "Próx. venc.", 100),
-            ("status", "Situação", 140),
-        ]:
-            tree.heading(col, text=txt)
-            tree.column(col, width=w, anchor="center")
-
-        tree.tag_configure("aviso", foreground="#facc15")
-        tree.tag_configure("atrasado", foreground="#ef4444")
-
-        hoje = date.today()
-        for a in self.alunos:
-            prox = date.fromisoformat(a["prox"])
-            st = status_pagamento(a["dia_venc"], prox, hoje)
-            if st == "ok":
-                continue
+        def linha(a):
+            st = self.indice_status.status(a.id)
             st_txt = "Vence em breve" if st == "aviso" else "Atrasado"
-            tree.insert(
-                "",
-                "end",
-                values=(a["id"], a["nome"], a["dia_venc"], prox.strftime("%d/%m/%Y"), st_txt),
-                tags=(st,)
-            )
+            return (a.id, a.nome, a.dia_venc, a.prox_br, st_txt), st
+
+        tabela = TabelaVirtual(
+            frame,
+            [
+                ("id", "ID", 40),
+                ("nome", "Nome", 260),
+                ("dia_venc", "Dia venc.", 80),
+                ("prox", "Próx. venc.", 100),
+                ("status", "Situação", 140),
+            ],
+            linha,
+            altura=20,
+        )
+        tabela.pack(fill="both", expand=True)
+        # atrasados e depois "vence em breve", cada grupo já ordenado pelo vencimento
+        tabela.definir_fonte(
+            lambda: self.indice_status.contar("atrasado", "aviso"),
+            lambda i, j: self.indice_status.faixa(i, j, "atrasado", "aviso"),
+        )
+        return tabela.atualizar
 
     # ----- PESQUISA -----
 
     def mostrar_pesquisa(self):
-        self.limpar_conteudo()
-        frame = tk.Frame(self.content, bg="#0f172a")
-        frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self._mostrar_tela("pesquisa", self._construir_pesquisa)
 
+    def _construir_pesquisa(self, frame):
         tk.Label(
             frame,
             text="Pesquisa de alunos",
@@ -682,46 +924,65 @@ class App(tk.Tk):
         )
         btn.pack(side="left", padx=6)
 
-        cols = ("id", "nome", "dia_venc", "prox", "status")
-        tree = ttk.Treeview(frame, columns=cols, show="headings", height=20)
-        tree.pack(fill="both", expand=True)
+        def linha(a):
+            st = self.indice_status.status(a.id)
+            st_txt = {
+                "ok": "Em dia",
+                "aviso": "Vence em breve",
+                "atrasado": "Atrasado",
+            }[st]
+            return (a.id, a.nome, a.dia_venc, a.prox_br, st_txt), st
 
-        for col, txt, w in [
-            ("id", "ID", 40),
-            ("nome", "Nome", 260),
-            ("dia_venc", "Dia venc.", 80),
-            ("prox", "Próx. venc.", 100),
-            ("status", "Situação", 140),
-        ]:
-            tree.heading(col, text=txt)
-            tree.column(col, width=w, anchor="center")
-
-        tree.tag_configure("ok", foreground="#22c55e")
-        tree.tag_configure("aviso", foreground="#facc15")
-        tree.tag_configure("atrasado", foreground="#ef4444")
+        tabela = TabelaVirtual(
+            frame,
+            [
+                ("id", "ID", 40),
+                ("nome", "Nome", 260),
+                ("dia_venc", "Dia venc.", 80),
+                ("prox", "Próx. venc.", 100),
+                ("status", "Situação", 140),
+            ],
+            linha,
+            altura=20,
+        )
+        tabela.pack(fill="both", expand=True)
 
         def executar_busca():
-            q = entry_q.get().strip().lower()
-            tree.delete(*tree.get_children())
-            hoje = date.today()
-            for a in self.alunos:
-                if q and q not in a["nome"].lower():
-                    continue
-                prox = date.fromisoformat(a["prox"])
-                st = status_pagamento(a["dia_venc"], prox, hoje)
-                st_txt = {
-                    "ok": "Em dia",
-                    "aviso": "Vence em breve",
-                    "atrasado": "Atrasado",
-                }[st]
-                tree.insert(
-                    "",
-                    "end",
-                    values=(a["id"], a["nome"], a["dia_venc"], prox.strftime("%d/%m/%Y"), st_txt),
-                    tags=(st,)
-                )
+            q = entry_q.get().strip()
+            if q:
+                with medir("pesquisa.buscar"):
+                    resultado = self.indice_busca.buscar(q, limite=LIMITE_BUSCA)
+                tabela.definir_fonte(lambda: len(resultado), lambda i, j: resultado[i:j])
+            else:
+                tabela.definir_fonte(lambda: len(self.alunos), self.alunos.faixa)
+
+        # busca enquanto digita, esperando uma pausa curta entre as teclas
+        agendada = None
+
+        def ao_digitar(event=None):
+            nonlocal agendada
+            if agendada is not None:
+                self.after_cancel(agendada)
+            agendada = self.after(ESPERA_DIGITACAO_MS, disparar)
+
+        def disparar():
+            nonlocal agendada
+            agendada = None
+            executar_busca()
 
         btn.config(command=executar_busca)
+        entry_q.bind("<KeyRelease>", ao_digitar)
+        entry_q.bind("<Return>", lambda e: executar_busca())
+
+        def atualizar():
+            # refaz a última busca, se houver, com os dados novos; sem busca a
+            # fonte já é a coleção, mas a janela visível fica em cache
+            if entry_q.get().strip():
+                executar_busca()
+            else:
+                tabela.atualizar()
+
+        return atualizar
 
     # ----- ADMIN / USUÁRIOS -----
 
@@ -730,10 +991,9 @@ class App(tk.Tk):
             messagebox.showwarning("Acesso negado", "Somente admin pode gerenciar usuários.")
             return
 
-        self.limpar_conteudo()
-        frame = tk.Frame(self.content, bg="#0f172a")
-        frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self._mostrar_tela("usuarios", self._construir_usuarios_sistema)
 
+    def _construir_usuarios_sistema(self, frame):
         tk.Label(
             frame,
             text="Admin – Usuários do sistema",
@@ -811,9 +1071,9 @@ class App(tk.Tk):
                 return
 
             self.usuarios.append(
-                {"usuario": usuario, "senha": senha, "perfil": perfil}
+                {"usuario": usuario, "senha_hash": gerar_hash(senha), "perfil": perfil}
             )
-            salvar_usuarios(self.usuarios)
+            self.gravador.salvar_usuarios(self.usuarios)
             preencher()
             entry_user.delete(0, tk.END)
             entry_senha.delete(0, tk.END)
@@ -828,17 +1088,121 @@ class App(tk.Tk):
                 messagebox.showwarning("Atenção", "O usuário 'admin' não pode ser removido.")
                 return
             self.usuarios = [u for u in self.usuarios if u["usuario"] != usuario]
-            salvar_usuarios(self.usuarios)
+            self.gravador.salvar_usuarios(self.usuarios)
             preencher()
 
         btn_add.config(command=on_add_user)
         btn_del.config(command=on_del_user)
 
         preencher()
+        return preencher
+
+    # ----- ADMIN / DESEMPENHO -----
+
+    def mostrar_desempenho(self):
+        if self.perfil != "admin":
+            messagebox.showwarning("Acesso negado", "Somente admin pode ver o desempenho.")
+            return
+
+        self._mostrar_tela("desempenho", self._construir_desempenho)
+
+    def _construir_desempenho(self, frame):
+        tk.Label(
+            frame,
+            text="Admin – Desempenho",
+            bg="#0f172a",
+            fg="#e5e7eb",
+            font=("Segoe UI", 14, "bold")
+        ).pack(anchor="w", pady=(0, 10))
+
+        barra = tk.Frame(frame, bg="#0f172a")
+        barra.pack(anchor="w", pady=(0, 8))
+
+        var_ativo = tk.BooleanVar(value=desempenho.ativo())
+        tk.Checkbutton(
+            barra,
+            text="Medir tempos",
+            variable=var_ativo,
+            command=lambda: desempenho.ativar(var_ativo.get()),
+            bg="#0f172a",
+            fg="#e5e7eb",
+            selectcolor="#020617",
+            activebackground="#0f172a",
+            activeforeground="#e5e7eb",
+        ).pack(side="left")
+
+        def zerar():
+            desempenho.zerar()
+            preencher()
+
+        def salvar():
+            try:
+                caminho = desempenho.gravar()
+            except OSError as e:
+                messagebox.showerror("Erro", f"Não foi possível gravar: {e}")
+                return
+            messagebox.showinfo("Desempenho", f"Medidas gravadas em:\n{caminho}")
+
+        for texto, comando, cor in (
+            ("Zerar", zerar, "#facc15"),
+            ("Salvar em arquivo", salvar, "#0ea5e9"),
+        ):
+            tk.Button(
+                barra,
+                text=texto,
+                bg=cor,
+                fg="#020617",
+                relief="flat",
+                font=("Segoe UI", 9, "bold"),
+                cursor="hand2",
+                command=comando,
+            ).pack(side="left", padx=8)
+
+        cols = ("nome", "chamadas", "media", "p50", "p95", "p99", "max")
+        tree = ttk.Treeview(frame, columns=cols, show="headings", height=18)
+        tree.pack(fill="both", expand=True)
+        for col, txt, w in [
+            ("nome", "Medida", 240),
+            ("chamadas", "Chamadas", 90),
+            ("media", "Média (ms)", 90),
+            ("p50", "p50 (ms)", 90),
+            ("p95", "p95 (ms)", 90),
+            ("p99", "p99 (ms)", 90),
+            ("max", "Máx. (ms)", 90),
+        ]:
+            tree.heading(col, text=txt)
+            tree.column(col, width=w, anchor="w" if col == "nome" else "e")
+
+        lbl_info = tk.Label(frame, bg="#0f172a", fg="#9ca3af", font=("Segoe UI", 9))
+        lbl_info.pack(anchor="w", pady=(6, 0))
+
+        def preencher():
+            tree.delete(*tree.get_children())
+            for m in desempenho.resumo():
+                tree.insert("", "end", values=(
+                    m["nome"], m["chamadas"],
+                    *(f"{m[k]:.2f}" for k in ("media_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")),
+                ))
+            if desempenho.ativo():
+                lbl_info.config(text="Medindo: percentis das últimas "
+                                     f"{desempenho.AMOSTRAS_MANTIDAS} chamadas de cada medida.")
+            else:
+                lbl_info.config(text="Medidas desligadas (marque acima ou abra com SUNSET_DESEMPENHO=1).")
+
+        def acompanhar():
+            # números ao vivo só enquanto a tela está aberta
+            if self._tela_atual == "desempenho":
+                preencher()
+            self.after(INTERVALO_DESEMPENHO_MS, acompanhar)
+
+        preencher()
+        self.after(INTERVALO_DESEMPENHO_MS, acompanhar)
+        return preencher
 
 
 # ========= PONTO DE ENTRADA PARA TESTE DIRETO =========
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
     app = App("admin", "admin")
     app.mainloop()
@@ -0,0 +1,238 @@
+from typing import Callable, Iterable, Sequence
+
+import tkinter as tk
+from tkinter import ttk
+
+from aluno import Aluno
+from desempenho import cronometrado
+
+# (valores das colunas, tag de cor)
+Linha = tuple[tuple, str]
+
+# cores por situação de pagamento (tags do Treeview)
+CORES_STATUS = {
+    "ok": "#22c55e",
+    "aviso": "#facc15",
+    "atrasado": "#ef4444",
+}
+
+
+class TabelaVinculada:
+    """Liga um ttk.Treeview a registros de alunos, mexendo só nas linhas que mudaram.
+
+    Guarda um mapa id -> linha exibida. `aplicar` recebe um conjunto de
+    alterações (incluídos/alterados e removidos) e toca apenas essas linhas;
+    `sincronizar` compara uma lista completa com o que já está na tela.
+    """
+
+    def __init__(self, tree: ttk.Treeview, linha_de: Callable[[Aluno], Linha]):
+        self.tree = tree
+        self.linha_de = linha_de
+        self._linhas: dict[int, Linha] = {}
+
+    def __len__(self) -> int:
+        return len(self._linhas)
+
+    def __contains__(self, aluno_id: int) -> bool:
+        return aluno_id in self._linhas
+
+    def aplicar(self, alterados: Iterable[Aluno] = (), removidos: Iterable[int] = ()) -> None:
+        """Aplica um conjunto de alterações; novos registros vão para o fim."""
+        for i in removidos:
+            if self._linhas.pop(i, None) is not None:
+                self.tree.delete(str(i))
+        for r in alterados:
+            self._gravar_linha(r.id, self.linha_de(r))
+
+    def sincronizar(self, registros: Iterable[Aluno]) -> None:
+        """Deixa a tabela igual à lista (conteúdo e ordem), com o mínimo de operações."""
+        novas: dict[int, Linha] = {r.id: self.linha_de(r) for r in registros}
+
+        sobrando = [str(i) for i in self._linhas if i not in novas]
+        if sobrando:
+            self.tree.delete(*sobrando)
+            for iid in sobrando:
+                del self._linhas[int(iid)]
+
+        for i, linha in novas.items():
+            self._gravar_linha(i, linha)
+
+        ordem = [str(i) for i in novas]
+        if list(self.tree.get_children()) != ordem:
+            for pos, iid in enumerate(ordem):
+                self.tree.move(iid, "", pos)
+
+    def limpar(self) -> None:
+        self.tree.delete(*self.tree.get_children())
+        self._linhas.clear()
+
+    def _gravar_linha(self, i: int, linha: Linha) -> None:
+        atual = self._linhas.get(i)
+        if atual == linha:
+            return
+        valores, tag = linha
+        if atual is None:
+            self.tree.insert("", "end", iid=str(i), values=valores, tags=(tag,))
+        else:
+            self.tree.item(str(i), values=valores, tags=(tag,))
+        self._linhas[i] = linha
+
+
+class TabelaVirtual(tk.Frame):
+    """Tabela com rolagem virtual: só as linhas visíveis existem no Treeview.
+
+    Os dados vêm de duas funções: `total()` e `faixa(inicio, fim)`, chamadas
+    conforme o usuário rola. Uma margem de registros acima/abaixo da janela
+    fica em cache, então rolagens pequenas não consultam a fonte de novo.
+    A troca de linhas visíveis é feita por uma TabelaVinculada, que só mexe
+    no que mudou.
+    """
+
+    MARGEM = 50
+    ALTURA_CABECALHO = 25
+
+    def __init__(
+        self,
+        master,
+        colunas: Sequence[tuple[str, str, int]],
+        linha_de: Callable[[Aluno], Linha],
+        altura: int = 18,
+        bg: str = "#0f172a",
+    ):
+        super().__init__(master, bg=bg)
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=tuple(c[0] for c in colunas),
+            show="headings",
+            height=altura,
+            selectmode="browse",
+        )
+        for col, txt, w in colunas:
+            self.tree.heading(col, text=txt)
+            self.tree.column(col, width=w, anchor="center")
+        for tag, cor in CORES_STATUS.items():
+            self.tree.tag_configure(tag, foreground=cor)
+
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self._rolar_barra)
+        self.barra.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self._linhas = TabelaVinculada(self.tree, linha_de)
+        self._total: Callable[[], int] = lambda: 0
+        self._faixa: Callable[[int, int], Sequence[Aluno]] = lambda i, j: []
+        self._inicio = 0
+        self._altura = altura
+        self._cache: list[Aluno] = []
+        self._cache_inicio = 0
+        self._selecionado: int | None = None
+
+        self.tree.bind("<MouseWheel>", self._roda_mouse)
+        self.tree.bind("<Button-4>", lambda e: self._rolar(-3))
+        self.tree.bind("<Button-5>", lambda e: self._rolar(3))
+        self.tree.bind("<Up>", lambda e: self._tecla(-1))
+        self.tree.bind("<Down>", lambda e: self._tecla(1))
+        self.tree.bind("<Prior>", lambda e: self._rolar(-self._altura) or "break")
+        self.tree.bind("<Next>", lambda e: self._rolar(self._altura) or "break")
+        self.tree.bind("<Configure>", self._redimensionar)
+        self.tree.bind("<<TreeviewSelect>>", self._ao_selecionar)
+
+    # ----- dados -----
+
+    def definir_fonte(
+        self,
+        total: Callable[[], int],
+        faixa: Callable[[int, int], Sequence[Aluno]],
+    ) -> None:
+        """Troca a origem dos dados e volta para o topo."""
+        self._total = total
+        self._faixa = faixa
+        self._inicio = 0
+        self._selecionado = None
+        self.atualizar()
+
+    def atualizar(self) -> None:
+        """Relê a janela visível (descarta o cache) e aplica só as diferenças."""
+        self._cache = []
+        self._desenhar()
+
+    def selecionado(self) -> int | None:
+        """Id do registro selecionado (só enquanto a linha está na área visível)."""
+        return self._selecionado
+
+    def limpar_selecao(self) -> None:
+        self._selecionado = None
+        self.tree.selection_remove(self.tree.selection())
+
+    def _obter(self, inicio: int, fim: int) -> list[Aluno]:
+        ci = self._cache_inicio
+        if not self._cache or inicio < ci or fim > ci + len(self._cache):
+            ci = max(0, inicio - self.MARGEM)
+            self._cache = list(self._faixa(ci, fim + self.MARGEM))
+            self._cache_inicio = ci
+        return self._cache[inicio - ci:fim - ci]
+
+    @cronometrado("tabela.desenhar")
+    def _desenhar(self) -> None:
+        total = self._total()
+        self._inicio = max(0, min(self._inicio, total - self._altura))
+        fim = min(total, self._inicio + self._altura)
+        self._linhas.sincronizar(self._obter(self._inicio, fim))
+
+        if self._selecionado is not None:
+            if self._selecionado in self._linhas:
+                self.tree.selection_set(str(self._selecionado))
+            else:
+                # saiu da tela: um "Adicionar" não pode alterar um aluno que o usuário não vê
+                self._selecionado = None
+
+        if total:
+            self.barra.set(self._inicio / total, fim / total)
+        else:
+            self.barra.set(0, 1)
+
+    # ----- rolagem -----
+
+    def _rolar(self, linhas: int) -> None:
+        self._inicio += linhas
+        self._desenhar()
+
+    def _rolar_barra(self, acao: str, valor: str, unidade: str | None = None) -> None:
+        if acao == "moveto":
+            self._inicio = int(float(valor) * self._total())
+            self._desenhar()
+        elif acao == "scroll":
+            passo = self._altura if unidade == "pages" else 1
+            self._rolar(int(valor) * passo)
+
+    def _roda_mouse(self, event) -> str:
+        self._rolar(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _tecla(self, direcao: int) -> str | None:
+        """Setas no limite da janela rolam a tabela em vez de parar."""
+        filhos = self.tree.get_children()
+        sel = self.tree.selection()
+        if not filhos or not sel:
+            return None
+        borda = filhos[-1] if direcao > 0 else filhos[0]
+        if sel[0] != borda:
+            return None
+        self._rolar(direcao)
+        filhos = self.tree.get_children()
+        if filhos:
+            alvo = filhos[-1] if direcao > 0 else filhos[0]
+            self.tree.selection_set(alvo)
+            self.tree.see(alvo)
+        return "break"
+
+    def _redimensionar(self, event) -> None:
+        altura_linha = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        linhas = max(1, (event.height - self.ALTURA_CABECALHO) // altura_linha)
+        if linhas != self._altura:
+            self._altura = linhas
+            self._desenhar()
+
+    def _ao_selecionar(self, event) -> None:
+        sel = self.tree.selection()
+        self._selecionado = int(sel[0]) if sel else None
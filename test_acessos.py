@@ -0,0 +1,74 @@
+from datetime import date, datetime, timedelta
+
+from acessos import Acesso, RegistroAcessos
+
+HOJE = date.today()
+
+
+def _em(dias_atras: int, hora: int, minuto: int = 0) -> datetime:
+    return datetime.combine(HOJE - timedelta(days=dias_atras), datetime.min.time()).replace(
+        hour=hora, minute=minuto)
+
+
+def _registro(tmp_path, **kw) -> RegistroAcessos:
+    return RegistroAcessos(str(tmp_path / "acessos"), intervalo=60, **kw)
+
+
+def test_reabrir_carrega_os_dias_do_disco(tmp_path):
+    reg = _registro(tmp_path)
+    reg.registrar(1, "Ana", True, em=_em(0, 7, 30))
+    reg.registrar(2, "Beto", False, "atrasado", "admin", em=_em(0, 7, 10))
+    reg.registrar(1, "Ana", True, em=_em(1, 18))
+    reg.fechar()
+
+    reg = _registro(tmp_path)
+    hoje = reg.do_dia()
+    assert [(a.nome, a.em.minute) for a in hoje] == [("Beto", 10), ("Ana", 30)]
+    assert hoje[0] == Acesso(_em(0, 7, 10), 2, "Beto", False, "atrasado", "admin")
+    assert reg.por_hora()[7] == 2 and sum(reg.por_hora()) == 2
+    assert len(reg.do_dia(HOJE - timedelta(days=1))) == 1
+    assert [a.em for a in reg.do_aluno(1)] == [_em(1, 18), _em(0, 7, 30)]
+    reg.fechar()
+
+
+def test_lote_vai_para_o_disco_so_ao_gravar(tmp_path):
+    reg = _registro(tmp_path)
+    reg.registrar_lote([Acesso(_em(0, 9), 3, "Caio", True)])
+    assert reg.do_dia()  # já está na memória
+    assert _registro(tmp_path).do_dia() == []
+    assert reg.gravar_pendentes() == 1
+    assert reg.gravar_pendentes() == 0
+    assert len(_registro(tmp_path).do_dia()) == 1
+    reg.fechar()
+
+
+def test_dias_fora_da_memoria_sao_lidos_do_disco(tmp_path):
+    reg = _registro(tmp_path)
+    reg.registrar(1, "Ana", True, em=_em(40, 6))
+    reg.registrar(1, "Ana", False, "atrasado", em=_em(35, 6))
+    reg.registrar(2, "Beto", True, em=_em(2, 20))
+    reg.fechar()
+
+    reg = _registro(tmp_path, dias_em_memoria=7)
+    assert reg.do_aluno(1) == []  # fora da janela em memória
+    assert reg.ultima_visita(1).em == _em(40, 6)  # a de 35 dias foi recusada
+    assert reg.ultima_visita(2).em == _em(2, 20)
+    assert reg.ultima_visita(99) is None
+    assert reg.por_hora(HOJE - timedelta(days=40))[6] == 1
+    assert len(reg.do_dia(HOJE - timedelta(days=35))) == 1
+    reg.fechar()
+
+
+def test_linha_cortada_e_ignorada_e_a_proxima_comeca_numa_linha_nova(tmp_path):
+    reg = _registro(tmp_path)
+    reg.registrar(1, "Ana", True, em=_em(0, 8))
+    reg.fechar()
+    arquivo = tmp_path / "acessos" / f"{HOJE.isoformat()}.log"
+    with open(arquivo, "a", encoding="utf-8") as f:
+        f.write('{"em": "%s", "id": 2, "no' % _em(0, 9).isoformat())  # queda no meio da linha
+
+    reg = _registro(tmp_path)
+    assert [a.aluno_id for a in reg.do_dia()] == [1]
+    reg.registrar(3, "Caio", True, em=_em(0, 10))
+    reg.fechar()
+    assert [a.aluno_id for a in _registro(tmp_path).do_dia()] == [1, 3]
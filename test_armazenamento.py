@@ -0,0 +1,51 @@
+import json
+import random
+
+from armazenamento import ArmazemAlunos
+from arquivo_json import gravar_json
+from sintetico import gerar_alunos
+
+
+def _gravar_diario(caminho: str, rng: random.Random, linhas: int) -> None:
+    with open(caminho, "w", encoding="utf-8") as f:
+        for k in range(linhas):
+            if rng.random() < 0.3:
+                op = {"op": "delete", "id": rng.randint(1, 130)}
+            else:
+                aluno = {"id": rng.randint(1, 130), "nome": f"B{k}", "dia_venc": 2, "prox": "2024-02-02"}
+                op = {"op": "upsert", "aluno": aluno}
+            f.write(json.dumps(op, ensure_ascii=False) + "\n")
+
+
+def test_percorrer_igual_a_carregar_com_diarios(tmp_path):
+    caminho = str(tmp_path / "alunos.json")
+    gravar_json(caminho, gerar_alunos(100))
+    rng = random.Random(1)
+    _gravar_diario(caminho + ".diario.old", rng, 75)
+    _gravar_diario(caminho + ".diario", rng, 75)
+
+    armazem = ArmazemAlunos(caminho)
+    assert armazem.existe()
+    assert list(armazem.percorrer()) == armazem.carregar()
+
+
+def test_diario_aplicado_por_cima_do_snapshot(tmp_path):
+    caminho = tmp_path / "alunos.json"
+    caminho.write_text(json.dumps([{"nome": "Ana", "dia_venc": 5, "prox": "2024-01-05"},
+                                   {"nome": "Beto", "dia_venc": 9, "prox": "2024-01-09"}]),
+                       encoding="utf-8")
+    (tmp_path / "alunos.json.diario").write_text(
+        '{"op": "delete", "id": 1}\n'
+        '{"op": "upsert", "aluno": {"id": 3, "nome": "Caio", "dia_venc": 1, "prox": "2024-02-01"}}\n'
+        '{"op": "upsert", "aluno": {"id": 2, "nome": "Beto', encoding="utf-8")  # última linha cortada
+
+    armazem = ArmazemAlunos(str(caminho))
+    # arquivos antigos sem id ganham a posição (1, 2, ...)
+    assert [a["nome"] for a in armazem.carregar()] == ["Beto", "Caio"]
+    assert list(armazem.percorrer()) == armazem.carregar()
+
+
+def test_sem_arquivos(tmp_path):
+    armazem = ArmazemAlunos(str(tmp_path / "alunos.json"))
+    assert not armazem.existe()
+    assert armazem.carregar() == [] and list(armazem.percorrer()) == []
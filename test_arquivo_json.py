@@ -0,0 +1,77 @@
+import pytest
+
+import arquivo_json
+from arquivo_json import existe_json, gravar_json, ler_anterior, ler_json, ler_lista_json
+
+
+# ========= GRAVAÇÃO ATÔMICA =========
+
+# a gravação faz 4 os.replace: cai antes de cada um
+@pytest.mark.parametrize("passos", range(4))
+def test_queda_em_qualquer_passo_deixa_uma_geracao_integra(tmp_path, monkeypatch, passos):
+    caminho = str(tmp_path / "dados.json")
+    gravar_json(caminho, {"versao": 1})
+    gravar_json(caminho, {"versao": 2})
+    replace_original = arquivo_json.os.replace
+    feitos = 0
+
+    def replace_que_cai(origem, destino):
+        nonlocal feitos
+        if feitos == passos:
+            raise OSError("queda simulada")
+        feitos += 1
+        replace_original(origem, destino)
+
+    monkeypatch.setattr(arquivo_json.os, "replace", replace_que_cai)
+    with pytest.raises(OSError):
+        gravar_json(caminho, {"versao": 3})
+    monkeypatch.undo()
+
+    lido = ler_json(caminho)
+    assert lido in ({"versao": 2}, {"versao": 3})
+    assert ler_json(caminho) == lido
+
+
+def test_arquivo_cortado_volta_para_a_geracao_anterior(tmp_path):
+    caminho = str(tmp_path / "dados.json")
+    gravar_json(caminho, list(range(1000)))
+    gravar_json(caminho, list(range(2000)))
+    with open(caminho, "r+b") as f:
+        f.truncate(100)
+    assert ler_json(caminho) == list(range(1000))
+    assert (tmp_path / "dados.json.corrompido").exists()
+
+
+def test_geracao_anterior(tmp_path):
+    caminho = str(tmp_path / "dados.json")
+    assert not existe_json(caminho)
+    assert ler_anterior(caminho) is None
+    gravar_json(caminho, {"versao": 1})
+    assert ler_anterior(caminho) is None
+    gravar_json(caminho, {"versao": 2})
+    assert existe_json(caminho)
+    assert ler_anterior(caminho) == {"versao": 1}
+    (tmp_path / "dados.json.anterior").write_text("{cortado", encoding="utf-8")
+    assert ler_anterior(caminho) is None
+
+
+# ========= LEITURA EM FLUXO =========
+
+@pytest.mark.parametrize("valor", [
+    [],
+    [1, 22, -4.5e10, 1.25e-3, True, None, "x,]\"é", {"a": [1, {"b": "]"}]}],
+    [{"id": i, "nome": "Patrícia " * (i % 5)} for i in range(300)],
+])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_leitura_em_fluxo_igual_a_inteira_com_blocos_cortando_valores(tmp_path, valor, indent):
+    caminho = str(tmp_path / "lista.json")
+    gravar_json(caminho, valor, indent)
+    for bloco in (1, 2, 3, 7, 64):
+        assert list(ler_lista_json(caminho, bloco)) == valor, bloco
+
+
+def test_leitura_em_fluxo_de_arquivo_cortado(tmp_path):
+    caminho = tmp_path / "lista.json"
+    caminho.write_text("[1, 2, 3", encoding="utf-8")
+    with pytest.raises(arquivo_json.ArquivoCorrompido):
+        list(ler_lista_json(str(caminho), 2))
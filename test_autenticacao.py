@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+import autenticacao
+from arquivo_json import gravar_json, ler_anterior
+from autenticacao import ServicoAutenticacao, _com_senha_em_texto, gerar_hash, verificar_hash
+
+
+@pytest.fixture
+def pasta(tmp_path, monkeypatch):
+    # usuarios.json é relativo à pasta atual; iterações baixas deixam o teste rápido
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(autenticacao, "ITERACOES_PBKDF2", 1_000)
+    return tmp_path
+
+
+def _usuarios(pasta) -> dict[str, dict]:
+    dados = json.loads((pasta / "usuarios.json").read_text(encoding="utf-8"))
+    return {u["usuario"]: u for u in dados["usuarios"]}
+
+
+# ========= HASH DE SENHA =========
+
+def test_hash_ida_e_volta():
+    h = gerar_hash("s3nh@ç", 1_000)
+    assert verificar_hash("s3nh@ç", h)
+    assert not verificar_hash("s3nh@c", h)
+
+
+def test_salt_diferente_a_cada_hash():
+    assert gerar_hash("mesma", 1_000) != gerar_hash("mesma", 1_000)
+
+
+@pytest.mark.parametrize("senha_hash", [
+    "",
+    "texto puro",
+    "pbkdf2_sha256$mil$00ff$abcd",
+    "pbkdf2_sha256$1000$nao-hex$abcd",
+    "pbkdf2_sha256$0$00ff$abcd",
+    "pbkdf2_sha256$1000$00ff$não-ascii",
+    "md5$1000$00ff$abcd",
+    None,
+])
+def test_hash_malformado_nao_confere(senha_hash):
+    assert verificar_hash("x", senha_hash) is False
+
+
+# ========= SERVIÇO / ARQUIVO =========
+
+def test_senha_em_texto_vira_hash_na_leitura(pasta):
+    (pasta / "usuarios.json").write_text(
+        json.dumps([{"usuario": "ana", "senha": "segredo"}]), encoding="utf-8")
+    servico = ServicoAutenticacao()
+
+    assert servico.autenticar("ana", "segredo")["perfil"] == "admin"
+    assert servico.autenticar("ana", "errada") is None
+    assert "senha" not in _usuarios(pasta)["ana"]
+    for arquivo in pasta.iterdir():
+        assert "segredo" not in arquivo.read_text(encoding="utf-8"), arquivo.name
+
+
+def test_senha_em_texto_nao_fica_na_geracao_anterior(pasta):
+    # arquivo já no formato atual (com soma), mas com um usuário ainda em texto puro
+    gravar_json("usuarios.json", {"versao": autenticacao.VERSAO_USUARIOS, "usuarios": [
+        {"usuario": "admin", "senha_hash": gerar_hash("admin"), "perfil": "admin"},
+        {"usuario": "ana", "senha": "segredo", "perfil": "recepcao"},
+    ]})
+    assert ServicoAutenticacao().autenticar("ana", "segredo")["perfil"] == "recepcao"
+    assert not _com_senha_em_texto(ler_anterior("usuarios.json"))
+    for arquivo in pasta.iterdir():
+        assert "segredo" not in arquivo.read_text(encoding="utf-8"), arquivo.name
+
+
+def test_hash_refeito_no_login_quando_o_custo_sobe(pasta, monkeypatch):
+    servico = ServicoAutenticacao()
+    assert servico.autenticar("admin", "admin")
+    antigo = _usuarios(pasta)["admin"]["senha_hash"]
+    assert antigo.split("$")[1] == "1000"
+
+    monkeypatch.setattr(autenticacao, "ITERACOES_PBKDF2", 2_000)
+    assert servico.autenticar("admin", "admin")
+    novo = _usuarios(pasta)["admin"]["senha_hash"]
+    assert novo.split("$")[1] == "2000"
+    assert verificar_hash("admin", novo)
+
+    # senha errada não regrava nada
+    assert servico.autenticar("admin", "outra") is None
+    assert _usuarios(pasta)["admin"]["senha_hash"] == novo
+
+
+def test_hash_malformado_no_arquivo_recusa_sem_erro(pasta):
+    (pasta / "usuarios.json").write_text(json.dumps({
+        "versao": autenticacao.VERSAO_USUARIOS,
+        "usuarios": [{"usuario": "ana", "senha_hash": "pbkdf2_sha256$x$zz$", "perfil": "admin"}],
+    }), encoding="utf-8")
+    assert ServicoAutenticacao().autenticar("ana", "qualquer") is None
+
+
+def test_usuario_inexistente(pasta):
+    servico = ServicoAutenticacao()
+    assert servico.autenticar("ninguem", "admin") is None
+    assert servico.autenticar_em_segundo_plano("admin", "admin").result()["usuario"] == "admin"
@@ -0,0 +1,68 @@
+import pytest
+
+from aluno import Aluno
+from busca import IndiceBusca
+
+NOMES = [
+    "Patrícia Lima",
+    "Patrick Souza",
+    "Paulo Lima",
+    "Ana Patrícia Rocha",
+    "João Conceição",
+    "Joana Lima",
+]
+
+
+@pytest.fixture
+def indice():
+    return IndiceBusca(Aluno(i, nome, 5, 738000) for i, nome in enumerate(NOMES, start=1))
+
+
+def _nomes(alunos) -> list[str]:
+    return [a.nome for a in alunos]
+
+
+def test_sem_acento_e_maiusculas(indice):
+    assert _nomes(indice.buscar("CONCEICAO")) == ["João Conceição"]
+    assert _nomes(indice.buscar("joão")) == ["João Conceição"]
+
+
+def test_erro_de_digitacao(indice):
+    # "patrick" está tão perto de "patrica" quanto "patricia": os três aparecem, só eles
+    assert set(_nomes(indice.buscar("patrica"))) == {
+        "Patrícia Lima", "Ana Patrícia Rocha", "Patrick Souza",
+    }
+    assert _nomes(indice.buscar("patrica lima")) == ["Patrícia Lima"]
+
+
+def test_exato_antes_de_prefixo(indice):
+    assert _nomes(indice.buscar("joana")) == ["Joana Lima"]
+    # "patric" é prefixo de patricia e patrick: todos aparecem
+    assert set(_nomes(indice.buscar("patric"))) == {
+        "Patrícia Lima", "Patrick Souza", "Ana Patrícia Rocha",
+    }
+    # "patricia" exata fica à frente de "patrick" aproximado
+    resultado = _nomes(indice.buscar("patricia"))
+    assert set(resultado[:2]) == {"Patrícia Lima", "Ana Patrícia Rocha"}
+
+
+def test_varias_palavras_exigem_todas(indice):
+    assert _nomes(indice.buscar("lima pa")) == ["Patrícia Lima", "Paulo Lima"]
+    assert indice.buscar("lima rocha") == []
+    assert indice.buscar("   ") == []
+
+
+def test_limite(indice):
+    assert len(indice.buscar("lima", limite=2)) == 2
+
+
+def test_atualizar_e_remover(indice):
+    indice.atualizar(Aluno(2, "Patrick Oliveira", 5, 738000))
+    assert indice.buscar("souza") == []
+    assert _nomes(indice.buscar("oliveira")) == ["Patrick Oliveira"]
+
+    indice.remover(1)
+    indice.remover(4)
+    assert _nomes(indice.buscar("patricia")) == ["Patrick Oliveira"]  # só o aproximado
+    indice.remover(2)
+    assert indice.buscar("patric") == []
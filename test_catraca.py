@@ -0,0 +1,97 @@
+import threading
+from datetime import date
+
+import pytest
+
+from aluno import Aluno
+from catraca import MotorCheckin, decidir
+from colecao import ColecaoAlunos
+from indice_status import IndiceStatus
+
+HOJE = date.today().toordinal()
+
+
+class AcessosEmMemoria:
+    def __init__(self, falhas: int = 0):
+        self.lotes: list[list] = []
+        self.falhas = falhas
+
+    def registrar_lote(self, acessos: list) -> None:
+        if self.falhas:
+            self.falhas -= 1
+            raise OSError("disco cheio")
+        self.lotes.append(list(acessos))
+
+
+@pytest.fixture
+def alunos():
+    return ColecaoAlunos([
+        Aluno(1, "Ana", 5, HOJE + 20),
+        Aluno(2, "Beto", 5, HOJE + 1),
+        Aluno(3, "Caio", 5, HOJE - 3),
+    ])
+
+
+def _motor(alunos, acessos, **kw) -> MotorCheckin:
+    return MotorCheckin(alunos, IndiceStatus(alunos), acessos, usuario="recepcao", **kw)
+
+
+def _resumo(decisoes) -> list[tuple]:
+    return [(d.codigo, d.nome, d.liberado, d.motivo) for d in decisoes]
+
+
+def test_decidir(alunos):
+    indice = IndiceStatus(alunos)
+    assert decidir(alunos, indice, 1, "1") == (1, "Ana", True, "")
+    assert decidir(alunos, indice, 2, "2") == (2, "Beto", True, "vencimento próximo")
+    assert decidir(alunos, indice, 3, "3") == (3, "Caio", False, "em atraso")
+    assert decidir(alunos, indice, 9, "9") == (9, "9", False, "não encontrado")
+    assert decidir(alunos, indice, None, "xx") == (None, "xx", False, "não encontrado")
+
+
+def test_reserva_responde_por_quem_nao_esta_na_colecao(alunos):
+    reserva = {7: Aluno(7, "Duda", 5, HOJE + 20)}.get
+    assert decidir(alunos, IndiceStatus(alunos), 7, 7, reserva) == (7, "Duda", True, "")
+
+
+def test_decisoes_em_lote_na_ordem_e_gravadas(alunos):
+    acessos = AcessosEmMemoria()
+    motor = _motor(alunos, acessos)
+    for codigo in ["1", "3", "abc", "2"]:
+        motor.entrada(codigo)
+    motor.parar()
+
+    assert _resumo(motor.coletar()) == [
+        ("1", "Ana", True, ""),
+        ("3", "Caio", False, "em atraso"),
+        ("abc", "abc", False, "não encontrado"),
+        ("2", "Beto", True, "vencimento próximo"),
+    ]
+    registrados = [a for lote in acessos.lotes for a in lote]
+    assert [(a.aluno_id, a.liberado, a.usuario) for a in registrados] == [
+        (1, True, "recepcao"), (3, False, "recepcao"), (None, False, "recepcao"), (2, True, "recepcao"),
+    ]
+    assert motor.coletar() == []
+
+
+def test_falha_ao_gravar_recusa_o_lote_e_a_thread_continua(alunos):
+    acessos = AcessosEmMemoria(falhas=1)
+    motor = _motor(alunos, acessos)
+    motor.entrada(1)
+    motor.parar()
+    assert _resumo(motor.coletar()) == [(1, "1", False, "erro, passe de novo")]
+
+    motor.entrada(1)
+    motor.parar()
+    assert _resumo(motor.coletar()) == [(1, "Ana", True, "")]
+    assert len(acessos.lotes) == 1
+
+
+def test_leituras_esperam_a_carga(alunos):
+    pronto = threading.Event()
+    motor = _motor(alunos, AcessosEmMemoria(), pronto=pronto)
+    motor.entrada(1)
+    assert motor.coletar() == []
+    pronto.set()
+    motor.parar()
+    assert _resumo(motor.coletar()) == [(1, "Ana", True, "")]
@@ -0,0 +1,71 @@
+import pytest
+
+from aluno import Aluno
+from colecao import ColecaoAlunos
+
+
+class IndiceDeTeste:
+    def __init__(self):
+        self.eventos: list[tuple[str, int]] = []
+
+    def atualizar(self, aluno: Aluno) -> None:
+        self.eventos.append(("atualizar", aluno.id))
+
+    def remover(self, aluno_id: int) -> None:
+        self.eventos.append(("remover", aluno_id))
+
+
+def _aluno(i: int) -> Aluno:
+    return Aluno(i, f"Aluno {i}", 5, 738000)
+
+
+def test_ids_removidos_nunca_voltam():
+    colecao = ColecaoAlunos([_aluno(1), _aluno(2), _aluno(3)])
+    colecao.remover(3)
+    assert colecao.novo_id() == 4
+
+    colecao.adicionar(_aluno(4))
+    colecao.remover(4)
+    colecao.remover(2)
+    vistos = {colecao.novo_id() for _ in range(5)}
+    assert vistos == {5, 6, 7, 8, 9}
+
+
+def test_colecao_vazia_comeca_do_um():
+    assert ColecaoAlunos().novo_id() == 1
+
+
+def test_reserva_externa_de_ids():
+    reservas = iter([10, 11, 40])
+    colecao = ColecaoAlunos([_aluno(1)], reservar_id=lambda: next(reservas))
+    assert [colecao.novo_id() for _ in range(3)] == [10, 11, 40]
+
+
+def test_adicionar_id_repetido_e_erro():
+    colecao = ColecaoAlunos([_aluno(1)])
+    with pytest.raises(ValueError):
+        colecao.adicionar(_aluno(1))
+    assert len(colecao) == 1
+
+
+def test_ordem_por_id_e_faixa():
+    colecao = ColecaoAlunos([_aluno(5), _aluno(1)])
+    colecao.adicionar(_aluno(3))  # vindo de outro terminal: entra no meio
+    colecao.adicionar(_aluno(9))
+    colecao.remover(5)
+    assert [a.id for a in colecao] == [1, 3, 9]
+    assert [a.id for a in colecao.faixa(1, 10)] == [3, 9]
+    assert 3 in colecao and 5 not in colecao
+    assert colecao.remover(5) is None
+
+
+def test_indices_observam_cada_alteracao():
+    colecao = ColecaoAlunos([_aluno(1)])
+    indice = IndiceDeTeste()
+    colecao.observar(indice)
+
+    colecao.adicionar(_aluno(2))
+    colecao.atualizar(colecao.obter(1))
+    colecao.remover(2)
+    colecao.remover(2)  # já removido: ninguém é avisado
+    assert indice.eventos == [("atualizar", 2), ("atualizar", 1), ("remover", 2)]
@@ -0,0 +1,51 @@
+import pytest
+
+import desempenho
+from arquivo_json import ler_json
+
+
+@pytest.fixture(autouse=True)
+def medidas_limpas():
+    desempenho.zerar()
+    desempenho.ativar(False)
+    yield
+    desempenho.zerar()
+    desempenho.ativar(False)
+
+
+def test_desligado_nao_registra_nada():
+    desempenho.registrar("x", 1.0)
+    with desempenho.medir("x"):
+        pass
+    desempenho.cronometrado("y")(lambda: None)()
+    assert desempenho.resumo() == []
+
+
+def test_contagem_media_e_percentis():
+    desempenho.ativar(True)
+    for ms in range(1, 101):
+        desempenho.registrar("x", float(ms))
+    (x,) = desempenho.resumo()
+    assert x["chamadas"] == 100 and x["media_ms"] == 50.5 and x["max_ms"] == 100
+    assert (x["p50_ms"], x["p95_ms"], x["p99_ms"]) == (51, 96, 100)
+
+
+def test_cronometrado_mede_mesmo_com_excecao():
+    desempenho.ativar(True)
+
+    @desempenho.cronometrado("y")
+    def falha():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        falha()
+    assert [m["nome"] for m in desempenho.resumo()] == ["y"]
+
+
+def test_gravar_resumo_e_amostras(tmp_path):
+    desempenho.ativar(True)
+    for ms in range(1, 101):
+        desempenho.registrar("x", float(ms))
+    caminho = desempenho.gravar(str(tmp_path / "desempenho.json"))
+    dados = ler_json(caminho)
+    assert len(dados["medidas"][0]["amostras_ms"]) == 100
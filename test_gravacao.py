@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+import gravacao
+from aluno import Aluno
+from gravacao import GravadorSegundoPlano, SemIdReservado
+from repositorio import RepositorioAlunos
+
+
+@pytest.fixture
+def caminho(tmp_path, monkeypatch):
+    # a thread abre o banco com o alunos.json padrão, relativo à pasta atual
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / "academia.db")
+
+
+def _repo(caminho) -> RepositorioAlunos:
+    return RepositorioAlunos(caminho)
+
+
+def test_alteracoes_do_mesmo_aluno_se_juntam(caminho, monkeypatch):
+    original = RepositorioAlunos.aplicar_lote
+    chamadas: list[tuple[list, list]] = []
+    entrou, liberar = threading.Event(), threading.Event()
+
+    def aplicar_lote(self, salvar, remover, versoes=None):
+        chamadas.append(([(a["id"], a["nome"]) for a in salvar], list(remover)))
+        entrou.set()
+        liberar.wait(5)
+        return original(self, salvar, remover, versoes)
+
+    monkeypatch.setattr(RepositorioAlunos, "aplicar_lote", aplicar_lote)
+    gravador = GravadorSegundoPlano(caminho)
+    gravador.salvar_aluno(Aluno(1, "Ana", 5, 738000))
+    assert entrou.wait(5)  # a thread está presa no primeiro lote
+
+    for nome in ("Ana B", "Ana C", "Ana D"):
+        gravador.salvar_aluno(Aluno(1, nome, 5, 738000))
+    gravador.salvar_aluno(Aluno(2, "Beto", 9, 738000))
+    gravador.remover_aluno(2)
+    assert gravador.pendente(1) and gravador.pendente(2)
+
+    liberar.set()
+    assert gravador.aguardar(5)
+    gravador.fechar()
+
+    assert chamadas == [([(1, "Ana")], []), ([(1, "Ana D")], [2])]
+    assert not gravador.pendente(1)
+    assert [(a["id"], a["nome"]) for a in _repo(caminho).listar()] == [(1, "Ana D")]
+    assert all(r.ok for r in gravador.coletar())
+
+
+def test_falha_e_gravada_na_nova_tentativa(caminho, monkeypatch):
+    monkeypatch.setattr(gravacao, "ESPERA_NOVA_TENTATIVA", 0.01)
+    original = RepositorioAlunos.aplicar_lote
+    falhas = [OSError("disco cheio")]
+
+    def aplicar_lote(self, salvar, remover, versoes=None):
+        if falhas:
+            raise falhas.pop()
+        return original(self, salvar, remover, versoes)
+
+    monkeypatch.setattr(RepositorioAlunos, "aplicar_lote", aplicar_lote)
+    gravador = GravadorSegundoPlano(caminho)
+    gravador.salvar_aluno(Aluno(1, "Ana", 5, 738000))
+    assert gravador.aguardar(5)
+    gravador.fechar()
+
+    resultados = gravador.coletar()
+    assert [(r.ok, r.erro) for r in resultados] == [(False, "disco cheio"), (True, "")]
+    assert _repo(caminho).obter(1)["nome"] == "Ana"
+
+
+def test_conflito_com_outro_terminal_nao_grava(caminho):
+    outro = _repo(caminho)
+    outro.salvar({"id": 1, "nome": "Ana", "dia_venc": 5, "prox": "2024-01-05"})
+    lido = Aluno.de_dict(outro.obter(1))
+    outro.salvar({"id": 1, "nome": "Ana (outro terminal)", "dia_venc": 5, "prox": "2024-01-05"})
+
+    gravador = GravadorSegundoPlano(caminho)
+    lido.nome = "Ana (este terminal)"
+    gravador.salvar_aluno(lido)
+    assert gravador.aguardar(5)
+    gravador.fechar()
+
+    (resultado,) = gravador.coletar()
+    assert resultado.ok and resultado.conflitos == (1,)
+    assert outro.obter(1)["nome"] == "Ana (outro terminal)"
+
+
+def test_ids_reservados_em_bloco(caminho):
+    gravador = GravadorSegundoPlano(caminho)
+    with pytest.raises(SemIdReservado):
+        gravador.novo_id()  # nada reservado ainda: pede um bloco e avisa
+    assert gravador.aguardar(5)
+
+    ids = [gravador.novo_id() for _ in range(gravacao.IDS_POR_RESERVA)]
+    assert ids == list(range(1, gravacao.IDS_POR_RESERVA + 1))
+    assert gravador.aguardar(5)
+    gravador.fechar()
+
+    # outro terminal continua depois de tudo que este reservou
+    assert _repo(caminho).novo_id() > max(ids)
@@ -0,0 +1,88 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from aluno import Aluno
+from indice_status import IndiceStatus
+from instantaneo import (
+    Instantaneo,
+    InstantaneoInvalido,
+    exportar_json,
+    gravar_instantaneo,
+    importar_json,
+)
+
+N = 5_000
+
+
+def _campos(a: Aluno) -> tuple:
+    return a.id, a.nome, a.dia_venc, a.prox, a.versao
+
+
+@pytest.fixture
+def alunos() -> list[Aluno]:
+    rng = random.Random(7)
+    hoje = date.today().toordinal()
+    nomes = ("José Ávila", "Ana Lúcia", "Çãõ 😀", "", "Zoë")
+    alunos = [
+        Aluno(i * 3, f"{rng.choice(nomes)} {i}", rng.randint(1, 31), hoje + rng.randint(-60, 60), rng.randint(0, 9))
+        for i in range(1, N + 1)
+    ]
+    rng.shuffle(alunos)
+    return alunos
+
+
+@pytest.fixture
+def foto(tmp_path, alunos) -> str:
+    caminho = str(tmp_path / "alunos.snap")
+    gravar_instantaneo(caminho, alunos, 7)
+    return caminho
+
+
+def test_foto_igual_aos_registros(foto, alunos):
+    inst = Instantaneo(foto)
+    try:
+        alunos.sort(key=lambda a: a.id)
+        assert inst.versao_banco == 7 and len(inst) == N
+        assert [_campos(a) for a in inst] == [_campos(a) for a in alunos]
+        for a in random.Random(1).sample(alunos, 200):
+            assert _campos(inst.obter(a.id)) == _campos(a)
+            assert inst.obter(a.id + 1) is None
+        assert inst.obter(0) is None and inst.obter(3 * N + 3) is None
+        posicao = inst.posicao(alunos[9].id)
+        assert inst.faixa(posicao, posicao) == []
+        assert inst.faixa(posicao, N)[0].id == alunos[10].id
+    finally:
+        inst.fechar()
+
+
+def test_contagem_igual_a_do_indice(foto, alunos):
+    inst = Instantaneo(foto)
+    try:
+        hoje = date.today()
+        for dia in (hoje - timedelta(days=90), hoje, hoje + timedelta(days=58)):
+            assert inst.contagem(dia) == IndiceStatus(alunos, dia).contagem()
+    finally:
+        inst.fechar()
+
+
+def test_json_ida_e_volta(tmp_path, foto):
+    caminho_json = str(tmp_path / "alunos.json")
+    assert exportar_json(foto, caminho_json) == N
+    copia = str(tmp_path / "copia.snap")
+    importar_json(caminho_json, copia, 7)
+    with open(foto, "rb") as a, open(copia, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_foto_cortada_e_ignorada(foto):
+    with open(foto, "r+b") as f:
+        f.truncate(f.seek(0, 2) - 1)
+    with pytest.raises(InstantaneoInvalido):
+        Instantaneo(foto)
+    assert Instantaneo.abrir(foto) is None
+
+
+def test_foto_inexistente(tmp_path):
+    assert Instantaneo.abrir(str(tmp_path / "nada.snap")) is None
@@ -0,0 +1,173 @@
+import json
+import sqlite3
+from datetime import date
+
+import repositorio
+from repositorio import VERSAO_SCHEMA, RepositorioAlunos
+
+
+def _abrir(tmp_path, alunos_json: list[dict] | None = None) -> RepositorioAlunos:
+    arquivo_json = tmp_path / "alunos.json"
+    if alunos_json is not None:
+        arquivo_json.write_text(json.dumps(alunos_json, ensure_ascii=False), encoding="utf-8")
+    return RepositorioAlunos(str(tmp_path / "academia.db"), str(arquivo_json))
+
+
+# ========= IMPORTAÇÃO DO JSON LEGADO =========
+
+def test_importa_nomes_antigos_do_vencimento(tmp_path):
+    repo = _abrir(tmp_path, [
+        {"id": 1, "nome": "Ana", "dia_venc": 5, "prox": "2024-01-05"},
+        {"id": 2, "nome": "Beto", "dia_venc": 9, "proximo_venc": "2024-01-09"},
+        {"id": 3, "nome": "Caio", "dia_venc": 12, "prox_venc": "2024-01-12"},
+    ])
+    assert [(a["nome"], a["prox"]) for a in repo.listar()] == [
+        ("Ana", "2024-01-05"), ("Beto", "2024-01-09"), ("Caio", "2024-01-12"),
+    ]
+    assert not repo.banco_novo
+
+
+def test_importacao_saneia_registros_sujos(tmp_path):
+    repo = _abrir(tmp_path, [
+        {"id": 7, "dia_venc": "15", "prox": "2024-02-15"},
+        {"id": 8, "nome": "Duda", "dia_venc": "x", "prox_venc": "amanhã"},
+    ])
+    sem_nome, sujo = repo.listar()
+    assert (sem_nome["nome"], sem_nome["dia_venc"]) == ("Aluno 7", 15)
+    assert sujo["dia_venc"] == date.today().day
+    date.fromisoformat(sujo["prox"])
+
+
+def test_sem_json_legado_o_banco_e_novo(tmp_path):
+    repo = _abrir(tmp_path)
+    assert repo.contar() == 0
+    assert repo.banco_novo
+
+
+def test_importacao_acontece_uma_vez_so(tmp_path):
+    repo = _abrir(tmp_path, [{"id": 1, "nome": "Ana", "dia_venc": 5, "prox": "2024-01-05"}])
+    repo.remover(1)
+    repo.fechar()
+    assert _abrir(tmp_path).contar() == 0
+
+
+# ========= MIGRAÇÃO v1 -> atual =========
+
+_SCHEMA_V1 = """
+CREATE TABLE alunos (
+    id        INTEGER PRIMARY KEY,
+    nome      TEXT    NOT NULL,
+    nome_norm TEXT    NOT NULL,
+    dia_venc  INTEGER NOT NULL,
+    prox      TEXT    NOT NULL
+);
+CREATE INDEX idx_alunos_nome_norm ON alunos(nome_norm);
+CREATE INDEX idx_alunos_prox ON alunos(prox);
+CREATE TABLE alunos_termos (
+    termo    TEXT    NOT NULL,
+    aluno_id INTEGER NOT NULL,
+    PRIMARY KEY (termo, aluno_id)
+);
+INSERT INTO alunos VALUES (1, 'Ana', 'ana', 5, '2024-01-05');
+INSERT INTO alunos VALUES (4, 'Beto', 'beto', '9', 'sem data');
+INSERT INTO alunos_termos VALUES ('ana', 1);
+PRAGMA user_version = 1;
+"""
+
+
+def test_migra_banco_v1_para_a_versao_atual(tmp_path):
+    caminho = tmp_path / "academia.db"
+    con = sqlite3.connect(caminho)
+    con.executescript(_SCHEMA_V1)
+    con.close()
+
+    repo = RepositorioAlunos(str(caminho), str(tmp_path / "alunos.json"))
+    ana, beto = repo.listar()
+    assert ana["prox"] == "2024-01-05"
+    assert beto["dia_venc"] == 9
+    assert beto["prox"] != "sem data"
+    assert beto["versao"] > 0  # regravado pelo saneamento da v2
+    assert repo.novo_id() == 5
+
+    con = repo.con
+    assert con.execute("PRAGMA user_version").fetchone() == (VERSAO_SCHEMA,)
+    tabelas = {n for (n,) in con.execute("SELECT name FROM sqlite_master")}
+    assert "alunos_termos" not in tabelas
+    assert "idx_alunos_nome_norm" not in tabelas
+    assert {"alteracoes", "sequencias"} <= tabelas
+    assert {n for (n,) in con.execute("SELECT nome_norm FROM alunos")} == {""}
+
+
+def test_gravacao_nao_preenche_nome_norm(tmp_path):
+    repo = _abrir(tmp_path)
+    repo.salvar({"id": 1, "nome": "Patrícia Lima", "dia_venc": 3, "prox": "2024-03-03"})
+    assert repo.con.execute("SELECT nome_norm FROM alunos").fetchone() == ("",)
+
+
+# ========= VÁRIOS TERMINAIS =========
+
+def _aluno(i: int, nome: str) -> dict:
+    return {"id": i, "nome": nome, "dia_venc": 5, "prox": "2024-01-05"}
+
+
+def test_aplicar_lote_recusa_versao_desatualizada(tmp_path):
+    a, b = _abrir(tmp_path), _abrir(tmp_path)
+    a.salvar_varios([_aluno(1, "Ana"), _aluno(2, "Beto"), _aluno(3, "Caio")])
+    lidos = {x["id"]: x["versao"] for x in b.listar()}
+
+    a.salvar(_aluno(1, "Ana (A)"))
+    a.remover(2)
+
+    conflitos = b.aplicar_lote(
+        [_aluno(1, "Ana (B)"), _aluno(2, "Beto (B)"), _aluno(3, "Caio (B)"), _aluno(4, "Duda")],
+        [],
+        lidos,
+    )
+    assert sorted(conflitos) == [1, 2]
+    assert [(x["id"], x["nome"]) for x in a.listar()] == [(1, "Ana (A)"), (3, "Caio (B)"), (4, "Duda")]
+
+    # sem `versoes`, última gravação vence
+    assert b.aplicar_lote([_aluno(1, "Ana (B)")], []) == []
+    assert a.obter(1)["nome"] == "Ana (B)"
+
+
+def test_alteracoes_desde_traz_so_o_que_mudou(tmp_path):
+    a, b = _abrir(tmp_path), _abrir(tmp_path)
+    a.salvar_varios([_aluno(1, "Ana"), _aluno(2, "Beto"), _aluno(3, "Caio")])
+    assert b.mudou() is False  # primeira chamada só guarda a referência
+    vista = b.versao_atual()
+
+    a.salvar(_aluno(1, "Ana 2"))
+    a.salvar(_aluno(1, "Ana 3"))
+    a.remover(2)
+    a.salvar(_aluno(4, "Duda"))
+    assert b.mudou() is True
+    assert b.mudou() is False
+
+    atual, alterados, removidos = b.alteracoes_desde(vista)
+    assert atual == a.versao_atual()
+    assert sorted((x["id"], x["nome"]) for x in alterados) == [(1, "Ana 3"), (4, "Duda")]
+    assert removidos == [2]
+    assert b.alteracoes_desde(atual) == (atual, [], [])
+
+
+def test_log_podado_pede_releitura_completa(tmp_path, monkeypatch):
+    monkeypatch.setattr(repositorio, "ALTERACOES_MANTIDAS", 3)
+    repo = _abrir(tmp_path)
+    vista = repo.versao_atual()
+    repo.salvar_varios([_aluno(i, f"A{i}") for i in range(1, 11)])
+    repo.fechar()  # a poda roda ao abrir
+
+    repo = _abrir(tmp_path)
+    assert repo.alteracoes_desde(vista) is None
+    atual = repo.versao_atual()
+    assert repo.alteracoes_desde(atual - 1)[1] == [repo.obter(10)]
+
+
+def test_reserva_de_ids_entre_terminais(tmp_path):
+    a, b = _abrir(tmp_path), _abrir(tmp_path)
+    faixa_a = a.reservar_ids(10)
+    faixa_b = b.reservar_ids(10)
+    assert not set(faixa_a) & set(faixa_b)
+    b.salvar(_aluno(100, "Importado"))
+    assert a.novo_id() == 101
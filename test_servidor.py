@@ -0,0 +1,158 @@
+from datetime import date
+from itertools import islice
+
+import pytest
+
+import servidor as modulo
+from acessos import RegistroAcessos
+from repositorio import ConflitoVersao, RepositorioAlunos
+from servidor import CacheAlunos, ClienteSincronizacao, MotorCheckinRemoto, ServidorSincronizacao
+
+TOKEN = "segredo"
+PROX = date.today().replace(day=1).isoformat()
+
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    # o banco abre o alunos.json padrão, relativo à pasta atual
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(modulo, "INTERVALO_BANCO", 0.02)
+    repo = RepositorioAlunos("academia.db")
+    repo.salvar_varios([
+        {"id": 1, "nome": "Ana", "dia_venc": 5, "prox": "2099-01-05"},
+        {"id": 2, "nome": "Beto", "dia_venc": 9, "prox": "2000-01-09"},
+    ])
+    repo.fechar()
+    srv = ServidorSincronizacao(
+        ("127.0.0.1", 0), CacheAlunos("academia.db", RegistroAcessos("acessos")), TOKEN
+    )
+    srv.iniciar()
+    yield srv
+    srv.fechar()
+
+
+def _cliente(srv, token: str | None = TOKEN) -> ClienteSincronizacao:
+    return ClienteSincronizacao("127.0.0.1", srv.porta, token=token)
+
+
+def test_incluir_alterar_e_remover(servidor):
+    cliente = _cliente(servidor)
+    novo = cliente.incluir("Caio", 12, PROX)
+    assert (novo["id"], novo["nome"], novo["prox"]) == (3, "Caio", PROX)
+    assert cliente.obter(3)["nome"] == "Caio"
+
+    alterado = cliente.salvar({"id": 3, "rev": novo["rev"], "nome": "Caio Lima"})
+    assert alterado["nome"] == "Caio Lima" and alterado["dia_venc"] == 12
+    assert [a["nome"] for a in cliente.buscar("lima")] == ["Caio Lima"]
+
+    rev, alunos = cliente.listar()
+    assert [a["id"] for a in alunos] == [1, 2, 3]
+    assert rev == alterado["rev"]
+    assert cliente.situacao()["total"] == 3
+
+    assert cliente.remover(3) is True
+    assert cliente.remover(3) is False
+    assert cliente.obter(3) is None
+
+    servidor.cache.gravador.aguardar(5)
+    assert [a["id"] for a in RepositorioAlunos("academia.db").listar()] == [1, 2]
+
+
+@pytest.mark.parametrize("nome, dia", [
+    ("", 5), ("   ", 5), (123, 5), ("Caio", 0), ("Caio", 32), ("Caio", True), ("Caio", "5"),
+])
+def test_inclusao_invalida_e_recusada(servidor, nome, dia):
+    cliente = _cliente(servidor)
+    with pytest.raises(ValueError):
+        cliente.incluir(nome, dia)
+    assert len(cliente.listar()[1]) == 2
+    assert cliente.incluir("Caio", 5)["id"] == 3  # nenhum id gasto à toa
+
+
+def test_alteracao_invalida_nao_mexe_no_aluno(servidor):
+    cliente = _cliente(servidor)
+    for dados in ({"dia_venc": 40}, {"nome": None}, {"prox": "amanhã"}, {"prox": 20240105}):
+        with pytest.raises(ValueError):
+            cliente.salvar({"id": 1, **dados})
+    assert cliente.obter(1)["nome"] == "Ana" and cliente.obter(1)["dia_venc"] == 5
+
+
+def test_rev_velho_da_409(servidor):
+    a, b = _cliente(servidor), _cliente(servidor)
+    lido = b.obter(1)
+    a.salvar({"id": 1, "rev": a.obter(1)["rev"], "nome": "Ana (A)"})
+    with pytest.raises(ConflitoVersao):
+        b.salvar({"id": 1, "rev": lido["rev"], "nome": "Ana (B)"})
+    assert b.obter(1)["nome"] == "Ana (A)"
+
+
+def test_fluxo_de_eventos(servidor):
+    cliente = _cliente(servidor)
+    rev, _ = cliente.listar()
+    cliente.incluir("Caio", 12)
+    cliente.remover(2)
+
+    eventos = cliente.eventos(rev)
+    recebidos = list(islice(eventos, 2))
+    eventos.close()
+    assert [e["tipo"] for e in recebidos] == ["aluno", "removido"]
+    assert recebidos[0]["aluno"]["nome"] == "Caio" and recebidos[1]["id"] == 2
+    assert [e["rev"] for e in recebidos] == [rev + 1, rev + 2]
+
+
+def test_sem_token_da_401(servidor):
+    cliente = _cliente(servidor, token=None)
+    with pytest.raises(PermissionError):
+        cliente.listar()
+    with pytest.raises(PermissionError):
+        next(cliente.eventos())
+    with pytest.raises(PermissionError):
+        _cliente(servidor, token="errado").remover(1)
+    assert _cliente(servidor).obter(1) is not None
+
+
+def test_rede_sem_token_e_recusada():
+    with pytest.raises(ValueError):
+        ServidorSincronizacao(("0.0.0.0", 0), None)
+
+
+def test_conflito_com_o_banco_volta_para_a_versao_do_banco(servidor, monkeypatch):
+    cache = servidor.cache
+    # o vigia deixa de ler o banco: só a correção do conflito pode trazer a versão de fora
+    monkeypatch.setattr(cache, "_trazer_do_banco", lambda repo: None)
+    outro = RepositorioAlunos("academia.db")
+    outro.salvar({"id": 1, "nome": "Ana (portaria.py)", "dia_venc": 5, "prox": "2099-01-05"})
+    outro.remover(2)
+
+    cliente = _cliente(servidor)
+    rev, _ = cliente.listar()
+    cliente.salvar({"id": 1, "nome": "Ana (servidor)"})
+    cliente.salvar({"id": 2, "nome": "Beto (servidor)"})
+
+    eventos = cliente.eventos(rev)
+    recebidos = list(islice(eventos, 4))
+    eventos.close()
+    corrigidos = {(e["tipo"], e.get("id") or e["aluno"]["nome"]) for e in recebidos[2:]}
+    assert corrigidos == {("aluno", "Ana (portaria.py)"), ("removido", 2)}
+    assert cliente.obter(1)["nome"] == "Ana (portaria.py)"
+    assert cliente.obter(2) is None
+    assert outro.obter(1)["nome"] == "Ana (portaria.py)"
+
+
+def test_catraca_remota(servidor):
+    motor = MotorCheckinRemoto(_cliente(servidor), usuario="recepcao")
+    for codigo in ("1", "2", "99"):
+        motor.entrada(codigo)
+    motor.parar()
+    assert [(d.codigo, d.nome, d.liberado, d.motivo) for d in motor.coletar()] == [
+        ("1", "Ana", True, ""),
+        ("2", "Beto", False, "em atraso"),
+        ("99", "99", False, "não encontrado"),
+    ]
+    servidor.cache.acessos.gravar_pendentes()
+    assert [a.usuario for a in servidor.cache.acessos.do_dia()] == ["recepcao"] * 3
+
+    sem_token = MotorCheckinRemoto(_cliente(servidor, token=None))
+    sem_token.entrada("1")
+    sem_token.parar()
+    assert [(d.liberado, d.motivo) for d in sem_token.coletar()] == [(False, "erro, passe de novo")]
@@ -0,0 +1,97 @@
+import calendar
+from datetime import date, timedelta
+
+import pytest
+
+from vencimentos import (
+    STATUS_POR_CODIGO,
+    calcular_proximo_vencimento,
+    np,
+    proximos_vencimentos_em_lote,
+    status_em_lote,
+    status_pagamento,
+    ultimo_dia_do_mes,
+)
+
+DIAS = list(range(1, 32))
+
+
+def _proximo_vencimento_referencia(dia: int, hoje: date) -> date:
+    """Regra escrita do zero com o módulo calendar, para conferir as tabelas."""
+    ano, mes = hoje.year, hoje.month
+    if hoje.day > dia:
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+    return date(ano, mes, min(dia, calendar.monthrange(ano, mes)[1]))
+
+
+def _datas(inicio: date, dias: int) -> list[date]:
+    return [inicio + timedelta(days=k) for k in range(dias)]
+
+
+# ========= CALENDÁRIO =========
+
+def test_ultimo_dia_do_mes_dentro_e_fora_da_janela():
+    for ano in range(1900, 2201):
+        for mes in range(1, 13):
+            assert ultimo_dia_do_mes(ano, mes) == calendar.monthrange(ano, mes)[1], (ano, mes)
+
+
+@pytest.mark.parametrize("ano, dias", [(2023, 28), (2024, 29), (1900, 28), (2000, 29), (2100, 28)])
+def test_fevereiro_em_anos_bissextos_e_seculares(ano, dias):
+    assert ultimo_dia_do_mes(ano, 2) == dias
+
+
+# ========= PRÓXIMO VENCIMENTO =========
+
+@pytest.mark.parametrize("dia, hoje, esperado", [
+    # 29-31 caem no último dia dos meses mais curtos
+    (31, date(2023, 2, 1), date(2023, 2, 28)),
+    (30, date(2023, 2, 1), date(2023, 2, 28)),
+    (29, date(2023, 2, 1), date(2023, 2, 28)),
+    (29, date(2024, 2, 1), date(2024, 2, 29)),
+    (31, date(2024, 2, 1), date(2024, 2, 29)),
+    (31, date(2023, 4, 1), date(2023, 4, 30)),
+    # já passou o dia: vai para o mês seguinte (e vira o ano em dezembro)
+    (31, date(2023, 1, 31), date(2023, 1, 31)),
+    (30, date(2023, 1, 31), date(2023, 2, 28)),
+    (29, date(2024, 1, 30), date(2024, 2, 29)),
+    (15, date(2023, 12, 16), date(2024, 1, 15)),
+    (31, date(2024, 2, 29), date(2024, 2, 29)),  # vence hoje
+    (31, date(2024, 3, 1), date(2024, 3, 31)),
+])
+def test_calcular_proximo_vencimento_dias_29_a_31(dia, hoje, esperado):
+    assert calcular_proximo_vencimento(dia, hoje) == esperado
+    assert list(proximos_vencimentos_em_lote([dia], hoje)) == [esperado.toordinal()]
+
+
+@pytest.mark.parametrize("inicio", [date(2023, 1, 1), date(2024, 1, 1), date(2099, 12, 1)])
+def test_proximo_vencimento_por_aluno_e_em_lote_conferem_com_a_referencia(inicio):
+    for hoje in _datas(inicio, 400):
+        esperado = [_proximo_vencimento_referencia(d, hoje).toordinal() for d in DIAS]
+        assert [calcular_proximo_vencimento(d, hoje).toordinal() for d in DIAS] == esperado, hoje
+        assert list(proximos_vencimentos_em_lote(DIAS, hoje)) == esperado, hoje
+
+
+# ========= SITUAÇÃO =========
+
+def test_status_em_lote_confere_com_status_pagamento():
+    for hoje in _datas(date(2023, 12, 1), 120):  # passa por 29/02/2024
+        prox = [hoje.toordinal() + d for d in range(-40, 41)]
+        esperado = [status_pagamento(1, date.fromordinal(p), hoje) for p in prox]
+        assert [STATUS_POR_CODIGO[c] for c in status_em_lote(prox, hoje)] == esperado, hoje
+
+
+def test_status_nos_limites_do_aviso():
+    hoje = date(2024, 2, 27)
+    prox = [date(2024, 2, 26), date(2024, 2, 27), date(2024, 3, 1), date(2024, 3, 2)]
+    codigos = status_em_lote([p.toordinal() for p in prox], hoje)
+    assert [STATUS_POR_CODIGO[c] for c in codigos] == ["atrasado", "aviso", "aviso", "ok"]
+
+
+@pytest.mark.skipif(np is None, reason="NumPy não instalado")
+def test_lote_com_numpy_igual_ao_sem_numpy():
+    for hoje in _datas(date(2024, 1, 25), 40):
+        prox = [hoje.toordinal() + d for d in range(-40, 41)]
+        assert list(proximos_vencimentos_em_lote(np.array(DIAS), hoje)) == list(
+            proximos_vencimentos_em_lote(DIAS, hoje))
+        assert list(status_em_lote(np.array(prox), hoje)) == list(status_em_lote(prox, hoje))
@@ -0,0 +1,168 @@
+from array import array
+from datetime import date
+from functools import lru_cache
+from typing import Iterable
+
+try:  # opcional: com NumPy, arrays numpy são processados sem laço em Python
+    import numpy as np
+except ImportError:
+    np = None
+
+# dias antes do vencimento em que o aluno já aparece como "aviso"
+DIAS_AVISO = 3
+
+# ========= CALENDÁRIO PRÉ-CALCULADO =========
+#
+# Tamanho de cada mês numa janela de anos, calculado uma vez sem criar
+# objetos date. Fora da janela, um cache limitado resolve os meses pedidos.
+# O próximo vencimento de cada dia (1-31) também fica em tabela por data de
+# referência, já que todos os alunos de um dia são calculados contra "hoje".
+
+ANO_INICIAL_CALENDARIO = 2000
+ANO_FINAL_CALENDARIO = 2100
+
+_DIAS_DO_MES = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+_ano_inicial = ANO_INICIAL_CALENDARIO
+_ano_final = ANO_FINAL_CALENDARIO
+_tamanhos: list[int] = []
+
+
+def _bissexto(ano: int) -> bool:
+    return ano % 4 == 0 and (ano % 100 != 0 or ano % 400 == 0)
+
+
+def _tamanho_calculado(ano: int, mes: int) -> int:
+    if mes == 2 and _bissexto(ano):
+        return 29
+    return _DIAS_DO_MES[mes - 1]
+
+
+def configurar_calendario(
+    ano_inicial: int = ANO_INICIAL_CALENDARIO, ano_final: int = ANO_FINAL_CALENDARIO
+) -> None:
+    """(Re)monta a tabela de tamanhos de mês para os anos [ano_inicial, ano_final]."""
+    global _ano_inicial, _ano_final, _tamanhos
+    _ano_inicial, _ano_final = ano_inicial, ano_final
+    _tamanhos = [
+        _tamanho_calculado(ano, mes)
+        for ano in range(ano_inicial, ano_final + 1)
+        for mes in range(1, 13)
+    ]
+
+
+@lru_cache(maxsize=256)
+def _tamanho_fora_da_janela(ano: int, mes: int) -> int:
+    return _tamanho_calculado(ano, mes)
+
+
+configurar_calendario()
+
+
+# ========= FUNÇÕES DE DATA / PAGAMENTO =========
+
+def ultimo_dia_do_mes(ano: int, mes: int) -> int:
+    """Retorna o último dia do mês (28-31)."""
+    if _ano_inicial <= ano <= _ano_final:
+        return _tamanhos[(ano - _ano_inicial) * 12 + mes - 1]
+    return _tamanho_fora_da_janela(ano, mes)
+
+
+def _proximo_vencimento(dia_venc: int, hoje: date) -> date:
+    ano = hoje.year
+    mes = hoje.month
+
+    # se já passou o dia de vencimento, joga para o próximo mês
+    if hoje.day > dia_venc:
+        mes += 1
+        if mes == 13:
+            mes = 1
+            ano += 1
+
+    dia = min(dia_venc, ultimo_dia_do_mes(ano, mes))
+    return date(ano, mes, dia)
+
+
+@lru_cache(maxsize=8)
+def _vencimentos_do_dia(hoje: date) -> tuple[date | None, ...]:
+    """Próximo vencimento para cada dia 0-31 a partir de `hoje` (posição 0 não usada)."""
+    return (None,) + tuple(_proximo_vencimento(d, hoje) for d in range(1, 32))
+
+
+def calcular_proximo_vencimento(dia_venc: int, hoje: date | None = None) -> date:
+    """Calcula o próximo vencimento a partir do dia escolhido.
+
+    Dias 29-31 caem no último dia dos meses mais curtos.
+    """
+    if hoje is None:
+        hoje = date.today()
+    if 1 <= dia_venc <= 31:
+        return _vencimentos_do_dia(hoje)[dia_venc]
+    return _proximo_vencimento(dia_venc, hoje)
+
+
+def adicionar_um_mes(data: date) -> date:
+    """Usado para somar 1 mês quando pagamento é feito antes do vencimento."""
+    ano = data.year
+    mes = data.month + 1
+    if mes == 13:
+        mes = 1
+        ano += 1
+    dia = min(data.day, ultimo_dia_do_mes(ano, mes))
+    return date(ano, mes, dia)
+
+
+def status_pagamento(dia_venc: int, prox: date, hoje: date | None = None) -> str:
+    """Retorna 'ok', 'aviso' (próx 3 dias) ou 'atrasado'."""
+    if hoje is None:
+        hoje = date.today()
+
+    if prox < hoje:
+        return "atrasado"
+
+    delta = (prox - hoje).days
+    if 0 <= delta <= DIAS_AVISO:
+        return "aviso"
+
+    return "ok"
+
+
+# ========= EM LOTE (roster inteiro de uma vez) =========
+#
+# Datas em ordinal (date.toordinal()). Para um "hoje" fixo o próximo
+# vencimento só depende do dia escolhido (1-31), então as 31 respostas são
+# calculadas uma vez com as funções acima e o resto é consulta em tabela:
+# o resultado é idêntico ao da versão por aluno, inclusive dias 29-31.
+
+# códigos de status_em_lote, na mesma ordem de indice_status.STATUS
+CODIGO_OK, CODIGO_AVISO, CODIGO_ATRASADO = 0, 1, 2
+STATUS_POR_CODIGO = ("ok", "aviso", "atrasado")
+
+
+@lru_cache(maxsize=8)
+def tabela_proximos_vencimentos(hoje: date) -> tuple[int, ...]:
+    """Ordinal do próximo vencimento para cada dia 0-31 (posição 0 não usada)."""
+    return (0,) + tuple(d.toordinal() for d in _vencimentos_do_dia(hoje)[1:])
+
+
+def proximos_vencimentos_em_lote(dias_venc: Iterable[int], hoje: date | None = None):
+    """Próximo vencimento (ordinal) de cada dia de vencimento."""
+    tabela = tabela_proximos_vencimentos(hoje or date.today())
+    if np is not None and isinstance(dias_venc, np.ndarray):
+        return np.asarray(tabela, dtype=np.int64)[dias_venc]
+    return array("l", map(tabela.__getitem__, dias_venc))
+
+
+def status_em_lote(prox: Iterable[int], hoje: date | None = None):
+    """Código de situação (CODIGO_*) de cada vencimento em ordinal."""
+    h = (hoje or date.today()).toordinal()
+    limite = h + DIAS_AVISO
+    if np is not None and isinstance(prox, np.ndarray):
+        codigos = np.zeros(len(prox), dtype=np.int8)
+        codigos[prox <= limite] = CODIGO_AVISO
+        codigos[prox < h] = CODIGO_ATRASADO
+        return codigos
+    return array("b", [
+        CODIGO_ATRASADO if p < h else CODIGO_AVISO if p <= limite else CODIGO_OK
+        for p in prox
+    ])